@@ -0,0 +1,153 @@
+"""
+Local account state cache fed by exchange WebSocket streams.
+
+Positions and orders are kept in memory so the trading loop can read them
+without a REST round trip. REST is only used to seed the cache and to
+periodically reconcile it.
+"""
+
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+from .base import MarginInfo, OrderInfo
+
+
+OPEN_ORDER_STATUSES = ('OPEN', 'PARTIALLY_FILLED')
+
+
+class AccountStateCache:
+    """In-memory positions and orders for a single account."""
+
+    def __init__(self, max_closed_orders: int = 500):
+        """
+        Args:
+            max_closed_orders: Number of filled/canceled orders to retain for lookups
+        """
+        self.max_closed_orders = max_closed_orders
+
+        # market -> signed position
+        self._positions: Dict[str, Decimal] = {}
+        self._position_update_time: Dict[str, float] = {}
+
+        # Collateral and margin in use, if the venue streams them
+        self._margin: Optional[MarginInfo] = None
+
+        # order_id -> OrderInfo, open and recently closed orders
+        self._orders: "OrderedDict[str, OrderInfo]" = OrderedDict()
+        self._closed_order_ids: "OrderedDict[str, None]" = OrderedDict()
+
+        # stream_live: the account stream delivered a snapshot since the last (re)connect
+        self.stream_live = False
+        # orders_ready: the open order set was seeded from REST while the stream was live
+        self.orders_ready = False
+        # 'positions' / 'orders' -> last successful REST reconciliation
+        self.last_reconcile_time: Dict[str, float] = {}
+
+        # Called after every position or order update
+        self.on_update: Optional[Callable[[], None]] = None
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+
+    def invalidate(self) -> None:
+        """Mark the cache as untrusted, e.g. when the stream reconnects."""
+        self.stream_live = False
+        self.orders_ready = False
+
+    def mark_stream_live(self) -> None:
+        """Mark that the account stream is delivering updates."""
+        self.stream_live = True
+
+    def mark_reconciled(self, kind: str) -> None:
+        """Record a successful REST reconciliation of 'positions' or 'orders'."""
+        self.last_reconcile_time[kind] = time.time()
+
+    def expire_reconcile(self) -> None:
+        """Force the next read of positions and orders to reconcile against REST."""
+        self.last_reconcile_time.clear()
+
+    def needs_reconcile(self, kind: str, interval: float) -> bool:
+        """Whether 'positions' or 'orders' should be checked against REST."""
+        last_reconcile_time = self.last_reconcile_time.get(kind)
+        if not self.stream_live or last_reconcile_time is None:
+            return True
+        return time.time() - last_reconcile_time >= interval
+
+    # ---------------------------
+    # Positions
+    # ---------------------------
+
+    def update_position(self, market: str, position: Decimal) -> None:
+        """Set the signed position for a market."""
+        market = str(market)
+        self._positions[market] = Decimal(position)
+        self._position_update_time[market] = time.time()
+        if self.on_update:
+            self.on_update()
+
+    def get_position(self, market: str) -> Optional[Decimal]:
+        """Get the signed position for a market, or None if never seen."""
+        return self._positions.get(str(market))
+
+    def get_position_update_time(self, market: str) -> Optional[float]:
+        """Get the last time the position for a market was updated."""
+        return self._position_update_time.get(str(market))
+
+    # ---------------------------
+    # Margin
+    # ---------------------------
+
+    def update_margin(self, margin: MarginInfo) -> None:
+        """Set the latest collateral and margin in use."""
+        self._margin = margin
+
+    def get_margin(self) -> Optional[MarginInfo]:
+        """Get the latest collateral and margin in use, or None if never seen."""
+        return self._margin
+
+    # ---------------------------
+    # Orders
+    # ---------------------------
+
+    def upsert_order(self, order: OrderInfo) -> None:
+        """Insert or update an order."""
+        order_id = str(order.order_id)
+        self._orders[order_id] = order
+        self._orders.move_to_end(order_id)
+
+        if order.status in OPEN_ORDER_STATUSES:
+            self._closed_order_ids.pop(order_id, None)
+        else:
+            self._closed_order_ids[order_id] = None
+            self._closed_order_ids.move_to_end(order_id)
+            while len(self._closed_order_ids) > self.max_closed_orders:
+                old_order_id, _ = self._closed_order_ids.popitem(last=False)
+                self._orders.pop(old_order_id, None)
+
+        if self.on_update:
+            self.on_update()
+
+    def get_order(self, order_id: str) -> Optional[OrderInfo]:
+        """Get an order by ID."""
+        return self._orders.get(str(order_id))
+
+    def get_open_orders(self) -> List[OrderInfo]:
+        """Get all orders that are still resting."""
+        return [order for order in self._orders.values() if order.status in OPEN_ORDER_STATUSES]
+
+    def replace_open_orders(self, orders: List[OrderInfo]) -> None:
+        """Replace the open order set with a REST snapshot."""
+        snapshot_ids = {str(order.order_id) for order in orders}
+        for order in self.get_open_orders():
+            if str(order.order_id) not in snapshot_ids:
+                # Closed while we were not looking; the stream will have the final state if it saw it
+                self._orders.pop(str(order.order_id), None)
+
+        for order in orders:
+            self.upsert_order(order)
+
+        if self.stream_live:
+            self.orders_ready = True
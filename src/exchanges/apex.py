@@ -12,17 +12,21 @@ import types
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
 from apexomni import constants as apex_constants, FailedRequestError
-from apexomni._websocket_stream import _ApexWebSocketManager, PRIVATE_WSS
+from apexomni._websocket_stream import _ApexWebSocketManager, PRIVATE_WSS, PUBLIC_WSS
 from apexomni.http_private_sign import HttpPrivateSign
 from apexomni.websocket_api import WebSocket as ApexWebSocketClient
 
 from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
+from .maker_engine import MakerOrderEngine
+from .market_data import L2Book, TopOfBook, exchange_time, record_quote
 from helpers.logger import TradingLogger
 
 
 class ApexClient(BaseExchangeClient):
     """Apex exchange client implementation"""
 
+    supports_taker = True
+
     def __init__(self, config: Dict[str, any]):
         """Initialize Apex client."""
         super().__init__(config)
@@ -63,6 +67,15 @@ class ApexClient(BaseExchangeClient):
         self._ws_disconnected = asyncio.Event()
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
+        # --- public depth stream (WS-fed best bid/ask) ---
+        self.top_of_book: Optional[TopOfBook] = None
+        self._depth_book = L2Book()
+        self._ws_public_task: Optional[asyncio.Task] = None
+        self._ws_public_disconnected = asyncio.Event()
+
+        # --- post-only placement ---
+        self.maker_engine = MakerOrderEngine(self, 'apex')
+
     def _initialize_apex_clients(self) -> None:
         """Initialize Apex REST and Websocket clients"""
         try:
@@ -82,6 +95,9 @@ class ApexClient(BaseExchangeClient):
                 endpoint=self.ws_base_url,
                 api_key_credentials=self.api_key_credentials
             )
+
+            # Separate client for the public depth stream so private reconnects don't tear it down
+            self.ws_public_client = ApexWebSocketClient(endpoint=self.ws_base_url)
         except Exception as e:
             raise ValueError(f"Failed to initialize Apex client: {e}")
 
@@ -113,6 +129,51 @@ class ApexClient(BaseExchangeClient):
         if not self._ws_task or self._ws_task.done():
             self._ws_task = asyncio.create_task(self._run_private_ws())
 
+        if not self._ws_public_task or self._ws_public_task.done():
+            self._ws_public_task = asyncio.create_task(self._run_public_ws())
+
+    async def _run_public_ws(self):
+        """Reconnect loop for the public depth stream that feeds top_of_book."""
+        backoff = 1.0
+        while not self._ws_stop.is_set():
+            try:
+                self.ws_public_client.ws_public = _ApexWebSocketManager(**self.ws_public_client.kwargs)
+                self.ws_public_client.ws_public._on_close = types.MethodType(
+                    lambda _: self._loop.call_soon_threadsafe(self._ws_public_disconnected.set),
+                    self.ws_public_client.ws_public
+                )
+                self.ws_public_client.ws_public._connect(self.ws_public_client.endpoint + PUBLIC_WSS)
+                # Public stream symbols have no dash, e.g. BTCUSDT
+                self.ws_public_client.depth_stream(
+                    self._handle_depth_message, self.config.contract_id.replace('-', ''), 25
+                )
+                self.logger.log("[WS] public depth connected", "INFO")
+                backoff = 1.0
+
+                self._ws_public_disconnected.clear()
+                await asyncio.wait(
+                    {asyncio.create_task(self._ws_stop.wait()),
+                     asyncio.create_task(self._ws_public_disconnected.wait()),},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if self._ws_stop.is_set():
+                    break
+
+                self.logger.log("[WS] public depth disconnected; attempting to reconnect...", "WARNING")
+            except Exception as e:
+                self.logger.log(f"[WS] public connect error: {e}", "ERROR")
+            finally:
+                # Quotes from a dead stream must not be used; fall back to REST until resubscribed
+                self.top_of_book = None
+                self._depth_book.clear()
+                try:
+                    self.ws_public_client.exit()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(backoff)
+            backoff = min(60.0, backoff * 2)
+
     async def _run_private_ws(self):
         """Tiny reconnect loop with exponential backoff."""
         backoff = 1.0
@@ -163,6 +224,8 @@ class ApexClient(BaseExchangeClient):
             self._ws_stop.set()
             if self._ws_task:
                 await self._ws_task
+            if self._ws_public_task:
+                await self._ws_public_task
         except Exception:
             pass
 
@@ -227,6 +290,8 @@ class ApexClient(BaseExchangeClient):
                     order_type = "OPEN"
 
                 if status in ['OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED']:
+                    self._notify_fill_listeners(order_id, side, filled_size)
+                    self._notify_account_listeners()
                     if self._order_update_handler:
                         self._order_update_handler({
                             'order_id': order_id,
@@ -248,13 +313,40 @@ class ApexClient(BaseExchangeClient):
         except Exception as e:
             self.logger.log(f"Could not add trade-event handler: {e}", "ERROR")
 
+    def _handle_depth_message(self, message):
+        """Handle orderBook snapshot/delta from the public WebSocket (called from the SDK thread)."""
+        try:
+            if isinstance(message, str):
+                message = json.loads(message)
+
+            data = message.get("data", {})
+            bids = data.get('b', [])
+            asks = data.get('a', [])
+            if message.get("type") == "snapshot":
+                self._depth_book.apply_snapshot(bids, asks)
+            else:
+                self._depth_book.apply_delta(bids, asks)
+
+            self.top_of_book = record_quote("apex", self._depth_book.top_of_book(exchange_time(message.get("ts"))))
+
+        except Exception as e:
+            self.logger.log(f"Error handling depth update: {e}", "ERROR")
+
     # ---------------------------
     # REST-ish helpers
     # ---------------------------
 
+    def get_cached_top_of_book(self) -> Optional[TopOfBook]:
+        """Latest top of book from the depth stream."""
+        return self.top_of_book
+
     @query_retry(default_return=(0, 0))
     async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
-        """Fetch best bid and ask price using official SDK"""
+        """Fetch best bid and ask price from a fresh WebSocket quote, falling back to the official SDK"""
+        top_of_book = self.get_fresh_top_of_book()
+        if top_of_book:
+            return top_of_book.best_bid, top_of_book.best_ask
+
         order_book = self.rest_client.depth_v3(symbol=contract_id)
         order_book_data = order_book['data']
 
@@ -283,176 +375,82 @@ class ApexClient(BaseExchangeClient):
             order_price = best_bid + self.config.tick_size
         return self.round_to_tick(order_price)
 
-    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
-        """Place an open order with Apex using official SDK with retry logic for POST_ONLY rejections."""
-        max_retries = 15
-        retry_count = 0
+    async def _submit_post_only_order(self, contract_id: str, quantity: Decimal, price: Decimal,
+                                      side: str) -> OrderResult:
+        """Submit a single maker limit order with Apex using official SDK."""
+        order_result = self.rest_client.create_order_v3(
+            symbol=contract_id,
+            size=str(quantity),
+            price=str(price),
+            side=side.upper(),
+            type='LIMIT',
+            timestampSeconds=time.time(),
+            timeInForce='GOOD_TIL_CANCEL',
+        )
 
-        while retry_count < max_retries:
-            try:
-                best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
+        if not order_result or 'data' not in order_result:
+            return OrderResult(success=False, error_message='Failed to place order')
 
-                if best_bid <= 0 or best_ask <= 0:
-                    return OrderResult(success=False, error_message='Invalid bid/ask prices')
+        # Extract order ID from response
+        order_id = order_result['data'].get('id')
+        if not order_id:
+            return OrderResult(success=False, error_message='No order ID in response')
 
-                if direction == 'buy':
-                    # For buy orders, place slightly below best ask to ensure execution
-                    order_price = best_ask - self.config.tick_size
-                    side = 'buy'
-                else:
-                    # For sell orders, place slightly above best bid to ensure execution
-                    order_price = best_bid + self.config.tick_size
-                    side = 'sell'
-
-                # Place the order using official SDK (post-only to ensure maker order)
-                order_result = self.rest_client.create_order_v3(
-                    symbol=contract_id,
-                    size=str(quantity),
-                    price=str(self.round_to_tick(order_price)),
-                    side=side.upper(),
-                    type='LIMIT',
-                    timestampSeconds=time.time(),
-                    timeInForce='GOOD_TIL_CANCEL',
-                )
+        # Status is checked by the maker engine
+        return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price)
 
-                if not order_result or 'data' not in order_result:
-                    return OrderResult(success=False, error_message='Failed to place order')
-
-                # Extract order ID from response
-                order_id = order_result['data'].get('id')
-                if not order_id:
-                    return OrderResult(success=False, error_message='No order ID in response')
-
-                # Check order status after a short delay to see if it was rejected
-                await asyncio.sleep(0.01)
-                order_info = await self.get_order_info(order_id)
-
-                if order_info:
-                    if order_info.status == 'CANCELED':
-                        if retry_count < max_retries - 1:
-                            retry_count += 1
-                            continue
-                        else:
-                            return OrderResult(success=False, error_message=f'Order rejected after {max_retries} attempts')
-                    elif order_info.status in ['OPEN', 'PENDING', 'PARTIALLY_FILLED', 'FILLED']:
-                        # Order successfully placed
-                        return OrderResult(
-                            success=True,
-                            order_id=order_id,
-                            side=side,
-                            size=quantity,
-                            price=order_price,
-                            status=order_info.status
-                        )
-                    else:
-                        return OrderResult(success=False, error_message=f'Unexpected order status: {order_info.status}')
-                else:
-                    # Assume order is successful if we can't get info
-                    return OrderResult(
-                        success=True,
-                        order_id=order_id,
-                        side=side,
-                        size=quantity,
-                        price=order_price,
-                        status='OPEN'
-                    )
+    async def place_taker_order(self, quantity: Decimal, side: str, max_slippage: Decimal) -> OrderResult:
+        """Place an IOC limit order with Apex and wait until it is done."""
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        if best_bid <= 0 or best_ask <= 0:
+            return OrderResult(success=False, error_message='Invalid bid/ask prices')
 
-            except Exception as e:
-                if retry_count < max_retries - 1:
-                    retry_count += 1
-                    await asyncio.sleep(0.1)  # Wait before retry
-                    continue
-                else:
-                    return OrderResult(success=False, error_message=str(e))
+        order_price = self.get_taker_limit_price(side, best_bid, best_ask, max_slippage)
+        try:
+            order_result = self.rest_client.create_order_v3(
+                symbol=self.config.contract_id,
+                size=str(quantity),
+                price=str(order_price),
+                side=side.upper(),
+                type='LIMIT',
+                timestampSeconds=time.time(),
+                timeInForce='IMMEDIATE_OR_CANCEL',
+            )
+        except Exception as e:
+            return OrderResult(success=False, side=side, error_message=str(e))
+
+        if not order_result or 'data' not in order_result:
+            return OrderResult(success=False, side=side, error_message='Failed to place order')
+        order_id = order_result['data'].get('id')
+        if not order_id:
+            return OrderResult(success=False, side=side, error_message='No order ID in response')
+
+        order_info = await self._wait_for_order_done(order_id)
+        if order_info is None or order_info.status not in ('FILLED', 'CANCELED'):
+            return OrderResult(success=False, order_id=order_id, side=side,
+                               error_message='IOC order not done after 5 seconds')
+
+        if order_info.filled_size <= 0:
+            return OrderResult(success=False, order_id=order_id, side=side, status='CANCELED',
+                               filled_size=Decimal(0), error_message='IOC order not filled')
+
+        return OrderResult(
+            success=True,
+            order_id=order_id,
+            side=side,
+            size=quantity,
+            price=order_info.avg_fill_price or order_price,
+            status='FILLED' if order_info.remaining_size == 0 else 'PARTIALLY_FILLED',
+            filled_size=order_info.filled_size
+        )
 
-        return OrderResult(success=False, error_message='Max retries exceeded')
+    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
+        """Place an open order with Apex using official SDK with retry logic for POST_ONLY rejections."""
+        return await self.maker_engine.place(contract_id, quantity, direction)
 
     async def place_close_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
         """Place a close order with Apex using official SDK with retry logic for POST_ONLY rejections."""
-        max_retries = 15
-        retry_count = 0
-
-        while retry_count < max_retries:
-            try:
-                best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
-
-                if best_bid <= 0 or best_ask <= 0:
-                    return OrderResult(success=False, error_message='Invalid bid/ask prices')
-
-                # Adjust order price based on market conditions and side
-                adjusted_price = price
-
-                if side.lower() == 'sell':
-                    # For sell orders, ensure price is above best bid to be a maker order
-                    if price <= best_bid:
-                        adjusted_price = best_bid + self.config.tick_size
-                elif side.lower() == 'buy':
-                    # For buy orders, ensure price is below best ask to be a maker order
-                    if price >= best_ask:
-                        adjusted_price = best_ask - self.config.tick_size
-
-                adjusted_price = self.round_to_tick(adjusted_price)
-                # Place the order using official SDK (post-only to avoid taker fees)
-                order_result = self.rest_client.create_order_v3(
-                    symbol=contract_id,
-                    size=str(quantity),
-                    price=str(adjusted_price),
-                    side=side.upper(),
-                    type='LIMIT',
-                    timestampSeconds=time.time(),
-                    timeInForce='GOOD_TIL_CANCEL',
-                )
-
-                if not order_result or 'data' not in order_result:
-                    return OrderResult(success=False, error_message='Failed to place order')
-
-                # Extract order ID from response
-                order_id = order_result['data'].get('id')
-                if not order_id:
-                    return OrderResult(success=False, error_message='No order ID in response')
-
-                # Check order status after a short delay to see if it was rejected
-                await asyncio.sleep(0.01)
-                order_info = await self.get_order_info(order_id)
-
-                if order_info:
-                    if order_info.status == 'CANCELED':
-                        if retry_count < max_retries - 1:
-                            retry_count += 1
-                            continue
-                        else:
-                            return OrderResult(success=False, error_message=f'Close order rejected after {max_retries} attempts')
-                    elif order_info.status in ['OPEN', 'PENDING', 'PARTIALLY_FILLED', 'FILLED']:
-                        # Order successfully placed
-                        return OrderResult(
-                            success=True,
-                            order_id=order_id,
-                            side=side,
-                            size=quantity,
-                            price=adjusted_price,
-                            status=order_info.status
-                        )
-                    else:
-                        return OrderResult(success=False, error_message=f'Unexpected close order status: {order_info.status}')
-                else:
-                    # Assume order is successful if we can't get info
-                    return OrderResult(
-                        success=True,
-                        order_id=order_id,
-                        side=side,
-                        size=quantity,
-                        price=adjusted_price
-                    )
-
-            except Exception as e:
-                if retry_count < max_retries - 1:
-                    retry_count += 1
-                    await asyncio.sleep(0.1)  # Wait before retry
-                    continue
-                else:
-                    return OrderResult(success=False, error_message=str(e))
-
-        return OrderResult(success=False, error_message='Max retries exceeded for close order')
+        return await self.maker_engine.place(contract_id, quantity, side, price=price)
 
     async def cancel_order(self, order_id: str) -> OrderResult:
         """Cancel an order with Apex using official SDK."""
@@ -481,14 +479,17 @@ class ApexClient(BaseExchangeClient):
             return None
 
         order_data = order_result['data']
+        filled_size = Decimal(order_data.get('cumSuccessFillSize', 0))
+        filled_value = Decimal(order_data.get('cumSuccessFillValue', 0))
         return OrderInfo(
             order_id=order_data.get('id', ''),
             side=order_data.get('side', '').lower(),
             size=Decimal(order_data.get('size', 0)),
             price=Decimal(order_data.get('price', 0)),
             status=order_data.get('status', ''),
-            filled_size=Decimal(order_data.get('cumSuccessFillSize', 0)),
-            remaining_size=Decimal(order_data.get('size', 0)) - Decimal(order_data.get('cumSuccessFillSize', 0))
+            filled_size=filled_size,
+            remaining_size=Decimal(order_data.get('size', 0)) - filled_size,
+            avg_fill_price=filled_value / filled_size if filled_size > 0 and filled_value > 0 else None
         )
 
     @query_retry(default_return=[])
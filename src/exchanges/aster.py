@@ -11,18 +11,20 @@ import hashlib
 from decimal import Decimal
 from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlencode
-import aiohttp
 import websockets
-import sys
 
 from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
+from .event_queue import ConflatingEventQueue
+from .http_session import HttpSessionManager
+from .maker_engine import MakerOrderEngine
 from helpers.logger import TradingLogger
 
 
 class AsterWebSocketManager:
     """WebSocket manager for Aster order updates."""
 
-    def __init__(self, config: Dict[str, Any], api_key: str, secret_key: str, order_update_callback):
+    def __init__(self, config: Dict[str, Any], api_key: str, secret_key: str, order_update_callback,
+                 http_session: HttpSessionManager):
         self.api_key = api_key
         self.secret_key = secret_key
         self.order_update_callback = order_update_callback
@@ -35,6 +37,11 @@ class AsterWebSocketManager:
         self._keepalive_task = None
         self._last_ping_time = None
         self.config = config
+        self.http_session = http_session
+
+        # Order updates are handled by a consumer task so a slow handler cannot back up the socket
+        self.events = ConflatingEventQueue("aster")
+        self._consumer_task = None
 
     def _generate_signature(self, params: Dict[str, Any]) -> str:
         """Generate HMAC SHA256 signature for Aster API authentication."""
@@ -63,17 +70,17 @@ class AsterWebSocketManager:
             'Content-Type': 'application/x-www-form-urlencoded'
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                'https://fapi.asterdex.com/fapi/v1/listenKey',
-                headers=headers,
-                data=params
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result.get('listenKey')
-                else:
-                    raise Exception(f"Failed to get listen key: {response.status}")
+        session = self.http_session.get_session()
+        async with session.post(
+            'https://fapi.asterdex.com/fapi/v1/listenKey',
+            headers=headers,
+            data=params
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                return result.get('listenKey')
+            else:
+                raise Exception(f"Failed to get listen key: {response.status}")
 
     async def _keepalive_listen_key(self) -> bool:
         """Keep alive the listen key to prevent timeout."""
@@ -92,20 +99,20 @@ class AsterWebSocketManager:
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.put(
-                    f"{self.base_url}/fapi/v1/listenKey",
-                    headers=headers,
-                    data=params
-                ) as response:
-                    if response.status == 200:
-                        if self.logger:
-                            self.logger.log("Listen key keepalive successful", "DEBUG")
-                        return True
-                    else:
-                        if self.logger:
-                            self.logger.log(f"Failed to keepalive listen key: {response.status}", "WARNING")
-                        return False
+            session = self.http_session.get_session()
+            async with session.put(
+                f"{self.base_url}/fapi/v1/listenKey",
+                headers=headers,
+                data=params
+            ) as response:
+                if response.status == 200:
+                    if self.logger:
+                        self.logger.log("Listen key keepalive successful", "DEBUG")
+                    return True
+                else:
+                    if self.logger:
+                        self.logger.log(f"Failed to keepalive listen key: {response.status}", "WARNING")
+                    return False
         except Exception as e:
             if self.logger:
                 self.logger.log(f"Error keeping alive listen key: {e}", "ERROR")
@@ -193,6 +200,9 @@ class AsterWebSocketManager:
             # Start keepalive task
             self._keepalive_task = asyncio.create_task(self._start_keepalive_task())
 
+            if self._consumer_task is None or self._consumer_task.done():
+                self._consumer_task = asyncio.create_task(self.events.run(self._handle_order_update))
+
             # Start listening for messages
             await self._listen()
 
@@ -238,7 +248,8 @@ class AsterWebSocketManager:
             event_type = data.get('e', '')
 
             if event_type == 'ORDER_TRADE_UPDATE':
-                await self._handle_order_update(data)
+                # Order events are never conflated
+                await self.events.put(data)
             elif event_type == 'listenKeyExpired':
                 if self.logger:
                     self.logger.log("Listen key expired, reconnecting...", "WARNING")
@@ -310,6 +321,9 @@ class AsterWebSocketManager:
             except asyncio.CancelledError:
                 pass
 
+        if self._consumer_task:
+            self._consumer_task.cancel()
+
         if self.websocket:
             await self.websocket.close()
             if self.logger:
@@ -323,6 +337,8 @@ class AsterWebSocketManager:
 class AsterClient(BaseExchangeClient):
     """Aster exchange client implementation."""
 
+    supports_taker = True
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize Aster client."""
         super().__init__(config)
@@ -341,6 +357,11 @@ class AsterClient(BaseExchangeClient):
         self.logger = TradingLogger(exchange="aster", ticker=self.config.ticker, log_to_console=False)
         self._order_update_handler = None
 
+        # Shared keep-alive session for REST and listen key calls
+        self.http_session = HttpSessionManager('aster')
+
+        self.maker_engine = MakerOrderEngine(self, 'aster', guard_active_orders=True)
+
     def _validate_config(self) -> None:
         """Validate Aster configuration."""
         required_env_vars = ['ASTER_API_KEY', 'ASTER_SECRET_KEY']
@@ -382,39 +403,39 @@ class AsterClient(BaseExchangeClient):
             'Content-Type': 'application/x-www-form-urlencoded'
         }
 
-        async with aiohttp.ClientSession() as session:
-            if method.upper() == 'GET':
-                # For GET requests, signature is based on query parameters only
-                signature = self._generate_signature(params)
-                params['signature'] = signature
-
-                async with session.get(url, params=params, headers=headers) as response:
-                    result = await response.json()
-                    if response.status != 200:
-                        raise Exception(f"API request failed: {result}")
-                    return result
-            elif method.upper() == 'POST':
-                # For POST requests, signature must include both query string and request body
-                # According to Aster API docs: totalParams = queryString + requestBody
-                all_params = {**params, **data}
-                signature = self._generate_signature(all_params)
-                all_params['signature'] = signature
-
-                async with session.post(url, data=all_params, headers=headers) as response:
-                    result = await response.json()
-                    if response.status != 200:
-                        raise Exception(f"API request failed: {result}")
-                    return result
-            elif method.upper() == 'DELETE':
-                # For DELETE requests, signature is based on query parameters only
-                signature = self._generate_signature(params)
-                params['signature'] = signature
-
-                async with session.delete(url, params=params, headers=headers) as response:
-                    result = await response.json()
-                    if response.status != 200:
-                        raise Exception(f"API request failed: {result}")
-                    return result
+        session = self.http_session.get_session()
+        if method.upper() == 'GET':
+            # For GET requests, signature is based on query parameters only
+            signature = self._generate_signature(params)
+            params['signature'] = signature
+
+            async with session.get(url, params=params, headers=headers) as response:
+                result = await response.json()
+                if response.status != 200:
+                    raise Exception(f"API request failed: {result}")
+                return result
+        elif method.upper() == 'POST':
+            # For POST requests, signature must include both query string and request body
+            # According to Aster API docs: totalParams = queryString + requestBody
+            all_params = {**params, **data}
+            signature = self._generate_signature(all_params)
+            all_params['signature'] = signature
+
+            async with session.post(url, data=all_params, headers=headers) as response:
+                result = await response.json()
+                if response.status != 200:
+                    raise Exception(f"API request failed: {result}")
+                return result
+        elif method.upper() == 'DELETE':
+            # For DELETE requests, signature is based on query parameters only
+            signature = self._generate_signature(params)
+            params['signature'] = signature
+
+            async with session.delete(url, params=params, headers=headers) as response:
+                result = await response.json()
+                if response.status != 200:
+                    raise Exception(f"API request failed: {result}")
+                return result
 
     async def connect(self) -> None:
         """Connect to Aster WebSocket."""
@@ -423,7 +444,8 @@ class AsterClient(BaseExchangeClient):
             config=self.config,
             api_key=self.api_key,
             secret_key=self.secret_key,
-            order_update_callback=self._handle_websocket_order_update
+            order_update_callback=self._handle_websocket_order_update,
+            http_session=self.http_session
         )
 
         # Set logger for WebSocket manager
@@ -443,6 +465,8 @@ class AsterClient(BaseExchangeClient):
         try:
             if hasattr(self, 'ws_manager') and self.ws_manager:
                 await self.ws_manager.disconnect()
+
+            await self.http_session.close()
         except Exception as e:
             self.logger.log(f"Error during Aster disconnect: {e}", "ERROR")
 
@@ -457,6 +481,8 @@ class AsterClient(BaseExchangeClient):
     async def _handle_websocket_order_update(self, order_data: Dict[str, Any]):
         """Handle order updates from WebSocket."""
         try:
+            self._notify_fill_listeners(order_data.get('order_id'), order_data.get('side'), order_data.get('filled_size'))
+            self._notify_account_listeners()
             if self._order_update_handler:
                 self._order_update_handler(order_data)
         except Exception as e:
@@ -487,145 +513,46 @@ class AsterClient(BaseExchangeClient):
             order_price = best_bid + self.config.tick_size
         return order_price
 
-    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
-        """Place an open order with Aster."""
-        attempt = 0
-        while True:
-            attempt += 1
-            if attempt % 5 == 0:
-                self.logger.log(f"[OPEN] Attempt {attempt} to place order", "INFO")
-                active_orders = await self.get_active_orders(contract_id)
-                active_open_orders = 0
-                for order in active_orders:
-                    if order.side == self.config.direction:
-                        active_open_orders += 1
-                if active_open_orders > 1:
-                    self.logger.log(f"[OPEN] ERROR: Active open orders abnormal: {active_open_orders}", "ERROR")
-                    raise Exception(f"[OPEN] ERROR: Active open orders abnormal: {active_open_orders}")
-
-            best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
-
-            if best_bid <= 0 or best_ask <= 0:
-                return OrderResult(success=False, error_message='Invalid bid/ask prices')
-
-            # Determine order side and price
-            if direction == 'buy':
-                # For buy orders, place slightly below best ask to ensure execution
-                price = best_ask - self.config.tick_size
-            elif direction == 'sell':
-                # For sell orders, place slightly above best bid to ensure execution
-                price = best_bid + self.config.tick_size
-            else:
-                raise Exception(f"[OPEN] Invalid direction: {direction}")
-
-            # Place the order
-            order_data = {
-                'symbol': contract_id,
-                'side': direction.upper(),
-                'type': 'LIMIT',
-                'quantity': str(quantity),
-                'price': str(price),
-                'timeInForce': 'GTX'  # GTX is Good Till Crossing (Post Only)
-            }
+    async def _submit_post_only_order(self, contract_id: str, quantity: Decimal, price: Decimal,
+                                      side: str) -> OrderResult:
+        """Submit a single GTX (post-only) order with Aster."""
+        order_data = {
+            'symbol': contract_id,
+            'side': side.upper(),
+            'type': 'LIMIT',
+            'quantity': str(quantity),
+            'price': str(price),
+            'timeInForce': 'GTX'  # GTX is Good Till Crossing (Post Only)
+        }
 
-            result = await self._make_request('POST', '/fapi/v1/order', data=order_data)
-            order_status = result.get('status', '')
-            order_id = result.get('orderId', '')
-
-            start_time = time.time()
-            while order_status == 'NEW' and time.time() - start_time < 2:
-                await asyncio.sleep(0.1)
-                order_info = await self.get_order_info(order_id)
-                if order_info is not None:
-                    order_status = order_info.status
-
-            if order_status in ['NEW', 'PARTIALLY_FILLED']:
-                return OrderResult(success=True, order_id=order_id, side=direction, size=quantity, price=price, status='OPEN')
-            elif order_status == 'FILLED':
-                return OrderResult(success=True, order_id=order_id, side=direction, size=quantity, price=price, status='FILLED')
-            elif order_status == 'EXPIRED':
-                continue
-            else:
-                return OrderResult(success=False, error_message='Unknown order status: ' + order_status)
+        result = await self._make_request('POST', '/fapi/v1/order', data=order_data)
+        order_status = result.get('status', '')
+        order_id = result.get('orderId', '')
 
-    async def _get_active_close_orders(self, contract_id: str) -> int:
-        """Get active close orders for a contract using official SDK."""
-        active_orders = await self.get_active_orders(contract_id)
-        active_close_orders = 0
-        for order in active_orders:
-            if order.side == self.config.close_order_side:
-                active_close_orders += 1
-        return active_close_orders
+        start_time = time.time()
+        while order_status == 'NEW' and time.time() - start_time < 2:
+            await asyncio.sleep(0.1)
+            order_info = await self.get_order_info(order_id)
+            if order_info is not None:
+                order_status = order_info.status
+
+        if order_status in ['NEW', 'PARTIALLY_FILLED']:
+            return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price, status='OPEN')
+        elif order_status == 'FILLED':
+            return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price, status='FILLED')
+        elif order_status == 'EXPIRED':
+            # GTX orders that would cross expire immediately
+            return OrderResult(success=False, order_id=order_id, status='REJECTED', error_message='Post-only order expired')
+        else:
+            return OrderResult(success=False, error_message='Unknown order status: ' + order_status)
+
+    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
+        """Place an open order with Aster."""
+        return await self.maker_engine.place(contract_id, quantity, direction)
 
     async def place_close_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
         """Place a close order with Aster."""
-        attempt = 0
-        active_close_orders = await self._get_active_close_orders(contract_id)
-        while True:
-            attempt += 1
-            if attempt % 5 == 0:
-                self.logger.log(f"[CLOSE] Attempt {attempt} to place order", "INFO")
-                current_close_orders = await self._get_active_close_orders(contract_id)
-
-                if current_close_orders - active_close_orders > 1:
-                    self.logger.log(f"[CLOSE] ERROR: Active close orders abnormal: "
-                                    f"{active_close_orders}, {current_close_orders}", "ERROR")
-                    raise Exception(f"[CLOSE] ERROR: Active close orders abnormal: "
-                                    f"{active_close_orders}, {current_close_orders}")
-                else:
-                    active_close_orders = current_close_orders
-            # Get current market prices to adjust order price if needed
-            best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
-
-            if best_bid <= 0 or best_ask <= 0:
-                return OrderResult(success=False, error_message='No bid/ask data available')
-
-            # Adjust order price based on market conditions and side
-            adjusted_price = price
-            if side.lower() == 'sell':
-                order_side = 'SELL'
-                # For sell orders, ensure price is above best bid to be a maker order
-                if price <= best_bid:
-                    adjusted_price = best_bid + self.config.tick_size
-            elif side.lower() == 'buy':
-                order_side = 'BUY'
-                # For buy orders, ensure price is below best ask to be a maker order
-                if price >= best_ask:
-                    adjusted_price = best_ask - self.config.tick_size
-
-            adjusted_price = self.round_to_tick(adjusted_price)
-
-            # Place the order
-            order_data = {
-                'symbol': contract_id,
-                'side': order_side,
-                'type': 'LIMIT',
-                'quantity': str(quantity),
-                'price': str(adjusted_price),
-                'timeInForce': 'GTX'  # GTX is Good Till Crossing (Post Only)
-            }
-
-            result = await self._make_request('POST', '/fapi/v1/order', data=order_data)
-            order_status = result.get('status', '')
-            order_id = result.get('orderId', '')
-
-            start_time = time.time()
-            while order_status == 'NEW' and time.time() - start_time < 2:
-                await asyncio.sleep(0.1)
-                order_info = await self.get_order_info(order_id)
-                if order_info is not None:
-                    order_status = order_info.status
-
-            if order_status in ['NEW', 'PARTIALLY_FILLED']:
-                return OrderResult(success=True, order_id=order_id, side=order_side.lower(),
-                                   size=quantity, price=adjusted_price, status='OPEN')
-            elif order_status == 'FILLED':
-                return OrderResult(success=True, order_id=order_id, side=order_side.lower(),
-                                   size=quantity, price=adjusted_price, status='FILLED')
-            elif order_status == 'EXPIRED':
-                continue
-            else:
-                return OrderResult(success=False, error_message='Unknown order status: ' + order_status)
+        return await self.maker_engine.place(contract_id, quantity, side, price=price)
 
     async def place_market_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
         """Place a market order with Aster."""
@@ -638,33 +565,49 @@ class AsterClient(BaseExchangeClient):
             'symbol': contract_id,
             'side': direction.upper(),
             'type': 'MARKET',
-            'quantity': str(quantity)
+            'quantity': str(quantity),
+            'newOrderRespType': 'RESULT'  # respond with the fill, not just the ack
         }
+        return await self._place_taker_request(order_data, direction.lower(), quantity)
 
+    async def place_taker_order(self, quantity: Decimal, side: str, max_slippage: Decimal) -> OrderResult:
+        """Place an IOC limit order with Aster."""
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        if best_bid <= 0 or best_ask <= 0:
+            return OrderResult(success=False, error_message='Invalid bid/ask prices')
+
+        order_data = {
+            'symbol': self.config.contract_id,
+            'side': side.upper(),
+            'type': 'LIMIT',
+            'quantity': str(quantity),
+            'price': str(self.get_taker_limit_price(side, best_bid, best_ask, max_slippage)),
+            'timeInForce': 'IOC',
+            'newOrderRespType': 'RESULT'
+        }
+        return await self._place_taker_request(order_data, side, quantity)
+
+    async def _place_taker_request(self, order_data: Dict[str, Any], side: str, quantity: Decimal) -> OrderResult:
+        """Submit a market/IOC order and report its executed size and average price."""
         result = await self._make_request('POST', '/fapi/v1/order', data=order_data)
         order_status = result.get('status', '')
         order_id = result.get('orderId', '')
-
-        start_time = time.time()
-        while order_status != 'FILLED' and time.time() - start_time < 10:
-            await asyncio.sleep(0.2)
-            order_info = await self.get_order_info(order_id)
-            if order_info is not None:
-                order_status = order_info.status
-
-        if order_status != 'FILLED':
-            self.logger.log(f"Market order failed with status: {order_status}", "ERROR")
-            sys.exit(1)
-        # For market orders, we expect them to be filled immediately
-        else:
-            return OrderResult(
-                success=True,
-                order_id=order_id,
-                side=direction.lower(),
-                size=quantity,
-                price=order_info.price,
-                status='FILLED'
-            )
+        filled_size = Decimal(result.get('executedQty') or '0')
+
+        if filled_size <= 0:
+            self.logger.log(f"Taker order failed with status: {order_status}", "ERROR")
+            return OrderResult(success=False, order_id=order_id, side=side, status=order_status,
+                               filled_size=Decimal(0), error_message=f'Taker order not filled: {order_status}')
+
+        return OrderResult(
+            success=True,
+            order_id=order_id,
+            side=side,
+            size=quantity,
+            price=Decimal(result.get('avgPrice') or '0'),
+            status=order_status,
+            filled_size=filled_size
+        )
 
     async def cancel_order(self, order_id: str) -> OrderResult:
         """Cancel an order with Aster."""
@@ -13,10 +13,13 @@ from typing import Dict, Any, List, Optional, Tuple
 from cryptography.hazmat.primitives.asymmetric import ed25519
 import websockets
 from bpx.public import Public
-from .bp_client import Account
+from .bp_client import Account, AsyncHttpClient
 from bpx.constants.enums import OrderTypeEnum, TimeInForceEnum
 
 from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
+from .event_queue import ConflatingEventQueue
+from .maker_engine import MakerOrderEngine
+from .market_data import TopOfBook, exchange_time, record_quote
 from helpers.logger import TradingLogger
 
 
@@ -33,6 +36,13 @@ class BackpackWebSocketManager:
         self.ws_url = "wss://ws.backpack.exchange"
         self.logger = None
 
+        # Best bid/ask from the public bookTicker stream
+        self.top_of_book: Optional[TopOfBook] = None
+
+        # Messages are handled by a consumer task so a slow handler cannot back up the socket
+        self.events = ConflatingEventQueue("backpack")
+        self._consumer_task: Optional[asyncio.Task] = None
+
         # Initialize ED25519 private key from base64 decoded secret
         self.private_key = ed25519.Ed25519PrivateKey.from_private_bytes(
             base64.b64decode(secret_key)
@@ -51,6 +61,9 @@ class BackpackWebSocketManager:
 
     async def connect(self):
         """Connect to Backpack WebSocket."""
+        if self._consumer_task is None or self._consumer_task.done():
+            self._consumer_task = asyncio.create_task(self.events.run(self._dispatch_event))
+
         while True:
             try:
                 self.logger.log("Connecting to Backpack WebSocket", "INFO")
@@ -76,12 +89,22 @@ class BackpackWebSocketManager:
                 if self.logger:
                     self.logger.log(f"Subscribed to order updates for {self.symbol}", "INFO")
 
+                # Subscribe to the public best bid/ask stream (no signature required)
+                await self.websocket.send(json.dumps({
+                    "method": "SUBSCRIBE",
+                    "params": [f"bookTicker.{self.symbol}"]
+                }))
+
                 # Start listening for messages
                 await self._listen()
 
             except Exception as e:
                 if self.logger:
                     self.logger.log(f"WebSocket connection error: {e}", "ERROR")
+            finally:
+                # Quotes from a dead connection must not be used
+                self.events.discard(('bookTicker', self.symbol))
+                self.top_of_book = None
 
     async def _listen(self):
         """Listen for WebSocket messages."""
@@ -108,13 +131,17 @@ class BackpackWebSocketManager:
                 self.logger.log(f"WebSocket listen error: {e}", "ERROR")
 
     async def _handle_message(self, data: Dict[str, Any]):
-        """Handle incoming WebSocket messages."""
+        """Route incoming WebSocket messages to the event queue."""
         try:
             stream = data.get('stream', '')
             payload = data.get('data', {})
 
             if 'orderUpdate' in stream:
-                await self._handle_order_update(payload)
+                # Order events are never conflated
+                await self.events.put(('orderUpdate', payload))
+            elif stream.startswith('bookTicker'):
+                # Only the latest quote per symbol matters
+                self.events.put_latest(('bookTicker', payload.get('s')), ('bookTicker', payload))
             else:
                 self.logger.log(f"Unknown WebSocket message: {data}", "ERROR")
 
@@ -122,6 +149,26 @@ class BackpackWebSocketManager:
             if self.logger:
                 self.logger.log(f"Error handling WebSocket message: {e}", "ERROR")
 
+    async def _dispatch_event(self, event):
+        """Handle one queued (stream, payload) event on the consumer task."""
+        stream, payload = event
+        if stream == 'orderUpdate':
+            await self._handle_order_update(payload)
+        else:
+            self._handle_book_ticker(payload)
+
+    def _handle_book_ticker(self, ticker: Dict[str, Any]):
+        """Handle bookTicker messages."""
+        if ticker.get('s') != self.symbol:
+            return
+        self.top_of_book = record_quote("backpack", TopOfBook(
+            best_bid=Decimal(ticker['b']),
+            best_ask=Decimal(ticker['a']),
+            bid_size=Decimal(ticker['B']),
+            ask_size=Decimal(ticker['A']),
+            exchange_timestamp=exchange_time(ticker.get('E'))
+        ))
+
     async def _handle_order_update(self, order_data: Dict[str, Any]):
         """Handle order update messages."""
         try:
@@ -135,6 +182,8 @@ class BackpackWebSocketManager:
     async def disconnect(self):
         """Disconnect from WebSocket."""
         self.running = False
+        if self._consumer_task:
+            self._consumer_task.cancel()
         if self.websocket:
             await self.websocket.close()
             if self.logger:
@@ -152,6 +201,8 @@ class BackpackWebSocketManager:
 class BackpackClient(BaseExchangeClient):
     """Backpack exchange client implementation."""
 
+    supports_taker = True
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize Backpack client."""
         super().__init__(config)
@@ -163,14 +214,16 @@ class BackpackClient(BaseExchangeClient):
         if not self.public_key or not self.secret_key:
             raise ValueError("BACKPACK_PUBLIC_KEY and BACKPACK_SECRET_KEY must be set in environment variables")
 
-        # Initialize Backpack clients using official SDK
+        # Initialize Backpack clients using official SDK; account calls run on a pooled async HTTP client
         self.public_client = Public()
         self.account_client = Account(
             public_key=self.public_key,
-            secret_key=self.secret_key
+            secret_key=self.secret_key,
+            default_http_client=AsyncHttpClient()
         )
 
         self._order_update_handler = None
+        self.maker_engine = MakerOrderEngine(self, 'backpack')
 
     def _validate_config(self) -> None:
         """Validate Backpack configuration."""
@@ -220,6 +273,8 @@ class BackpackClient(BaseExchangeClient):
         try:
             if hasattr(self, 'ws_manager') and self.ws_manager:
                 await self.ws_manager.disconnect()
+
+            await self.account_client.http_client.close()
         except Exception as e:
             self.logger.log(f"Error during Backpack disconnect: {e}", "ERROR")
 
@@ -260,6 +315,8 @@ class BackpackClient(BaseExchangeClient):
             order_type = "CLOSE" if is_close_order else "OPEN"
 
             if event_type == 'orderFill' and quantity == fill_quantity:
+                self._notify_fill_listeners(order_id, order_side, fill_quantity)
+                self._notify_account_listeners()
                 if self._order_update_handler:
                     self._order_update_handler({
                         'order_id': order_id,
@@ -280,6 +337,8 @@ class BackpackClient(BaseExchangeClient):
                 elif event_type in ['orderCancelled', 'orderExpired']:
                     status = 'CANCELED'
 
+                self._notify_fill_listeners(order_id, order_side, fill_quantity)
+                self._notify_account_listeners()
                 if self._order_update_handler:
                     self._order_update_handler({
                         'order_id': order_id,
@@ -310,8 +369,17 @@ class BackpackClient(BaseExchangeClient):
             order_price = best_bid + self.config.tick_size
         return self.round_to_tick(order_price)
 
+    def get_cached_top_of_book(self) -> Optional[TopOfBook]:
+        """Latest top of book from the depth stream."""
+        return self.ws_manager.top_of_book if hasattr(self, 'ws_manager') else None
+
     @query_retry(default_return=(0, 0))
     async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
+        # Use WebSocket data if fresh
+        top_of_book = self.get_fresh_top_of_book()
+        if top_of_book:
+            return top_of_book.best_bid, top_of_book.best_ask
+
         # Get order book depth from Backpack
         order_book = self.public_client.get_depth(contract_id)
 
@@ -330,64 +398,39 @@ class BackpackClient(BaseExchangeClient):
 
         return best_bid, best_ask
 
-    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
-        """Place an open order with Backpack using official SDK with retry logic for POST_ONLY rejections."""
-        max_retries = 15
-        retry_count = 0
-
-        while retry_count < max_retries:
-            retry_count += 1
+    async def _submit_post_only_order(self, contract_id: str, quantity: Decimal, price: Decimal,
+                                      side: str) -> OrderResult:
+        """Submit a single post-only order with Backpack using official SDK."""
+        order_result = await self.account_client.execute_order(
+            symbol=contract_id,
+            side='Bid' if side == 'buy' else 'Ask',
+            order_type=OrderTypeEnum.LIMIT,
+            quantity=str(quantity),
+            price=str(price),
+            post_only=True,
+            time_in_force=TimeInForceEnum.GTC
+        )
 
-            best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
+        if not order_result:
+            return OrderResult(success=False, error_message='Failed to place order')
 
-            if best_bid <= 0 or best_ask <= 0:
-                return OrderResult(success=False, error_message='Invalid bid/ask prices')
+        if 'code' in order_result:
+            message = order_result.get('message', 'Unknown error')
+            self.logger.log(f"Post-only order rejected: {message}", "WARNING")
+            return OrderResult(success=False, status='REJECTED', error_message=message)
 
-            if direction == 'buy':
-                # For buy orders, place slightly below best ask to ensure execution
-                order_price = best_ask - self.config.tick_size
-                side = 'Bid'
-            else:
-                # For sell orders, place slightly above best bid to ensure execution
-                order_price = best_bid + self.config.tick_size
-                side = 'Ask'
-
-            # Place the order using Backpack SDK (post-only to ensure maker order)
-            order_result = self.account_client.execute_order(
-                symbol=contract_id,
-                side=side,
-                order_type=OrderTypeEnum.LIMIT,
-                quantity=str(quantity),
-                price=str(self.round_to_tick(order_price)),
-                post_only=True,
-                time_in_force=TimeInForceEnum.GTC
-            )
+        # Extract order ID from response
+        order_id = order_result.get('id')
+        if not order_id:
+            self.logger.log(f"No order ID in response: {order_result}", "ERROR")
+            return OrderResult(success=False, error_message='No order ID in response')
 
-            if not order_result:
-                return OrderResult(success=False, error_message='Failed to place order')
-
-            if 'code' in order_result:
-                message = order_result.get('message', 'Unknown error')
-                self.logger.log(f"[OPEN] Order rejected: {message}", "WARNING")
-                continue
-
-            # Extract order ID from response
-            order_id = order_result.get('id')
-            if not order_id:
-                self.logger.log(f"[OPEN] No order ID in response: {order_result}", "ERROR")
-                return OrderResult(success=False, error_message='No order ID in response')
-
-            # Order successfully placed
-            return OrderResult(
-                success=True,
-                order_id=order_id,
-                side=side.lower(),
-                size=quantity,
-                price=order_price,
-                status='New'
-            )
+        # Accepted post-only orders rest on the book
+        return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price, status='OPEN')
 
-        return OrderResult(success=False, error_message='Max retries exceeded')
+    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
+        """Place an open order with Backpack using official SDK with retry logic for POST_ONLY rejections."""
+        return await self.maker_engine.place(contract_id, quantity, direction)
 
     async def place_market_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
         """Place a market order with Backpack."""
@@ -399,100 +442,68 @@ class BackpackClient(BaseExchangeClient):
         else:
             raise Exception(f"[OPEN] Invalid direction: {direction}")
 
-        result = self.account_client.execute_order(
+        result = await self.account_client.execute_order(
             symbol=contract_id,
             side=side,
             order_type=OrderTypeEnum.MARKET,
             quantity=str(quantity)
         )
 
+        return self._taker_result(result, direction, quantity)
+
+    def _taker_result(self, result: Dict[str, Any], side: str, quantity: Decimal) -> OrderResult:
+        """Convert a market/IOC execute_order response to an OrderResult with fill size and average price."""
+        if not result:
+            return OrderResult(success=False, side=side, error_message='Failed to place order')
+        if 'code' in result:
+            return OrderResult(success=False, side=side, error_message=result.get('message', 'Unknown error'))
+
         order_id = result.get('id')
-        order_status = result.get('status').upper()
+        order_status = result.get('status', '').upper()
+        filled_size = Decimal(result.get('executedQuantity') or '0')
+
+        if filled_size <= 0:
+            self.logger.log(f"Taker order not filled, status: {order_status}", "ERROR")
+            return OrderResult(success=False, order_id=order_id, side=side, status=order_status,
+                               filled_size=Decimal(0), error_message=f'Taker order not filled: {order_status}')
+
+        price = Decimal(result.get('executedQuoteQuantity', '0')) / filled_size
+        return OrderResult(
+            success=True,
+            order_id=order_id,
+            side=side,
+            size=quantity,
+            price=price,
+            status=order_status,
+            filled_size=filled_size
+        )
 
-        if order_status != 'FILLED':
-            self.logger.log(f"Market order failed with status: {order_status}", "ERROR")
-            sys.exit(1)
-        # For market orders, we expect them to be filled immediately
-        else:
-            price = Decimal(result.get('executedQuoteQuantity', '0'))/Decimal(result.get('executedQuantity'))
-            return OrderResult(
-                success=True,
-                order_id=order_id,
-                side=direction.lower(),
-                size=quantity,
-                price=price,
-                status='FILLED'
-            )
+    async def place_taker_order(self, quantity: Decimal, side: str, max_slippage: Decimal) -> OrderResult:
+        """Place an IOC limit order with Backpack; the response carries the executed size and quote."""
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        if best_bid <= 0 or best_ask <= 0:
+            return OrderResult(success=False, error_message='Invalid bid/ask prices')
+
+        order_price = self.get_taker_limit_price(side, best_bid, best_ask, max_slippage)
+        result = await self.account_client.execute_order(
+            symbol=self.config.contract_id,
+            side='Bid' if side == 'buy' else 'Ask',
+            order_type=OrderTypeEnum.LIMIT,
+            quantity=str(quantity),
+            price=str(order_price),
+            time_in_force=TimeInForceEnum.IOC
+        )
+        return self._taker_result(result, side, quantity)
 
     async def place_close_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
         """Place a close order with Backpack using official SDK with retry logic for POST_ONLY rejections."""
-        max_retries = 15
-        retry_count = 0
-
-        while retry_count < max_retries:
-            retry_count += 1
-            # Get current market prices to adjust order price if needed
-            best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
-
-            if best_bid <= 0 or best_ask <= 0:
-                return OrderResult(success=False, error_message='No bid/ask data available')
-
-            # Adjust order price based on market conditions and side
-            adjusted_price = price
-            if side.lower() == 'sell':
-                order_side = 'Ask'
-                # For sell orders, ensure price is above best bid to be a maker order
-                if price <= best_bid:
-                    adjusted_price = best_bid + self.config.tick_size
-            elif side.lower() == 'buy':
-                order_side = 'Bid'
-                # For buy orders, ensure price is below best ask to be a maker order
-                if price >= best_ask:
-                    adjusted_price = best_ask - self.config.tick_size
-
-            adjusted_price = self.round_to_tick(adjusted_price)
-            # Place the order using Backpack SDK (post-only to avoid taker fees)
-            order_result = self.account_client.execute_order(
-                symbol=contract_id,
-                side=order_side,
-                order_type=OrderTypeEnum.LIMIT,
-                quantity=str(quantity),
-                price=str(adjusted_price),
-                post_only=True,
-                time_in_force=TimeInForceEnum.GTC
-            )
-
-            if not order_result:
-                return OrderResult(success=False, error_message='Failed to place order')
-
-            if 'code' in order_result:
-                message = order_result.get('message', 'Unknown error')
-                self.logger.log(f"[CLOSE] Error placing order: {message}", "ERROR")
-                continue
-
-            # Extract order ID from response
-            order_id = order_result.get('id')
-            if not order_id:
-                self.logger.log(f"[CLOSE] No order ID in response: {order_result}", "ERROR")
-                return OrderResult(success=False, error_message='No order ID in response')
-
-            # Order successfully placed
-            return OrderResult(
-                success=True,
-                order_id=order_id,
-                side=side.lower(),
-                size=quantity,
-                price=adjusted_price,
-                status='New'
-            )
-
-        return OrderResult(success=False, error_message='Max retries exceeded for close order')
+        return await self.maker_engine.place(contract_id, quantity, side, price=price)
 
     async def cancel_order(self, order_id: str) -> OrderResult:
         """Cancel an order with Backpack using official SDK."""
         try:
             # Cancel the order using Backpack SDK
-            cancel_result = self.account_client.cancel_order(
+            cancel_result = await self.account_client.cancel_order(
                 symbol=self.config.contract_id,
                 order_id=order_id
             )
@@ -514,7 +525,7 @@ class BackpackClient(BaseExchangeClient):
     async def get_order_info(self, order_id: str) -> Optional[OrderInfo]:
         """Get order information from Backpack using official SDK."""
         # Get order information using Backpack SDK
-        order_result = self.account_client.get_open_order(
+        order_result = await self.account_client.get_open_order(
             symbol=self.config.contract_id,
             order_id=order_id
         )
@@ -537,7 +548,7 @@ class BackpackClient(BaseExchangeClient):
     async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
         """Get active orders for a contract using official SDK."""
         # Get active orders using Backpack SDK
-        active_orders = self.account_client.get_open_orders(symbol=contract_id)
+        active_orders = await self.account_client.get_open_orders(symbol=contract_id)
 
         if not active_orders:
             return []
@@ -567,7 +578,7 @@ class BackpackClient(BaseExchangeClient):
     @query_retry(default_return=0)
     async def get_account_positions(self) -> Decimal:
         """Get account positions using official SDK."""
-        positions_data = self.account_client.get_open_positions()
+        positions_data = await self.account_client.get_open_positions()
         position_amt = 0
         for position in positions_data:
             if position.get('symbol', '') == self.config.contract_id:
@@ -3,13 +3,18 @@ Base exchange client interface.
 All exchange implementations should inherit from this class.
 """
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Tuple, Type, Union
-from dataclasses import dataclass
-from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP, ROUND_UP
 from datetime import datetime
 from tenacity import RetryCallState, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from .market_data import TopOfBook
+from helpers.metrics import metrics
+
 
 def query_retry(
     default_return: Any = None,
@@ -33,6 +38,9 @@ def query_retry(
     )
 
 
+TERMINAL_ORDER_STATUSES = ('FILLED', 'CANCELED', 'CANCELLED', 'CLOSED', 'EXPIRED', 'REJECTED')
+
+
 @dataclass
 class OrderResult:
     """Standardized order result structure."""
@@ -59,11 +67,36 @@ class OrderInfo:
     cancel_reason: str = ''
     created_time: Optional[datetime] = None  # 订单创建时间
     filled_time: Optional[datetime] = None   # 订单完全成交时间
+    avg_fill_price: Optional[Decimal] = None  # 成交均价（交易所提供时）
+
+
+@dataclass
+class MarginInfo:
+    """Account collateral and margin in use, as last received from the account stream."""
+    collateral: Decimal
+    margin_used: Decimal
+    timestamp: float = field(default_factory=time.time)  # local receive time
+
+    @property
+    def utilization(self) -> Optional[Decimal]:
+        """Fraction of collateral in use, or None without collateral."""
+        if self.collateral <= 0:
+            return None
+        return self.margin_used / self.collateral
 
 
 class BaseExchangeClient(ABC):
     """Base class for all exchange clients."""
 
+    # True when modify_order amends the order natively (one round trip, queue position kept where the venue allows)
+    supports_amend = False
+    # True when place_taker_order is implemented with an IOC/market primitive
+    supports_taker = False
+    # False when the client tracks a single in-flight order and orders must be sent back-to-back
+    supports_concurrent_orders = True
+    # Streamed quotes older than this (seconds) are not used to price orders; config.max_quote_age overrides
+    max_quote_age = 5.0
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize the exchange client with configuration."""
         self.config = config
@@ -76,6 +109,29 @@ class BaseExchangeClient(ABC):
         # quantize forces price to be a multiple of tick
         return price.quantize(tick, rounding=ROUND_HALF_UP)
 
+    def get_taker_limit_price(self, side: str, best_bid: Decimal, best_ask: Decimal,
+                              max_slippage: Decimal) -> Decimal:
+        """Worst acceptable IOC price: the opposite touch moved by max_slippage (a fraction), on the tick grid."""
+        tick = self.config.tick_size
+        max_slippage = Decimal(str(max_slippage))
+        if side == 'buy':
+            price = (best_ask * (1 + max_slippage)).quantize(tick, rounding=ROUND_DOWN)
+            return max(price, best_ask)
+        price = (best_bid * (1 - max_slippage)).quantize(tick, rounding=ROUND_UP)
+        return min(price, best_bid)
+
+    async def _wait_for_order_done(self, order_id: str, timeout: float = 5,
+                                   interval: float = 0.05) -> Optional[OrderInfo]:
+        """Poll get_order_info until the order is no longer resting (IOC orders finish almost immediately)."""
+        order_info = None
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            order_info = await self.get_order_info(order_id)
+            if order_info is not None and order_info.status in TERMINAL_ORDER_STATUSES:
+                return order_info
+            await asyncio.sleep(interval)
+        return order_info
+
     @abstractmethod
     def _validate_config(self) -> None:
         """Validate the exchange-specific configuration."""
@@ -106,6 +162,110 @@ class BaseExchangeClient(ABC):
         """Cancel an order."""
         pass
 
+    async def modify_order(self, order_id: str, price: Decimal, quantity: Decimal, side: str) -> OrderResult:
+        """
+        Reprice/resize an open order.
+
+        quantity is the size left to work at the new price. The default emulates
+        the amend as cancel + place_close_order; the returned order_id is then a
+        new order and filled_size is what the replaced order had filled.
+
+        If the cancel succeeds but the replacement cannot be placed, the result is
+        success=False with status='CANCELED': the original order no longer exists
+        and filled_size is its final fill.
+        """
+        cancel_result = await self.cancel_order(order_id)
+        if not cancel_result.success:
+            return OrderResult(success=False, order_id=order_id,
+                               error_message=f"Cancel before replace failed: {cancel_result.error_message}")
+
+        order_info = await self.get_order_info(order_id)
+        old_filled = Decimal(order_info.filled_size) if order_info else Decimal(0)
+
+        try:
+            result = await self.place_close_order(self.config.contract_id, quantity, price, side)
+            error_message = result.error_message
+        except Exception as e:
+            result = None
+            error_message = str(e)
+
+        if result is None or not result.success:
+            return OrderResult(success=False, order_id=order_id, side=side, status='CANCELED',
+                               filled_size=old_filled,
+                               error_message=f"Order {order_id} cancelled but replacement failed: {error_message}")
+
+        result.filled_size = old_filled
+        return result
+
+    async def place_taker_order(self, quantity: Decimal, side: str, max_slippage: Decimal) -> OrderResult:
+        """
+        Take liquidity immediately on the configured contract.
+
+        Uses the venue's IOC/market primitive, never trading worse than
+        max_slippage (a fraction of the touch price). Returns once the order is
+        done, with filled_size and the average fill price in price.
+        """
+        return OrderResult(success=False, error_message=f"Taker orders are not supported on {self.get_exchange_name()}")
+
+    async def get_available_depth(self, side: str, max_slippage: Decimal) -> Optional[Decimal]:
+        """
+        Size a taker of `side` could fill within max_slippage (a fraction) of the touch.
+
+        Returns None when the client keeps no local book.
+        """
+        return None
+
+    def get_cached_top_of_book(self) -> Optional[TopOfBook]:
+        """Latest streamed top of book, or None when the client does not keep one."""
+        return None
+
+    def get_cached_mark_price(self, max_age: float = 5.0) -> Optional[Decimal]:
+        """Mid of the streamed top of book. No REST call; None when the quote is missing or stale."""
+        top_of_book = self.get_cached_top_of_book()
+        if top_of_book is None or not top_of_book.is_valid() or top_of_book.age() > max_age:
+            return None
+        return (top_of_book.best_bid + top_of_book.best_ask) / 2
+
+    def get_fresh_top_of_book(self, max_age: Optional[float] = None) -> Optional[TopOfBook]:
+        """
+        Streamed top of book for pricing an order; None when missing, crossed or older than max_age.
+
+        Every use records the quote age in {exchange}.quote.age; refusals are counted in {exchange}.quote.stale.
+        """
+        top_of_book = self.get_cached_top_of_book()
+        if top_of_book is None or not top_of_book.is_valid():
+            return None
+
+        if max_age is None:
+            max_age = getattr(self.config, 'max_quote_age', None) or self.max_quote_age
+        name = self.get_exchange_name()
+        age = top_of_book.age()
+        metrics.histogram(f"{name}.quote.age").observe(age)
+        if age > max_age:
+            metrics.counter(f"{name}.quote.stale").inc()
+            return None
+        return top_of_book
+
+    def get_quote_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Quote age, feed one-way delay and stale-quote refusals for this exchange."""
+        return metrics.snapshot(f"{self.get_exchange_name()}.quote.")
+
+    def get_cached_margin(self) -> Optional[MarginInfo]:
+        """Collateral and margin in use from the account stream, or None when the client does not stream it."""
+        return None
+
+    def get_cached_position(self) -> Optional[Decimal]:
+        """Position from the local account cache, or None when the client keeps none."""
+        return None
+
+    def get_cached_open_orders(self) -> Optional[List[OrderInfo]]:
+        """Open orders from the local account cache, or None when the client keeps none."""
+        return None
+
+    def expire_account_cache(self) -> None:
+        """Make the next get_account_positions/get_active_orders go to REST and refresh the local cache."""
+        pass
+
     @abstractmethod
     async def get_order_info(self, order_id: str) -> Optional[OrderInfo]:
         """Get order information."""
@@ -126,6 +286,35 @@ class BaseExchangeClient(ABC):
         """Setup order update handler for WebSocket."""
         pass
 
+    def add_account_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback fired whenever the account stream delivers a position or order update."""
+        # Created lazily: not every client runs BaseExchangeClient.__init__
+        if not hasattr(self, '_account_listeners'):
+            self._account_listeners = []
+        self._account_listeners.append(listener)
+
+    def add_fill_listener(self, listener: Callable[[str, str, Decimal], None]) -> None:
+        """Register a callback fired with (order_id, side, cumulative filled size) on every streamed order update."""
+        if not hasattr(self, '_fill_listeners'):
+            self._fill_listeners = []
+        self._fill_listeners.append(listener)
+
+    def _notify_fill_listeners(self, order_id, side: str, filled_size) -> None:
+        """Fire fill listeners. Called from stream handlers, so listeners must not block."""
+        for listener in getattr(self, '_fill_listeners', ()):
+            try:
+                listener(str(order_id), side, Decimal(str(filled_size or 0)))
+            except Exception:
+                pass
+
+    def _notify_account_listeners(self) -> None:
+        """Fire account listeners. Called from stream handlers, so listeners must not block."""
+        for listener in getattr(self, '_account_listeners', ()):
+            try:
+                listener()
+            except Exception:
+                pass
+
     @abstractmethod
     def get_exchange_name(self) -> str:
         """Get the exchange name."""
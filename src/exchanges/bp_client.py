@@ -1,8 +1,12 @@
+import json
+
 from bpx.base.base_account import BaseAccount
 from bpx.http_client.sync_http_client import SyncHttpClient
 from typing import Optional, Union, Dict, Any, List
 from bpx.constants.enums import *
 
+from .http_session import HttpSessionManager
+
 
 http_client = SyncHttpClient()
 
@@ -660,4 +664,61 @@ class Account(BaseAccount):
             url=request_config.url,
             headers=request_config.headers,
             data=request_config.data,
-        )
\ No newline at end of file
+        )
+
+
+class AsyncHttpClient:
+    """
+    Async counterpart of bpx's SyncHttpClient running on a pooled keep-alive session.
+
+    Pass it as Account(default_http_client=AsyncHttpClient()): every Account method then
+    returns an awaitable instead of blocking.
+    """
+
+    def __init__(self, session_manager: Optional[HttpSessionManager] = None):
+        self.session_manager = session_manager or HttpSessionManager('backpack')
+        # Same {'http': ..., 'https': ...} mapping Account assigns to SyncHttpClient.proxies
+        self.proxies: Optional[dict] = None
+
+    @staticmethod
+    def _clean_params(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        # Match requests: drop None values; aiohttp does not accept bools in query strings
+        if not params:
+            return params
+        return {
+            key: (str(value).lower() if isinstance(value, bool) else value)
+            for key, value in params.items() if value is not None
+        }
+
+    async def _request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                       params: Optional[Dict[str, Any]] = None,
+                       data: Optional[Dict[str, Any]] = None) -> Union[Dict[str, Any], List[Any], str]:
+        session = self.session_manager.get_session()
+        body = json.dumps(data) if data is not None else None
+        proxy = (self.proxies.get('https') or self.proxies.get('http')) if self.proxies else None
+        async with session.request(method, url, headers=headers, params=self._clean_params(params),
+                                   data=body, proxy=proxy) as response:
+            text = await response.text()
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                  params: Optional[Dict[str, Any]] = None) -> Union[Dict[str, Any], List[Any], str]:
+        return await self._request('GET', url, headers=headers, params=params)
+
+    async def post(self, url: str, headers: Optional[Dict[str, str]] = None,
+                   data: Optional[Dict[str, Any]] = None) -> Union[Dict[str, Any], List[Any], str]:
+        return await self._request('POST', url, headers=headers, data=data)
+
+    async def patch(self, url: str, headers: Optional[Dict[str, str]] = None,
+                    data: Optional[Dict[str, Any]] = None) -> Union[Dict[str, Any], List[Any], str]:
+        return await self._request('PATCH', url, headers=headers, data=data)
+
+    async def delete(self, url: str, headers: Optional[Dict[str, str]] = None,
+                     data: Optional[Dict[str, Any]] = None) -> Union[Dict[str, Any], List[Any], str]:
+        return await self._request('DELETE', url, headers=headers, data=data)
+
+    async def close(self) -> None:
+        await self.session_manager.close()
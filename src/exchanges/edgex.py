@@ -8,15 +8,19 @@ import json
 import traceback
 from decimal import Decimal
 from typing import Dict, Any, List, Optional, Tuple
-from edgex_sdk import Client, OrderSide, WebSocketManager, CancelOrderParams, GetOrderBookDepthParams, GetActiveOrderParams
+from edgex_sdk import Client, OrderSide, TimeInForce, WebSocketManager, CancelOrderParams, GetOrderBookDepthParams, GetActiveOrderParams
 
 from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
+from .maker_engine import MakerOrderEngine
+from .market_data import L2Book, TopOfBook
 from helpers.logger import TradingLogger
 
 
 class EdgeXClient(BaseExchangeClient):
     """EdgeX exchange client implementation."""
 
+    supports_taker = True
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize EdgeX client."""
         super().__init__(config)
@@ -55,6 +59,15 @@ class EdgeXClient(BaseExchangeClient):
         self._ws_disconnected = asyncio.Event()
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
+        # --- public depth stream (WS-fed best bid/ask) ---
+        self.top_of_book: Optional[TopOfBook] = None
+        self._depth_book = L2Book()
+        self._ws_public_task: Optional[asyncio.Task] = None
+        self._ws_public_disconnected = asyncio.Event()
+
+        # --- post-only placement ---
+        self.maker_engine = MakerOrderEngine(self, 'edgex')
+
     def _validate_config(self) -> None:
         """Validate EdgeX configuration."""
         required_env_vars = ['EDGEX_ACCOUNT_ID', 'EDGEX_STARK_PRIVATE_KEY']
@@ -85,6 +98,17 @@ class EdgeXClient(BaseExchangeClient):
         if not self._ws_task or self._ws_task.done():
             self._ws_task = asyncio.create_task(self._run_private_ws())
 
+        try:
+            public_client = self.ws_manager.get_public_client()
+            public_client.on_disconnect(
+                lambda exc: self._loop.call_soon_threadsafe(self._ws_public_disconnected.set)
+            )
+        except Exception as e:
+            self.logger.log(f"[WS] failed to set public hooks: {e}", "ERROR")
+
+        if not self._ws_public_task or self._ws_public_task.done():
+            self._ws_public_task = asyncio.create_task(self._run_public_ws())
+
         # give first connection a moment (optional)
         await asyncio.sleep(0.5)
 
@@ -130,12 +154,48 @@ class EdgeXClient(BaseExchangeClient):
         except Exception:
             pass
 
+    async def _run_public_ws(self):
+        """Reconnect loop for the public depth stream that feeds top_of_book."""
+        backoff = 1.0
+        while not self._ws_stop.is_set():
+            try:
+                self.ws_manager.connect_public()
+                self.ws_manager.subscribe_depth(self.config.contract_id, self._handle_depth_message)
+                self.logger.log("[WS] public depth connected", "INFO")
+                backoff = 1.0
+
+                self._ws_public_disconnected.clear()
+                await asyncio.wait(
+                    {asyncio.create_task(self._ws_stop.wait()),
+                     asyncio.create_task(self._ws_public_disconnected.wait()),},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if self._ws_stop.is_set():
+                    break
+
+                self.logger.log("[WS] public depth disconnected; attempting to reconnect…", "WARNING")
+            except Exception as e:
+                self.logger.log(f"[WS] public connect error: {e}", "ERROR")
+            finally:
+                # Quotes from a dead stream must not be used; fall back to REST until resubscribed
+                self.top_of_book = None
+                self._depth_book.clear()
+                try:
+                    self.ws_manager.disconnect_public()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(backoff)
+            backoff = min(60.0, backoff * 2)
+
     async def disconnect(self) -> None:
         """Disconnect from EdgeX."""
         try:
             self._ws_stop.set()
             if self._ws_task:
                 await self._ws_task
+            if self._ws_public_task:
+                await self._ws_public_task
         except Exception:
             pass
 
@@ -206,6 +266,8 @@ class EdgeXClient(BaseExchangeClient):
                             status = "PARTIALLY_FILLED"
 
                         if status in ['OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED']:
+                            self._notify_fill_listeners(order_id, side, filled_size)
+                            self._notify_account_listeners()
                             if self._order_update_handler:
                                 self._order_update_handler({
                                     'order_id': order_id,
@@ -228,12 +290,45 @@ class EdgeXClient(BaseExchangeClient):
         except Exception as e:
             self.logger.log(f"Could not add trade-event handler: {e}", "ERROR")
 
+    def _handle_depth_message(self, message):
+        """Handle depth snapshot/changes from the public WebSocket (called from the SDK thread)."""
+        try:
+            if isinstance(message, str):
+                message = json.loads(message)
+
+            content = message.get("content", {})
+            for entry in content.get("data", []):
+                if entry.get("contractId") != self.config.contract_id:
+                    continue
+
+                bids = [(level['price'], level['size']) for level in entry.get('bids', [])]
+                asks = [(level['price'], level['size']) for level in entry.get('asks', [])]
+                depth_type = (entry.get("depthType") or content.get("dataType") or "").upper()
+                if depth_type == "SNAPSHOT":
+                    self._depth_book.apply_snapshot(bids, asks)
+                else:
+                    self._depth_book.apply_delta(bids, asks)
+
+                self.top_of_book = self._depth_book.top_of_book()
+
+        except Exception as e:
+            self.logger.log(f"Error handling depth update: {e}", "ERROR")
+
     # ---------------------------
     # REST-ish helpers
     # ---------------------------
 
+    def get_cached_top_of_book(self) -> Optional[TopOfBook]:
+        """Latest top of book from the depth stream."""
+        return self.top_of_book
+
     @query_retry(default_return=(0, 0))
     async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
+        # Use WebSocket data if fresh (depth messages carry no event time, only receive age is checked)
+        top_of_book = self.get_fresh_top_of_book()
+        if top_of_book:
+            return top_of_book.best_bid, top_of_book.best_ask
+
         depth_params = GetOrderBookDepthParams(contract_id=contract_id, limit=15)
         order_book = await self.client.quote.get_order_book_depth(depth_params)
         order_book_data = order_book['data']
@@ -267,175 +362,79 @@ class EdgeXClient(BaseExchangeClient):
             order_price = best_bid + self.config.tick_size
         return self.round_to_tick(order_price)
 
-    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
-        """Place an open order with EdgeX using official SDK with retry logic for POST_ONLY rejections."""
-        max_retries = 15
-        retry_count = 0
-
-        while retry_count < max_retries:
-            try:
-                best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
-
-                if best_bid <= 0 or best_ask <= 0:
-                    return OrderResult(success=False, error_message='Invalid bid/ask prices')
+    async def _submit_post_only_order(self, contract_id: str, quantity: Decimal, price: Decimal,
+                                      side: str) -> OrderResult:
+        """Submit a single post-only order with EdgeX using official SDK."""
+        order_side = OrderSide.BUY if side == 'buy' else OrderSide.SELL
+        order_result = await self.client.create_limit_order(
+            contract_id=contract_id,
+            size=str(quantity),
+            price=str(price),
+            side=order_side,
+            post_only=True
+        )
 
-                if direction == 'buy':
-                    # For buy orders, place slightly below best ask to ensure execution
-                    order_price = best_ask - self.config.tick_size
-                    side = OrderSide.BUY
-                else:
-                    # For sell orders, place slightly above best bid to ensure execution
-                    order_price = best_bid + self.config.tick_size
-                    side = OrderSide.SELL
-
-                # Place the order using official SDK (post-only to ensure maker order)
-                order_result = await self.client.create_limit_order(
-                    contract_id=contract_id,
-                    size=str(quantity),
-                    price=str(self.round_to_tick(order_price)),
-                    side=side,
-                    post_only=True
-                )
+        if not order_result or 'data' not in order_result:
+            return OrderResult(success=False, error_message='Failed to place order')
 
-                if not order_result or 'data' not in order_result:
-                    return OrderResult(success=False, error_message='Failed to place order')
+        # Extract order ID from response
+        order_id = order_result['data'].get('orderId')
+        if not order_id:
+            return OrderResult(success=False, error_message='No order ID in response')
 
-                # Extract order ID from response
-                order_id = order_result['data'].get('orderId')
-                if not order_id:
-                    return OrderResult(success=False, error_message='No order ID in response')
+        # Status is checked by the maker engine
+        return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price)
 
-                # Check order status after a short delay to see if it was rejected
-                await asyncio.sleep(0.01)
-                order_info = await self.get_order_info(order_id)
+    async def place_taker_order(self, quantity: Decimal, side: str, max_slippage: Decimal) -> OrderResult:
+        """Place an IOC limit order with EdgeX and wait until it is done."""
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        if best_bid <= 0 or best_ask <= 0:
+            return OrderResult(success=False, error_message='Invalid bid/ask prices')
 
-                if order_info:
-                    if order_info.status == 'CANCELED':
-                        if retry_count < max_retries - 1:
-                            retry_count += 1
-                            continue
-                        else:
-                            return OrderResult(success=False, error_message=f'Order rejected after {max_retries} attempts')
-                    elif order_info.status in ['OPEN', 'PARTIALLY_FILLED', 'FILLED']:
-                        # Order successfully placed
-                        return OrderResult(
-                            success=True,
-                            order_id=order_id,
-                            side=side.value,
-                            size=quantity,
-                            price=order_price,
-                            status=order_info.status
-                        )
-                    else:
-                        return OrderResult(success=False, error_message=f'Unexpected order status: {order_info.status}')
-                else:
-                    # Assume order is successful if we can't get info
-                    return OrderResult(
-                        success=True,
-                        order_id=order_id,
-                        side=side.value,
-                        size=quantity,
-                        price=order_price,
-                        status='OPEN'
-                    )
+        order_price = self.get_taker_limit_price(side, best_bid, best_ask, max_slippage)
+        try:
+            order_result = await self.client.create_limit_order(
+                contract_id=self.config.contract_id,
+                size=str(quantity),
+                price=str(order_price),
+                side=OrderSide.BUY if side == 'buy' else OrderSide.SELL,
+                time_in_force=TimeInForce.IMMEDIATE_OR_CANCEL
+            )
+        except Exception as e:
+            return OrderResult(success=False, side=side, error_message=str(e))
 
-            except Exception as e:
-                if retry_count < max_retries - 1:
-                    retry_count += 1
-                    await asyncio.sleep(0.1)  # Wait before retry
-                    continue
-                else:
-                    return OrderResult(success=False, error_message=str(e))
+        if not order_result or 'data' not in order_result:
+            return OrderResult(success=False, side=side, error_message='Failed to place order')
+        order_id = order_result['data'].get('orderId')
+        if not order_id:
+            return OrderResult(success=False, side=side, error_message='No order ID in response')
+
+        order_info = await self._wait_for_order_done(order_id)
+        if order_info is None or order_info.status not in ('FILLED', 'CANCELED'):
+            return OrderResult(success=False, order_id=order_id, side=side,
+                               error_message='IOC order not done after 5 seconds')
+
+        if order_info.filled_size <= 0:
+            return OrderResult(success=False, order_id=order_id, side=side, status='CANCELED',
+                               filled_size=Decimal(0), error_message='IOC order not filled')
+
+        return OrderResult(
+            success=True,
+            order_id=order_id,
+            side=side,
+            size=quantity,
+            price=order_info.avg_fill_price or order_price,
+            status='FILLED' if order_info.remaining_size == 0 else 'PARTIALLY_FILLED',
+            filled_size=order_info.filled_size
+        )
 
-        return OrderResult(success=False, error_message='Max retries exceeded')
+    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
+        """Place an open order with EdgeX using official SDK with retry logic for POST_ONLY rejections."""
+        return await self.maker_engine.place(contract_id, quantity, direction)
 
     async def place_close_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
         """Place a close order with EdgeX using official SDK with retry logic for POST_ONLY rejections."""
-        max_retries = 15
-        retry_count = 0
-
-        while retry_count < max_retries:
-            try:
-                best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
-
-                if best_bid <= 0 or best_ask <= 0:
-                    return OrderResult(success=False, error_message='Invalid bid/ask prices')
-
-                # Convert side string to OrderSide enum
-                order_side = OrderSide.BUY if side.lower() == 'buy' else OrderSide.SELL
-
-                # Adjust order price based on market conditions and side
-                adjusted_price = price
-
-                if side.lower() == 'sell':
-                    # For sell orders, ensure price is above best bid to be a maker order
-                    if price <= best_bid:
-                        adjusted_price = best_bid + self.config.tick_size
-                elif side.lower() == 'buy':
-                    # For buy orders, ensure price is below best ask to be a maker order
-                    if price >= best_ask:
-                        adjusted_price = best_ask - self.config.tick_size
-
-                adjusted_price = self.round_to_tick(adjusted_price)
-                # Place the order using official SDK (post-only to avoid taker fees)
-                order_result = await self.client.create_limit_order(
-                    contract_id=contract_id,
-                    size=str(quantity),
-                    price=str(adjusted_price),
-                    side=order_side,
-                    post_only=True
-                )
-
-                if not order_result or 'data' not in order_result:
-                    return OrderResult(success=False, error_message='Failed to place order')
-
-                # Extract order ID from response
-                order_id = order_result['data'].get('orderId')
-                if not order_id:
-                    return OrderResult(success=False, error_message='No order ID in response')
-
-                # Check order status after a short delay to see if it was rejected
-                await asyncio.sleep(0.01)
-                order_info = await self.get_order_info(order_id)
-
-                if order_info:
-                    if order_info.status == 'CANCELED':
-                        if retry_count < max_retries - 1:
-                            retry_count += 1
-                            continue
-                        else:
-                            return OrderResult(success=False, error_message=f'Close order rejected after {max_retries} attempts')
-                    elif order_info.status in ['OPEN', 'PARTIALLY_FILLED', 'FILLED']:
-                        # Order successfully placed
-                        return OrderResult(
-                            success=True,
-                            order_id=order_id,
-                            side=side,
-                            size=quantity,
-                            price=adjusted_price,
-                            status=order_info.status
-                        )
-                    else:
-                        return OrderResult(success=False, error_message=f'Unexpected close order status: {order_info.status}')
-                else:
-                    # Assume order is successful if we can't get info
-                    return OrderResult(
-                        success=True,
-                        order_id=order_id,
-                        side=side,
-                        size=quantity,
-                        price=adjusted_price
-                    )
-
-            except Exception as e:
-                if retry_count < max_retries - 1:
-                    retry_count += 1
-                    await asyncio.sleep(0.1)  # Wait before retry
-                    continue
-                else:
-                    return OrderResult(success=False, error_message=str(e))
-
-        return OrderResult(success=False, error_message='Max retries exceeded for close order')
+        return await self.maker_engine.place(contract_id, quantity, side, price=price)
 
     async def cancel_order(self, order_id: str) -> OrderResult:
         """Cancel an order with EdgeX using official SDK."""
@@ -467,14 +466,17 @@ class EdgeXClient(BaseExchangeClient):
         order_list = order_result['data']
         if order_list and len(order_list) > 0:
             order_data = order_list[0]
+            filled_size = Decimal(order_data.get('cumMatchSize', 0))
+            filled_value = Decimal(order_data.get('cumMatchValue', 0))
             return OrderInfo(
                 order_id=order_data.get('id', ''),
                 side=order_data.get('side', '').lower(),
                 size=Decimal(order_data.get('size', 0)),
                 price=Decimal(order_data.get('price', 0)),
                 status=order_data.get('status', ''),
-                filled_size=Decimal(order_data.get('cumMatchSize', 0)),
-                remaining_size=Decimal(order_data.get('size', 0)) - Decimal(order_data.get('cumMatchSize', 0))
+                filled_size=filled_size,
+                remaining_size=Decimal(order_data.get('size', 0)) - filled_size,
+                avg_fill_price=filled_value / filled_size if filled_size > 0 and filled_value > 0 else None
             )
 
         return None
@@ -0,0 +1,129 @@
+"""
+Bounded, conflating event queue between a WebSocket reader and its consumer.
+"""
+
+import asyncio
+import inspect
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from helpers.metrics import metrics
+
+
+class ConflatingEventQueue:
+    """
+    Decouples a feed reader from the code that handles its messages.
+
+    Two kinds of events share one FIFO:
+    - put(): ordered events (order updates, fills). Never dropped; when maxsize of them are
+      pending the reader waits, pushing backpressure onto the socket instead of growing memory.
+    - put_latest(key, item): snapshot events (BBO, account stats). Only the latest item per key
+      is kept; a newer item replaces the pending one in place, so the queue holds at most one
+      slot per key however fast the feed bursts.
+
+    The queue is used from a single event loop (reader and consumer are tasks on it).
+    Metrics: {name}.queue.depth, {name}.queue.lag (seconds from put to dequeue),
+    {name}.queue.conflated, {name}.queue.backpressure and {name}.queue.errors.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1000):
+        self.name = name
+        self.maxsize = maxsize
+
+        # (key, item, enqueue_time); key is None for ordered events
+        self._entries: deque = deque()
+        # key -> (item, enqueue_time) of the pending conflated item
+        self._latest: Dict[Hashable, Tuple[Any, float]] = {}
+        self._ordered_count = 0
+        self._not_empty: Optional[asyncio.Event] = None
+        self._not_full: Optional[asyncio.Event] = None
+
+        self.depth = metrics.gauge(f"{name}.queue.depth")
+        self.lag = metrics.histogram(f"{name}.queue.lag")
+        self.conflated = metrics.counter(f"{name}.queue.conflated")
+        self.backpressure = metrics.counter(f"{name}.queue.backpressure")
+        self.errors = metrics.counter(f"{name}.queue.errors")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _events(self) -> Tuple[asyncio.Event, asyncio.Event]:
+        # Created lazily so the queue can be constructed outside a running loop
+        if self._not_empty is None:
+            self._not_empty = asyncio.Event()
+            self._not_full = asyncio.Event()
+            self._not_full.set()
+        return self._not_empty, self._not_full
+
+    async def put(self, item: Any) -> None:
+        """Enqueue an ordered event, waiting while maxsize ordered events are pending."""
+        not_empty, not_full = self._events()
+        if self._ordered_count >= self.maxsize:
+            self.backpressure.inc()
+            while self._ordered_count >= self.maxsize:
+                not_full.clear()
+                await not_full.wait()
+
+        self._entries.append((None, item, time.time()))
+        self._ordered_count += 1
+        self.depth.set(len(self._entries))
+        not_empty.set()
+
+    def put_latest(self, key: Hashable, item: Any) -> None:
+        """Enqueue a snapshot event, replacing any pending event with the same key."""
+        not_empty, _ = self._events()
+        if key in self._latest:
+            self.conflated.inc()
+        else:
+            self._entries.append((key, None, None))
+        self._latest[key] = (item, time.time())
+        self.depth.set(len(self._entries))
+        not_empty.set()
+
+    def discard(self, key: Hashable) -> None:
+        """Drop the pending snapshot event for key, if any (e.g. a quote from a dead connection)."""
+        if self._latest.pop(key, None) is not None:
+            self._entries = deque(entry for entry in self._entries if entry[0] != key)
+            self.depth.set(len(self._entries))
+
+    def get_nowait(self) -> Any:
+        """Dequeue the oldest event. Raises asyncio.QueueEmpty when nothing is pending."""
+        if not self._entries:
+            raise asyncio.QueueEmpty()
+
+        key, item, enqueue_time = self._entries.popleft()
+        if key is None:
+            self._ordered_count -= 1
+            if self._not_full is not None:
+                self._not_full.set()
+        else:
+            item, enqueue_time = self._latest.pop(key)
+
+        self.lag.observe(time.time() - enqueue_time)
+        self.depth.set(len(self._entries))
+        return item
+
+    async def get(self) -> Any:
+        """Dequeue the oldest event, waiting until one is available."""
+        not_empty, _ = self._events()
+        while not self._entries:
+            not_empty.clear()
+            await not_empty.wait()
+        return self.get_nowait()
+
+    async def run(self, handler: Callable[[Any], Union[None, Awaitable[None]]]) -> None:
+        """
+        Consumer loop: hand every event to handler (sync or async) until cancelled.
+
+        Handlers are expected to log their own errors; anything that escapes is counted in
+        {name}.queue.errors so one bad message cannot stop the consumer.
+        """
+        while True:
+            item = await self.get()
+            try:
+                result = handler(item)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                self.errors.inc()
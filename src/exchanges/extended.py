@@ -10,6 +10,10 @@ from decimal import Decimal, ROUND_HALF_UP
 from tenacity import RetryCallState, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
+from .account_state import AccountStateCache
+from .http_session import HttpSessionManager
+from .maker_engine import MakerOrderEngine
+from .market_data import TopOfBook, exchange_time, record_quote
 from helpers.logger import TradingLogger
 
 from x10.perpetual.trading_client import PerpetualTradingClient
@@ -25,7 +29,6 @@ import time
 import json
 import traceback
 import asyncio
-import aiohttp
 
 from dotenv import load_dotenv
 import os
@@ -37,7 +40,8 @@ async def _stream_worker(
     url: str,
     handler,
     stop_event: asyncio.Event,
-    extra_headers: dict | list[tuple[str, str]] | None = None,):
+    extra_headers: dict | list[tuple[str, str]] | None = None,
+    on_disconnect=None,):
     while not stop_event.is_set():
         try:
             async with websockets.connect(
@@ -64,6 +68,8 @@ async def _stream_worker(
 
         except Exception as e:
             print(f"❌ {url} error: {e}")
+            if on_disconnect:
+                on_disconnect()
             await asyncio.sleep(3)  # simple reconnect delay
 
 def utc_now():
@@ -72,6 +78,9 @@ def utc_now():
 class ExtendedClient(BaseExchangeClient):
     """Extended exchange client implementation."""
 
+    supports_amend = True
+    supports_taker = True
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize the exchange client with configuration."""
         super().__init__(config)
@@ -92,17 +101,27 @@ class ExtendedClient(BaseExchangeClient):
         self._order_update_handler = None
 
         self.orderbook = None
+        # Best bid/ask of the depth-1 stream with receive and exchange timestamps
+        self.top_of_book: Optional[TopOfBook] = None
+
+        # Shared keep-alive session for REST order lookups
+        self.http_session = HttpSessionManager('extended')
         
         # For websocket
         self._stop_event = asyncio.Event()
         self._tasks: list[asyncio.Task] = []
         
-        # Maintain open order dict because there is a delay in the official Rest API
-        self.open_orders = {} # {order_id: order_info}
+        # Local order store (open, filled, canceled) fed by the account stream, because there is a delay in the official Rest API
+        self.order_store = AccountStateCache()
+        self.order_store.on_update = self._notify_account_listeners
+        self.reconcile_interval = float(os.getenv('EXTENDED_RECONCILE_INTERVAL', '30'))
+
+        self.maker_engine = MakerOrderEngine(self, 'extended')
+        # internal order ID -> external ID of orders placed by this client, for replace (amend)
+        self._external_order_ids: Dict[str, str] = {}
+
         self.partially_filled_size = 0
         self.partially_filled_avg_price = 0
-        self.initial_check_for_open_orders = True  # PATCH: will turn to False after 2 times (to match the trading bot logic), so that we can get the open orders even after restarting the script
-        self.get_active_orders_cnt = 0
 
     def _validate_config(self) -> None:
         """Validate the exchange-specific configuration."""
@@ -123,7 +142,8 @@ class ExtendedClient(BaseExchangeClient):
                 host + "/account",
                 self.handle_account, 
                 self._stop_event,
-                extra_headers=[("X-API-Key", self.api_key)]
+                extra_headers=[("X-API-Key", self.api_key)],
+                on_disconnect=self.order_store.invalidate
                 )),
             # connect to the orderbook update stream
             asyncio.create_task(_stream_worker(
@@ -152,6 +172,8 @@ class ExtendedClient(BaseExchangeClient):
                 t.cancel()
             await asyncio.gather(*self._tasks, return_exceptions=True)
             self.logger.log("Streams stopped", "INFO")
+
+            await self.http_session.close()
             
             # 2. Close the main client connection if it exists
             if hasattr(self, 'client') and self.perpetual_trading_client:
@@ -163,6 +185,7 @@ class ExtendedClient(BaseExchangeClient):
             
             # 5. Reset internal state
             self.orderbook = None
+            self.top_of_book = None
             self._order_update_handler = None
             
             self.logger.log("Extended exchange disconnected successfully", "INFO")
@@ -174,244 +197,153 @@ class ExtendedClient(BaseExchangeClient):
         
         
     async def fetch_bbo_prices(self, contract_id: str) -> tuple[Decimal, Decimal]:
-        """Fetch best bid and offer prices from orderbook."""
+        """Fetch best bid and offer prices from the websocket orderbook, refusing stale quotes."""
         try:
-            # Get the orderbook from the websocket updated cache
-            orderbook = self.orderbook
-            
-            if orderbook == None:
-                self.logger.log(f"Error fetching BBO prices for {contract_id}: orderbook is None", level="ERROR")
+            # Get the quote from the websocket updated cache
+            top_of_book = self.get_fresh_top_of_book()
+
+            if top_of_book is None:
+                cached = self.top_of_book
+                reason = "orderbook is None" if cached is None else f"quote is invalid or {cached.age():.1f}s old"
+                self.logger.log(f"Error fetching BBO prices for {contract_id}: {reason}", level="ERROR")
                 return Decimal('0'), Decimal('0')
-            
-            # Get best bid (highest bid price)
-            best_bid = Decimal('0')
-            if orderbook["bid"] and len(orderbook["bid"]) > 0:
-                best_bid = Decimal(orderbook["bid"][0]["p"])
-            
-            # Get best ask (lowest ask price)  
-            best_ask = Decimal('0')
-            if orderbook["ask"] and len(orderbook["ask"]) > 0:
-                best_ask = Decimal(orderbook["ask"][0]["p"])
 
-            return best_bid, best_ask
+            return top_of_book.best_bid, top_of_book.best_ask
             
         except Exception as e:
             self.logger.log(f"Error fetching BBO prices for {contract_id}: {str(e)}", level="ERROR")
             return Decimal('0'), Decimal('0')
 
+    async def _submit_post_only_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str,
+                                      expire_after: timedelta = timedelta(days=1),
+                                      previous_order_id: Optional[str] = None) -> OrderResult:
+        """Submit a single post-only order with Extended using official SDK.
+
+        previous_order_id is the external ID of an order this one atomically replaces.
+        """
+        order_result = await self.perpetual_trading_client.place_order(
+            market_name=contract_id,
+            amount_of_synthetic=quantity,
+            price=price,
+            side=OrderSide.BUY if side == 'buy' else OrderSide.SELL,
+            time_in_force=TimeInForce.GTT,
+            post_only=True,  # Ensure MAKER orders
+            expire_time=utc_now() + expire_after,  # SDK 1 hour default
+            previous_order_id=previous_order_id,
+        )
+
+        if not order_result or not order_result.data or order_result.status != 'OK':
+            return OrderResult(success=False, error_message='Failed to place order')
+
+        # Extract order ID from response
+        order_id = order_result.data.id
+        if not order_id:
+            return OrderResult(success=False, error_message='No order ID in response')
+
+        # Replacing an order needs its external ID
+        self._external_order_ids[str(order_id)] = order_result.data.external_id
+
+        # Status is checked by the maker engine (served from the account stream)
+        return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price)
+
+    async def place_taker_order(self, quantity: Decimal, side: str, max_slippage: Decimal) -> OrderResult:
+        """Place an IOC limit order with Extended and wait for the account stream to report it done."""
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        if best_bid <= 0 or best_ask <= 0:
+            return OrderResult(success=False, error_message='Invalid bid/ask prices')
+
+        order_price = self.get_taker_limit_price(side, best_bid, best_ask, max_slippage)
+        order_result = await self.perpetual_trading_client.place_order(
+            market_name=self.config.contract_id,
+            amount_of_synthetic=quantity.quantize(self.min_order_size, rounding=ROUND_HALF_UP),
+            price=order_price,
+            side=OrderSide.BUY if side == 'buy' else OrderSide.SELL,
+            time_in_force=TimeInForce.IOC,
+        )
+
+        if not order_result or not order_result.data or order_result.status != 'OK':
+            return OrderResult(success=False, side=side, error_message='Failed to place order')
+
+        order_id = str(order_result.data.id)
+        order_info = await self._wait_for_order_done(order_id)
+        if order_info is None or order_info.status not in ['FILLED', 'CANCELED', 'EXPIRED']:
+            return OrderResult(success=False, order_id=order_id, side=side,
+                               error_message='IOC order not finished after 5 seconds')
+
+        if order_info.filled_size <= 0:
+            return OrderResult(success=False, order_id=order_id, side=side, status=order_info.status,
+                               filled_size=Decimal(0), error_message='IOC order not filled')
+
+        return OrderResult(
+            success=True,
+            order_id=order_id,
+            side=side,
+            size=quantity,
+            price=order_info.avg_fill_price or order_price,
+            status=order_info.status,
+            filled_size=order_info.filled_size
+        )
+
     async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
         """Place an open order with Extended using official SDK with retry logic for POST_ONLY rejections."""
-        max_retries = 15
-        retry_count = 0
-
-        while retry_count < max_retries:
-            try:
-                if self.orderbook == None:
-                    # the websocket orderbook is not updated yet, sleep for 1 second
-                    await asyncio.sleep(1)
-                    self.logger.log(f"Orderbook is not updated yet, sleeping for 1 second", level="INFO")
-                    continue
-
-                best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
-
-                if best_bid <= 0 or best_ask <= 0:
-                    return OrderResult(success=False, error_message='Invalid bid/ask prices')
+        while self.orderbook is None:
+            # the websocket orderbook is not updated yet, sleep for 1 second
+            self.logger.log(f"Orderbook is not updated yet, sleeping for 1 second", level="INFO")
+            await asyncio.sleep(1)
 
-                if direction == 'buy':
-                    # For buy orders, place slightly below best ask to ensure execution
-                    order_price = best_ask - self.config.tick_size
-                    side = OrderSide.BUY
-                else:
-                    # For sell orders, place slightly above best bid to ensure execution
-                    order_price = best_bid + self.config.tick_size
-                    side = OrderSide.SELL
-
-                # Round price to appropriate precision
-                rounded_price = self.round_to_tick(order_price)
-
-                # set timeout to 9 seconds for open orders to avoid orders being filled right when trading_bot hit 10s timeout and call cancel_order
-                # Place the order using official SDK (post-only to ensure maker order)
-                order_result = await self.perpetual_trading_client.place_order(
-                    market_name=contract_id,
-                    amount_of_synthetic=quantity,
-                    price=rounded_price,
-                    side=side,
-                    time_in_force=TimeInForce.GTT,
-                    post_only=True,  # Ensure MAKER orders
-                    expire_time = utc_now() + timedelta(days=1), # SDK 1 hour default
-                )
-
-                if not order_result or not order_result.data or order_result.status != 'OK':
-                    return OrderResult(success=False, error_message='Failed to place order')
-
-                # Extract order ID from response
-                order_id = order_result.data.id
-                if not order_id:
-                    return OrderResult(success=False, error_message='No order ID in response')
-
-                # Check order status after a short delay to see if it was rejected
-                await asyncio.sleep(0.01)
-                order_info = await self.get_order_info(order_id)
-
-                if order_info:
-                    if order_info.status in ['CANCELED', 'REJECTED']:
-                        if retry_count < max_retries - 1:
-                            self.logger.log(f"POST-ONLY order rejected, retrying", level="INFO")
-                            retry_count += 1
-                            continue
-                        else:
-                            self.logger.log(f"POST-ONLY order rejected after {max_retries} attempts", level="ERROR")
-                            return OrderResult(success=False, error_message=f'Order rejected after {max_retries} attempts')
-                    elif order_info.status in ['NEW', 'OPEN', 'PARTIALLY_FILLED', 'FILLED']:
-                        # Order successfully placed
-                        return OrderResult(
-                            success=True,
-                            order_id=order_id,
-                            side=side.value,
-                            size=quantity,
-                            price=rounded_price,
-                            status=order_info.status
-                        )
-                    else:
-                        return OrderResult(success=False, error_message=f'Unexpected order status: {order_info.status}')
-                else:
-                    # Assume order is successful if we can't get info
-                    self.logger.log(f"Could not get order info for {order_id}, assuming order is successful", level="ERROR")
-                    return OrderResult(
-                        success=True,
-                        order_id=order_id,
-                        side=side.value,
-                        size=quantity,
-                        price=rounded_price
-                    )
-
-            except Exception as e:
-                if retry_count < max_retries - 1:
-                    retry_count += 1
-                    await asyncio.sleep(0.1)  # Wait before retry
-                    continue
-                else:
-                    return OrderResult(success=False, error_message=str(e))
+        return await self.maker_engine.place(contract_id, quantity, direction, expire_after=timedelta(days=1))
 
-        return OrderResult(success=False, error_message='Max retries exceeded')
-    
     async def place_close_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
         """Place a close order with Extended using official SDK with retry logic for POST_ONLY rejections."""
-        max_retries = 15
-        retry_count = 0
-
-        while retry_count < max_retries:
-            try:
-                best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
-                print(f"best_bid: {best_bid}, best_ask: {best_ask}")
-                print('--------------------------------')
-                if best_bid <= 0 or best_ask <= 0:
-                    return OrderResult(success=False, error_message='Invalid bid/ask prices')
-
-                # Convert side string to OrderSide enum
-                order_side = OrderSide.BUY if side.lower() == 'buy' else OrderSide.SELL
-
-                # Adjust order price based on market conditions and side
-                adjusted_price = price
-                
-                # PATCH: (for partially filled orders) Adjust the quantity to add partially filled order size so that we can close them together
-                # cache these just in case order fails to place
-                prev_partially_filled_size = self.partially_filled_size
-                prev_partially_filled_avg_price = self.partially_filled_avg_price
-                
-                if self.partially_filled_size > 0:
-                    self.logger.log(f"Adding partially_filled_size {self.partially_filled_size} and partially_filled_avg_price {self.partially_filled_avg_price} to the close order", level="INFO")
-                    quantity = quantity + self.partially_filled_size
-                    expected_tp_price_for_partial_fills = (1 + self.config.take_profit/100) * self.partially_filled_avg_price
-                    adjusted_price = (price * quantity + expected_tp_price_for_partial_fills * self.partially_filled_size) / (quantity + self.partially_filled_size)
-                    self.logger.log(f"Updated close order quantity to {quantity} and adjusted_price to {adjusted_price}", level="INFO")
-
-                    # reset to 0
-                    self.partially_filled_size = 0
-                    self.partially_filled_avg_price = 0
-                    self.logger.log(f"Reset partially_filled_size and partially_filled_avg_price to 0", level="INFO")
-
-                if side.lower() == 'sell':
-                    # For sell orders, ensure price is above best bid to be a maker order
-                    if price <= best_bid:
-                        adjusted_price = best_bid + self.config.tick_size
-                elif side.lower() == 'buy':
-                    # For buy orders, ensure price is below best ask to be a maker order
-                    if price >= best_ask:
-                        adjusted_price = best_ask - self.config.tick_size
-
-                # Round price to appropriate precision
-                rounded_price = self.round_to_tick(adjusted_price)
-                quantity = quantity.quantize(self.min_order_size, rounding=ROUND_HALF_UP)
-
-                # Place the order using official SDK (post-only to avoid taker fees)
-                order_result = await self.perpetual_trading_client.place_order(
-                    market_name=contract_id,
-                    amount_of_synthetic=quantity,
-                    price=rounded_price,
-                    side=order_side,
-                    time_in_force=TimeInForce.GTT,
-                    post_only=True,  # Ensure MAKER orders
-                    expire_time = utc_now() + timedelta(days=90), # SDK 1 hour default
-                )
-
-                if not order_result or not order_result.data or order_result.status != 'OK':
-                    # reset to previous values
-                    self.partially_filled_size = prev_partially_filled_size
-                    self.partially_filled_avg_price = prev_partially_filled_avg_price
-                    self.logger.log(f"Reverted partially_filled_size and partially_filled_avg_price to {prev_partially_filled_size} and {prev_partially_filled_avg_price}", level="INFO")
-                    return OrderResult(success=False, error_message='Failed to place order')
-
-                # Extract order ID from response
-                order_id = order_result.data.id
-                if not order_id:
-                    return OrderResult(success=False, error_message='No order ID in response')
-
-                # Check order status after a short delay to see if it was rejected
-                await asyncio.sleep(0.01)
-                order_info = await self.get_order_info(order_id)
-
-                if order_info:
-                    if order_info.status == 'CANCELED':
-                        if retry_count < max_retries - 1:
-                            retry_count += 1
-                            continue
-                        else:
-                            return OrderResult(success=False, error_message=f'Close order rejected after {max_retries} attempts')
-                    elif order_info.status in ['NEW', 'OPEN', 'PARTIALLY_FILLED', 'FILLED']:
-                        # Order successfully placed
-                        return OrderResult(
-                            success=True,
-                            order_id=order_id,
-                            side=side,
-                            size=quantity,
-                            price=rounded_price,
-                            status=order_info.status
-                        )
-                    elif order_info.status == 'REJECTED':
-                        raise Exception(f'Close order rejected: {order_info.status}')
-                    else:
-                        raise Exception(f'Unexpected close order status: {order_info.status}')
-                else:
-                    # Assume order is successful if we can't get info
-                    self.logger.log(f"Could not get order info for {order_id}, assuming order is successful", level="ERROR")
-                    return OrderResult(
-                        success=True,
-                        order_id=order_id,
-                        side=side,
-                        size=quantity,
-                        price=rounded_price
-                    )
-
-            except Exception as e:
-                if retry_count < max_retries - 1:
-                    retry_count += 1
-                    await asyncio.sleep(0.1)  # Wait before retry
-                    continue
-                else:
-                    return OrderResult(success=False, error_message=str(e))
-
-        return OrderResult(success=False, error_message='Max retries exceeded')
+        adjusted_price = price
+
+        # PATCH: (for partially filled orders) Adjust the quantity to add partially filled order size so that we can close them together
+        # cache these just in case order fails to place
+        prev_partially_filled_size = self.partially_filled_size
+        prev_partially_filled_avg_price = self.partially_filled_avg_price
+
+        if self.partially_filled_size > 0:
+            self.logger.log(f"Adding partially_filled_size {self.partially_filled_size} and partially_filled_avg_price {self.partially_filled_avg_price} to the close order", level="INFO")
+            quantity = quantity + self.partially_filled_size
+            expected_tp_price_for_partial_fills = (1 + self.config.take_profit/100) * self.partially_filled_avg_price
+            adjusted_price = (price * quantity + expected_tp_price_for_partial_fills * self.partially_filled_size) / (quantity + self.partially_filled_size)
+            self.logger.log(f"Updated close order quantity to {quantity} and adjusted_price to {adjusted_price}", level="INFO")
+
+            # reset to 0
+            self.partially_filled_size = 0
+            self.partially_filled_avg_price = 0
+            self.logger.log(f"Reset partially_filled_size and partially_filled_avg_price to 0", level="INFO")
+
+        quantity = quantity.quantize(self.min_order_size, rounding=ROUND_HALF_UP)
+        result = await self.maker_engine.place(contract_id, quantity, side, price=adjusted_price,
+                                               expire_after=timedelta(days=90))
+
+        if not result.success:
+            # reset to previous values
+            self.partially_filled_size = prev_partially_filled_size
+            self.partially_filled_avg_price = prev_partially_filled_avg_price
+            self.logger.log(f"Reverted partially_filled_size and partially_filled_avg_price to {prev_partially_filled_size} and {prev_partially_filled_avg_price}", level="INFO")
+
+        return result
+
+    async def modify_order(self, order_id: str, price: Decimal, quantity: Decimal, side: str) -> OrderResult:
+        """Replace a resting order with a new price and size in one request (Extended previous_order_id)."""
+        external_id = self._external_order_ids.get(str(order_id))
+        if external_id is None:
+            # Not placed by this client; fall back to cancel + place
+            return await super().modify_order(order_id, price, quantity, side)
+
+        old_order = self.order_store.get_order(str(order_id))
+        price = self.round_to_tick(price)
+        quantity = quantity.quantize(self.min_order_size, rounding=ROUND_HALF_UP)
+        result = await self._submit_post_only_order(self.config.contract_id, quantity, price, side,
+                                                    expire_after=timedelta(days=90),
+                                                    previous_order_id=external_id)
+        if result.success:
+            self._external_order_ids.pop(str(order_id), None)
+            result.status = 'OPEN'
+            result.filled_size = Decimal(old_order.filled_size) if old_order else Decimal(0)
+        return result
 
     async def cancel_order(self, order_id: str) -> OrderResult:
         """Cancel an order with Extended using the internal order ID."""
@@ -460,9 +392,34 @@ class ExtendedClient(BaseExchangeClient):
         except Exception as e:
             return OrderResult(success=False, error_message=str(e))
 
+    def _to_order_info(self, order: Dict[str, Any]) -> OrderInfo:
+        """Convert an order in the REST/WebSocket JSON format to OrderInfo."""
+        # Convert status to match expected format
+        status = order.get("status", "")
+        if status == "NEW":
+            status = "OPEN"
+        elif status == "CANCELLED":
+            status = "CANCELED"
+
+        qty = Decimal(order.get("qty", "0"))
+        filled_qty = Decimal(order.get("filledQty") or "0")
+        return OrderInfo(
+            order_id=str(order.get("id", "")),
+            side=order.get("side", "").lower(),
+            size=qty - filled_qty,  # PATCH: remaining size to match with the trading bot logic
+            price=Decimal(order.get("price", "0")),
+            status=status,
+            filled_size=filled_qty,
+            remaining_size=qty - filled_qty,
+            avg_fill_price=Decimal(order["averagePrice"]) if order.get("averagePrice") else None
+        )
+
     async def get_order_info(self, order_id: str) -> Optional[OrderInfo]:
-        """Get order information using REST API endpoint."""
-        order_info = None
+        """Get order information from the local order store, falling back to the REST API on a miss."""
+        order_info = self.order_store.get_order(order_id)
+        if order_info:
+            return order_info
+
         url = f"https://api.starknet.extended.exchange/api/v1/user/orders/{order_id}"
         headers = {
             "X-Api-Key": self.api_key,
@@ -473,115 +430,83 @@ class ExtendedClient(BaseExchangeClient):
         while not order_info and attempt < 50:
             attempt += 1
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, headers=headers) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            
-                            if data.get("status") != "OK" or not data.get("data"):
-                                self.logger.log(f"Failed to get order info attempt {attempt} for {order_id}: {data}", "ERROR")
-                                return None
-                            
-                            order_data = data["data"]
-                            
-                            # Convert status to match expected format
-                            status = order_data.get("status", "")
-                            if status == "NEW":
-                                status = "OPEN"
-                            elif status == "CANCELLED":
-                                status = "CANCELED"
-                            
-                            # Create OrderInfo object
-                            order_info = OrderInfo(
-                                order_id=str(order_data.get("id", "")),
-                                side=order_data.get("side", "").lower(),
-                                size=Decimal(order_data.get("qty", "0")) - Decimal(order_data.get("filledQty", "0")),
-                                price=Decimal(order_data.get("price", "0")),
-                                status=status,
-                                filled_size=Decimal(order_data.get("filledQty", "0")),
-                                remaining_size=Decimal(order_data.get("qty", "0")) - Decimal(order_data.get("filledQty", "0"))
-                            )
-                            return order_info
-                        
-                        elif response.status == 404:
-                            # Order not found
-                            self.logger.log(f"Order {order_id} not found attempt {attempt}", "INFO")
+                session = self.http_session.get_session()
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 200:
+                        data = await response.json()
                         
-                        else:
-                            self.logger.log(f"Failed to get order info attempt {attempt} for {order_id}: HTTP {response.status}", "ERROR")
+                        if data.get("status") != "OK" or not data.get("data"):
+                            self.logger.log(f"Failed to get order info attempt {attempt} for {order_id}: {data}", "ERROR")
+                            return None
+
+                        order_info = self._to_order_info(data["data"])
+                        self.order_store.upsert_order(order_info)
+                        return order_info
+                    
+                    elif response.status == 404:
+                        # Order not found
+                        self.logger.log(f"Order {order_id} not found attempt {attempt}", "INFO")
+                    
+                    else:
+                        self.logger.log(f"Failed to get order info attempt {attempt} for {order_id}: HTTP {response.status}", "ERROR")
                             
             except Exception as e:
                 self.logger.log(f"Error getting order info attempt {attempt} for {order_id}: {str(e)}", "ERROR")
             
             await asyncio.sleep(0.5)
+
+            # The REST API lags behind the stream; the update may have arrived meanwhile
+            order_info = self.order_store.get_order(order_id)
         return order_info
 
+    def get_cached_top_of_book(self) -> Optional[TopOfBook]:
+        """Latest top of book from the orderbook stream."""
+        return self.top_of_book
+
+    def get_cached_open_orders(self) -> Optional[List[OrderInfo]]:
+        """Open orders from the local order store, once seeded."""
+        if not self.order_store.orders_ready:
+            return None
+        return self.order_store.get_open_orders()
+
+    def expire_account_cache(self) -> None:
+        self.order_store.expire_reconcile()
+
     async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
-        """Get active orders for a contract using official SDK."""
-        ## ORIGINAL
-        # contract_id should be market name, e.g. ETH-USD
-        if self.initial_check_for_open_orders:
-            active_orders = await self.perpetual_trading_client.account.get_open_orders(market_names=[contract_id])
+        """Get active orders for a contract from the local order store, reconciling with the official SDK periodically."""
+        if self.order_store.orders_ready and not self.order_store.needs_reconcile('orders', self.reconcile_interval):
+            return self.order_store.get_open_orders()
 
-            if not active_orders or not hasattr(active_orders, 'data'):
-                return []
+        # contract_id should be market name, e.g. ETH-USD
+        active_orders = await self.perpetual_trading_client.account.get_open_orders(market_names=[contract_id])
 
-            # Filter orders for the specific contract and ensure they are dictionaries
-            # The API returns orders under 'data' key as a list
-            order_list = active_orders.data
-            contract_orders = []
+        if not active_orders or not hasattr(active_orders, 'data'):
+            return []
 
-            for order in order_list:
-                if order.market == contract_id:
-                    if order.status == 'NEW':
-                        order_status = 'OPEN'
-                    else:
-                        order_status = order.status
-
-                    contract_orders.append(OrderInfo(
-                        order_id=order.id,
-                        side=order.side.lower(),
-                        size=Decimal(order.qty) - Decimal(order.filled_qty),  # PATCH: changed this to remaining size to match with the trading bot logic, might cause issues later if main trading bot logic is changed
-                        price=Decimal(order.price),
-                        status=order_status,
-                        filled_size=Decimal(order.filled_qty),
-                        remaining_size=Decimal(order.qty) - Decimal(order.filled_qty)
-                    ))
-            
-            # use the websocket method for the remaining orders updates
-            if self.get_active_orders_cnt == 0:
-                self.get_active_orders_cnt += 1
-            else:
-                self.get_active_orders_cnt += 1
-                if self.get_active_orders_cnt == 2:
-                    self.initial_check_for_open_orders = False
-            return contract_orders
-              
-        ## FIX
-        # use open orders dict because there is a delay in the official Rest API
-        order_list = self.open_orders.values()
+        # Filter orders for the specific contract and ensure they are dictionaries
+        # The API returns orders under 'data' key as a list
+        order_list = active_orders.data
         contract_orders = []
-        
+
         for order in order_list:
-            if order.get('market') == contract_id:
-                if order.get('status') == 'NEW':
+            if order.market == contract_id:
+                if order.status == 'NEW':
                     order_status = 'OPEN'
                 else:
-                    order_status = order.get('status')
+                    order_status = order.status
 
-                formatted_order = OrderInfo(
-                    order_id=order.get('id'),
-                    side=order.get('side').lower(),
-                    size=Decimal(order.get('qty')) - Decimal(order.get('filledQty')),   # PATCH: changed this to remaining size to match with the trading bot logic, might cause issues later if main trading bot logic is changed
-                    price=Decimal(order.get('price')),
+                contract_orders.append(OrderInfo(
+                    order_id=str(order.id),
+                    side=order.side.lower(),
+                    size=Decimal(order.qty) - Decimal(order.filled_qty),  # PATCH: changed this to remaining size to match with the trading bot logic, might cause issues later if main trading bot logic is changed
+                    price=Decimal(order.price),
                     status=order_status,
-                    filled_size=Decimal(order.get('filledQty')),
-                    remaining_size=Decimal(order.get('qty')) - Decimal(order.get('filledQty'))
-                )
-
-                # handle it using dict methods because that's the format received through websocket
-                contract_orders.append(formatted_order)
+                    filled_size=Decimal(order.filled_qty),
+                    remaining_size=Decimal(order.qty) - Decimal(order.filled_qty)
+                ))
 
+        self.order_store.replace_open_orders(contract_orders)
+        self.order_store.mark_reconciled('orders')
         return contract_orders
 
     async def get_account_positions(self) -> Decimal:
@@ -619,6 +544,9 @@ class ExtendedClient(BaseExchangeClient):
             if isinstance(message, str):
                 message = json.loads(message)
 
+            # Any message means the account stream is up and the order store is being fed
+            self.order_store.mark_stream_live()
+
             # Check if this is a order update
             event = message.get("type", "")
             if event == "ORDER":
@@ -654,13 +582,13 @@ class ExtendedClient(BaseExchangeClient):
                         if status == "CANCELLED":
                             status = "CANCELED"
                             
-                        # (for extended only) maintain open orders dict
-                        if status == "OPEN" or status == "PARTIALLY_FILLED":
-                            self.open_orders[order_id] = order
-                        elif status == "CANCELED" or status == "FILLED":
-                            self.open_orders.pop(order_id, None)
+                        # (for extended only) maintain the local order store
+                        self.order_store.upsert_order(self._to_order_info(order))
+                        if status in ['FILLED', 'CANCELED', 'REJECTED', 'EXPIRED']:
+                            self._external_order_ids.pop(str(order_id), None)
                         
                         if status in ['OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED']:
+                            self._notify_fill_listeners(order_id, side, filled_size)
                             if self._order_update_handler:
                                 self._order_update_handler({
                                     'order_id': order_id,
@@ -708,6 +636,15 @@ class ExtendedClient(BaseExchangeClient):
                     'ask': asks   # should be list of [{"p": price, "q": quantity}] with a length of 1
                 }
                 
+                if bids and asks:
+                    self.top_of_book = record_quote("extended", TopOfBook(
+                        best_bid=Decimal(bids[0]["p"]),
+                        best_ask=Decimal(asks[0]["p"]),
+                        bid_size=Decimal(bids[0]["q"]),
+                        ask_size=Decimal(asks[0]["q"]),
+                        exchange_timestamp=exchange_time(message.get("ts"))
+                    ))
+
                 self.logger.log(f"Orderbook updated for {market}: bid={bids[0] if bids else 'N/A'}, ask={asks[0] if asks else 'N/A'}", "DEBUG")
                 
         except asyncio.CancelledError:
@@ -0,0 +1,73 @@
+"""
+First-arrival-wins merge of one stream received over several redundant connections.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from helpers.metrics import metrics
+
+
+class RedundantFeedMerger:
+    """
+    Deduplicates messages that arrive on more than one connection.
+
+    Callers pass a key identifying the message (book offset, order state, ...). The first
+    connection to deliver a key wins and the message is processed; later arrivals of the same key
+    are dropped. Metrics: {name}.feed.wins.<connection> counts wins per connection,
+    {name}.feed.gap is the delay of each losing copy behind the winner, and
+    {name}.feed.live_connections is maintained by the connection owner through set_live().
+    """
+
+    def __init__(self, name: str, window: int = 4096):
+        """
+        Args:
+            name: Metric prefix (exchange name)
+            window: Number of recent keys remembered for deduplication
+        """
+        self.name = name
+        self.window = window
+        # key -> (winning connection, first arrival time)
+        self._first_seen: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._live = set()
+
+        self.duplicates = metrics.counter(f"{name}.feed.duplicates")
+        self.gap = metrics.histogram(f"{name}.feed.gap")
+        self.live_connections = metrics.gauge(f"{name}.feed.live_connections")
+
+    def accept(self, connection: Hashable, key: Hashable) -> bool:
+        """
+        Record the arrival of key on connection.
+
+        Returns:
+            True for the first arrival (process the message), False for a duplicate
+        """
+        now = time.time()
+        seen = self._first_seen.get(key)
+        if seen is not None:
+            self.duplicates.inc()
+            self.gap.observe(now - seen[1])
+            return False
+
+        self._first_seen[key] = (connection, now)
+        while len(self._first_seen) > self.window:
+            self._first_seen.popitem(last=False)
+        metrics.counter(f"{self.name}.feed.wins.{connection}").inc()
+        return True
+
+    def set_live(self, connection: Hashable, live: bool) -> None:
+        """Mark a connection as connected/disconnected."""
+        if live:
+            self._live.add(connection)
+        else:
+            self._live.discard(connection)
+        self.live_connections.set(len(self._live))
+
+    def has_other_live(self, connection: Hashable) -> bool:
+        """True when another connection is still delivering the stream."""
+        return bool(self._live - {connection})
+
+    def is_primary(self, connection: Hashable) -> bool:
+        """True when connection is the lowest live connection, the only source for unkeyed messages."""
+        return connection == min(self._live, default=connection)
@@ -14,13 +14,18 @@ from pysdk.grvt_ccxt_ws import GrvtCcxtWS
 from pysdk.grvt_ccxt_env import GrvtEnv, GrvtWSEndpointType
 import websockets.exceptions
 
-from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
+from .base import TERMINAL_ORDER_STATUSES, BaseExchangeClient, OrderResult, OrderInfo, query_retry
+from .event_queue import ConflatingEventQueue
+from .feed_merger import RedundantFeedMerger
+from .maker_engine import MakerOrderEngine
 from helpers.logger import TradingLogger
 
 
 class GrvtClient(BaseExchangeClient):
     """GRVT exchange client implementation."""
 
+    supports_taker = True
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize GRVT client."""
         super().__init__(config)
@@ -55,6 +60,18 @@ class GrvtClient(BaseExchangeClient):
         self._ws_client = None
         self._order_update_callback = None
 
+        # The SDK callback only enqueues; parsing and handlers run on a consumer task
+        self.order_events = ConflatingEventQueue("grvt")
+        self._order_message_handler = None
+        self._order_events_task = None
+
+        # Independent WebSocket clients subscribed to the same order stream, merged first-arrival-wins
+        self.ws_connections = max(1, int(getattr(self.config, 'ws_connections', 1) or 1))
+        self.feed_merger = RedundantFeedMerger("grvt")
+        self._ws_clients: List[GrvtCcxtWS] = []
+
+        self.maker_engine = MakerOrderEngine(self, 'grvt', guard_active_orders=True)
+
     def _initialize_grvt_clients(self) -> None:
         """Initialize the GRVT REST and WebSocket clients."""
         try:
@@ -105,15 +122,20 @@ class GrvtClient(BaseExchangeClient):
                     'private_key': self.private_key
                 }
 
-                self._ws_client = GrvtCcxtWS(
-                    env=self.env,
-                    loop=loop,
-                    logger=logger,  # Add logger parameter like in test file
-                    parameters=parameters
-                )
+                self._ws_clients = [
+                    GrvtCcxtWS(
+                        env=self.env,
+                        loop=loop,
+                        logger=logger,  # Add logger parameter like in test file
+                        parameters=parameters
+                    )
+                    for _ in range(self.ws_connections)
+                ]
+                self._ws_client = self._ws_clients[0]
 
                 # Initialize and connect
-                await self._ws_client.initialize()
+                for ws_client in self._ws_clients:
+                    await ws_client.initialize()
                 await asyncio.sleep(2)  # Wait for connection to establish
 
                 # Get contract attributes (resolves ticker to contract_id)
@@ -147,6 +169,20 @@ class GrvtClient(BaseExchangeClient):
 
     async def disconnect(self) -> None:
         """Disconnect from GRVT."""
+        if self._order_events_task:
+            self._order_events_task.cancel()
+
+        # Standby connections first; the primary is closed below
+        for ws_client in self._ws_clients[1:]:
+            try:
+                if hasattr(ws_client, 'close'):
+                    await ws_client.close()
+                else:
+                    await ws_client.__aexit__(None, None, None)
+            except Exception:
+                pass
+        self._ws_clients = []
+
         try:
             if self._ws_client:
                 # Try to close WebSocket gracefully
@@ -226,6 +262,8 @@ class GrvtClient(BaseExchangeClient):
                                 mapped_status = "PARTIALLY_FILLED"
 
                             if mapped_status in ['OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED']:
+                                self._notify_fill_listeners(order_id, side, filled_size)
+                                self._notify_account_listeners()
                                 if self._order_update_handler:
                                     self._order_update_handler({
                                         'order_id': order_id,
@@ -252,8 +290,9 @@ class GrvtClient(BaseExchangeClient):
                 self.logger.log(f"Error handling order update: {e}", "ERROR")
                 self.logger.log(f"Message that caused error: {message}", "ERROR")
 
-        # Store callback for use after connect
-        self._order_update_callback = order_update_callback
+        # Store callback for use after connect; order events are never conflated
+        self._order_message_handler = order_update_callback
+        self._order_update_callback = self.order_events.put
 
         # Subscribe immediately if WebSocket is already initialized; otherwise defer to connect()
         if self._ws_client:
@@ -267,18 +306,44 @@ class GrvtClient(BaseExchangeClient):
             self.logger.log("WebSocket not ready yet; will subscribe after connect()", "INFO")
 
     async def _subscribe_to_orders(self, callback):
-        """Subscribe to order updates asynchronously."""
-        try:
-            await self._ws_client.subscribe(
-                stream="order",
-                callback=callback,
-                ws_end_point_type=GrvtWSEndpointType.TRADE_DATA_RPC_FULL,
-                params={"instrument": self.config.contract_id}
-            )
-            await asyncio.sleep(0)  # Small delay like in test file
-            self.logger.log(f"Successfully subscribed to order updates for {self.config.contract_id}", "INFO")
-        except Exception as e:
-            self.logger.log(f"Error in subscription task: {e}", "ERROR")
+        """Subscribe to order updates asynchronously on every connection."""
+        if self._order_events_task is None or self._order_events_task.done():
+            self._order_events_task = asyncio.create_task(self.order_events.run(self._order_message_handler))
+
+        for connection, ws_client in enumerate(self._ws_clients or [self._ws_client]):
+            try:
+                await ws_client.subscribe(
+                    stream="order",
+                    callback=self._connection_callback(connection, callback),
+                    ws_end_point_type=GrvtWSEndpointType.TRADE_DATA_RPC_FULL,
+                    params={"instrument": self.config.contract_id}
+                )
+                await asyncio.sleep(0)  # Small delay like in test file
+                self.feed_merger.set_live(connection, True)
+                self.logger.log(f"Successfully subscribed to order updates for {self.config.contract_id} "
+                                f"on connection {connection}", "INFO")
+            except Exception as e:
+                self.logger.log(f"Error in subscription task on connection {connection}: {e}", "ERROR")
+
+    def _connection_callback(self, connection: int, callback):
+        """Wrap callback so each order state is forwarded once, from whichever connection delivers it first."""
+        async def deduplicated_callback(message: Dict[str, Any]):
+            key = self._order_message_key(message) if self.ws_connections > 1 else None
+            if key is not None and not self.feed_merger.accept(connection, key):
+                return
+            await callback(message)
+
+        return deduplicated_callback
+
+    @staticmethod
+    def _order_message_key(message: Dict[str, Any]) -> Optional[Tuple]:
+        """Identity of an order state in a feed message, or None if it is not an order update."""
+        data = message.get('feed')
+        if not isinstance(data, dict) or not data.get('order_id'):
+            return None
+        order_state = data.get('state', {})
+        return (data['order_id'], order_state.get('status'), str(order_state.get('traded_size')),
+                order_state.get('update_time'))
 
     @query_retry(reraise=True)
     async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
@@ -349,116 +414,73 @@ class GrvtClient(BaseExchangeClient):
         else:
             raise ValueError("Invalid direction")
 
-    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
-        """Place an open order with GRVT."""
-        attempt = 0
-        while True:
-            attempt += 1
-            if attempt % 5 == 0:
-                self.logger.log(f"[OPEN] Attempt {attempt} to place order", "INFO")
-                active_orders = await self.get_active_orders(contract_id)
-                active_open_orders = 0
-                for order in active_orders:
-                    if order.side == self.config.direction:
-                        active_open_orders += 1
-                if active_open_orders > 1:
-                    self.logger.log(f"[OPEN] ERROR: Active open orders abnormal: {active_open_orders}", "ERROR")
-                    raise Exception(f"[OPEN] ERROR: Active open orders abnormal: {active_open_orders}")
-
-            # Get current market prices
-            best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
-
-            if best_bid <= 0 or best_ask <= 0:
-                return OrderResult(success=False, error_message='Invalid bid/ask prices')
-
-            # Determine order side and price
-            if direction == 'buy':
-                order_price = best_ask - self.config.tick_size
-            elif direction == 'sell':
-                order_price = best_bid + self.config.tick_size
-            else:
-                raise Exception(f"[OPEN] Invalid direction: {direction}")
-
-            # Place the order using GRVT SDK
-            try:
-                order_info = await self.place_post_only_order(contract_id, quantity, order_price, direction)
-            except Exception as e:
-                self.logger.log(f"[OPEN] Error placing order: {e}", "ERROR")
-                continue
-
-            order_status = order_info.status
-            order_id = order_info.order_id
+    async def _submit_post_only_order(self, contract_id: str, quantity: Decimal, price: Decimal,
+                                      side: str) -> OrderResult:
+        """Submit a single post-only order with GRVT and map its final status for the maker engine."""
+        order_info = await self.place_post_only_order(contract_id, quantity, price, side)
+        order_status = order_info.status
+        order_id = order_info.order_id
+
+        if order_status == 'REJECTED':
+            return OrderResult(success=False, order_id=order_id, status='REJECTED', error_message='Post-only order rejected')
+        if order_status in ['OPEN', 'FILLED']:
+            return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price, status=order_status)
+        return OrderResult(success=False, order_id=order_id, error_message=f"Unexpected order status: {order_status}")
+
+    async def place_taker_order(self, quantity: Decimal, side: str, max_slippage: Decimal) -> OrderResult:
+        """Place an IOC limit order with GRVT and wait until it is done."""
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        if best_bid <= 0 or best_ask <= 0:
+            return OrderResult(success=False, error_message='Invalid bid/ask prices')
 
-            if order_status == 'REJECTED':
-                continue
-            if order_status in ['OPEN', 'FILLED']:
-                return OrderResult(
-                    success=True,
-                    order_id=order_id,
-                    side=direction,
-                    size=quantity,
-                    price=order_price,
-                    status=order_status
-                )
-            elif order_status == 'PENDING':
-                raise Exception("[OPEN] Order not processed after 10 seconds")
-            else:
-                raise Exception(f"[OPEN] Unexpected order status: {order_status}")
+        order_price = self.get_taker_limit_price(side, best_bid, best_ask, max_slippage)
+        try:
+            order_result = self.rest_client.create_limit_order(
+                symbol=self.config.contract_id,
+                side=side,
+                amount=quantity,
+                price=order_price,
+                params={'time_in_force': 'IMMEDIATE_OR_CANCEL'}
+            )
+        except Exception as e:
+            return OrderResult(success=False, side=side, error_message=str(e))
+        if not order_result:
+            return OrderResult(success=False, side=side, error_message='Error placing IOC order')
 
-    async def place_close_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
-        """Place a close order with GRVT."""
-        # Get current market prices
-        attempt = 0
-        active_close_orders = await self._get_active_close_orders(contract_id)
-        while True:
-            attempt += 1
-            if attempt % 5 == 0:
-                self.logger.log(f"[CLOSE] Attempt {attempt} to place order", "INFO")
-                current_close_orders = await self._get_active_close_orders(contract_id)
-
-                if current_close_orders - active_close_orders > 1:
-                    self.logger.log(f"[CLOSE] ERROR: Active close orders abnormal: "
-                                    f"{active_close_orders}, {current_close_orders}", "ERROR")
-                    raise Exception(f"[CLOSE] ERROR: Active close orders abnormal: "
-                                    f"{active_close_orders}, {current_close_orders}")
-                else:
-                    active_close_orders = current_close_orders
+        # IOC orders end FILLED, or CANCELLED with the unfilled remainder
+        client_order_id = order_result.get('metadata').get('client_order_id')
+        order_info = None
+        start_time = time.time()
+        while time.time() - start_time < 5:
+            order_info = await self.get_order_info(client_order_id=client_order_id)
+            if order_info is not None and order_info.status in TERMINAL_ORDER_STATUSES:
+                break
+            await asyncio.sleep(0.05)
 
-            # Adjust price to ensure maker order
-            best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
+        if order_info is None or order_info.status not in TERMINAL_ORDER_STATUSES:
+            return OrderResult(success=False, side=side, error_message='IOC order not finished after 5 seconds')
 
-            if side == 'sell' and price <= best_bid:
-                adjusted_price = best_bid + self.config.tick_size
-            elif side == 'buy' and price >= best_ask:
-                adjusted_price = best_ask - self.config.tick_size
-            else:
-                adjusted_price = price
+        if order_info.filled_size <= 0:
+            return OrderResult(success=False, order_id=order_info.order_id, side=side, status='CANCELED',
+                               filled_size=Decimal(0), error_message=f'IOC order not filled: {order_info.status}')
 
-            adjusted_price = self.round_to_tick(adjusted_price)
-            try:
-                order_info = await self.place_post_only_order(contract_id, quantity, adjusted_price, side)
-            except Exception as e:
-                self.logger.log(f"[CLOSE] Error placing order: {e}", "ERROR")
-                continue
+        return OrderResult(
+            success=True,
+            order_id=order_info.order_id,
+            side=side,
+            size=quantity,
+            price=order_info.avg_fill_price or order_price,
+            status='FILLED' if order_info.filled_size >= quantity else 'PARTIALLY_FILLED',
+            filled_size=order_info.filled_size
+        )
 
-            order_status = order_info.status
-            order_id = order_info.order_id
+    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
+        """Place an open order with GRVT."""
+        return await self.maker_engine.place(contract_id, quantity, direction)
 
-            if order_status == 'REJECTED':
-                continue
-            if order_status in ['OPEN', 'FILLED']:
-                return OrderResult(
-                    success=True,
-                    order_id=order_id,
-                    side=side,
-                    size=quantity,
-                    price=adjusted_price,
-                    status=order_status
-                )
-            elif order_status == 'PENDING':
-                raise Exception("[CLOSE] Order not processed after 10 seconds")
-            else:
-                raise Exception(f"[CLOSE] Unexpected order status: {order_status}")
+    async def place_close_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
+        """Place a close order with GRVT."""
+        return await self.maker_engine.place(contract_id, quantity, side, price=price)
 
     async def cancel_order(self, order_id: str) -> OrderResult:
         """Cancel an order with GRVT."""
@@ -527,18 +549,12 @@ class GrvtClient(BaseExchangeClient):
             filled_size=(Decimal(state.get('traded_size', ['0'])[0])
                          if isinstance(state.get('traded_size'), list) else Decimal(0)),
             remaining_size=(Decimal(state.get('book_size', ['0'])[0])
-                            if isinstance(state.get('book_size'), list) else Decimal(0))
+                            if isinstance(state.get('book_size'), list) else Decimal(0)),
+            avg_fill_price=(Decimal(state['avg_fill_price'][0])
+                            if isinstance(state.get('avg_fill_price'), list) and state['avg_fill_price']
+                            and Decimal(state['avg_fill_price'][0]) > 0 else None)
         )
 
-    async def _get_active_close_orders(self, contract_id: str) -> int:
-        """Get active close orders for a contract using official SDK."""
-        active_orders = await self.get_active_orders(contract_id)
-        active_close_orders = 0
-        for order in active_orders:
-            if order.side == self.config.close_order_side:
-                active_close_orders += 1
-        return active_close_orders
-
     @query_retry(reraise=True)
     async def get_order_history(self, contract_id: str = None, limit: int = 100) -> List[OrderInfo]:
         """
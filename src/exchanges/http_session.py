@@ -0,0 +1,87 @@
+"""
+Shared, long-lived aiohttp sessions for exchange REST calls.
+
+One session per venue keeps TCP/TLS connections alive between requests
+instead of paying a new handshake on every call.
+"""
+
+from typing import Optional
+
+import aiohttp
+
+from helpers.metrics import metrics
+
+
+class HttpSessionManager:
+    """Per-venue pooled aiohttp session with keep-alive and DNS caching."""
+
+    def __init__(self, venue: str, limit: int = 100, limit_per_host: int = 20,
+                 keepalive_timeout: float = 60, ttl_dns_cache: int = 300,
+                 total_timeout: float = 10, connect_timeout: float = 5):
+        """
+        Args:
+            venue: Exchange name, used as the metrics prefix
+            limit: Maximum number of pooled connections
+            limit_per_host: Maximum number of pooled connections per host
+            keepalive_timeout: Seconds an idle connection is kept open
+            ttl_dns_cache: Seconds a DNS resolution is cached
+            total_timeout: Total request timeout in seconds
+            connect_timeout: Connection establishment timeout in seconds
+        """
+        self.venue = venue
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        self.requests = metrics.counter(f"{venue}.http.requests")
+        self.connections_created = metrics.counter(f"{venue}.http.connections_created")
+        self.connections_reused = metrics.counter(f"{venue}.http.connections_reused")
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Count new vs reused connections."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.requests.inc()
+
+        async def on_connection_create_end(session, context, params):
+            self.connections_created.inc()
+
+        async def on_connection_reuseconn(session, context, params):
+            self.connections_reused.inc()
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def get_session(self, ssl=True) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use. Must be called from the event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.ttl_dns_cache,
+                ssl=ssl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                trace_configs=[self._build_trace_config()],
+            )
+        return self._session
+
+    @property
+    def handshakes_avoided(self) -> int:
+        """Requests served on an already-open connection."""
+        return self.connections_reused.value
+
+    async def close(self) -> None:
+        """Close the shared session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -6,11 +6,16 @@ import os
 import asyncio
 import time
 import logging
+from collections import OrderedDict
 from decimal import Decimal
 from typing import Dict, Any, List, Optional, Tuple
 
-from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
+from .base import BaseExchangeClient, MarginInfo, OrderResult, OrderInfo, query_retry
+from .account_state import AccountStateCache
+from .http_session import HttpSessionManager
+from .market_data import DepthQuote, TopOfBook
 from helpers.logger import TradingLogger
+from helpers.metrics import metrics
 
 # Import official Lighter SDK for API client
 import lighter
@@ -30,6 +35,11 @@ if root_logger.level == logging.DEBUG:
 class LighterClient(BaseExchangeClient):
     """Lighter exchange client implementation."""
 
+    supports_amend = True
+    supports_taker = True
+    # Order fills are tracked through the single current_order slot
+    supports_concurrent_orders = False
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize Lighter client."""
         super().__init__(config)
@@ -50,8 +60,19 @@ class LighterClient(BaseExchangeClient):
         # Initialize Lighter client (will be done in connect)
         self.lighter_client = None
 
-        # Initialize API client (will be done in connect)
+        # Initialize API client and long-lived API objects (will be done in connect)
         self.api_client = None
+        self.order_api = None
+        self.account_api = None
+        self.http_session = HttpSessionManager('lighter')
+
+        # Auth token cache, refreshed shortly before expiry
+        self._auth_token = None
+        self._auth_token_expiry = 0.0
+        self.auth_token_ttl = 10 * 60
+        self.auth_token_refresh_margin = 60
+        self.auth_token_mints = metrics.counter('lighter.auth_token.mints')
+        self.auth_token_hits = metrics.counter('lighter.auth_token.cache_hits')
 
         # Market configuration
         self.base_amount_multiplier = None
@@ -60,6 +81,16 @@ class LighterClient(BaseExchangeClient):
         self.current_order_client_id = None
         self.current_order = None
 
+        # Taker limits are set this many ticks beyond the worst level a depth walk reaches
+        self.taker_buffer_ticks = int(os.getenv('LIGHTER_TAKER_BUFFER_TICKS', '2'))
+
+        # Positions and orders fed by the account WebSocket streams; REST only reconciles
+        self.account_state = AccountStateCache()
+        self.account_state.on_update = self._notify_account_listeners
+        # client_order_index -> order_index, so orders placed by this client resolve from the cache
+        self._order_index_by_client_id: "OrderedDict[str, str]" = OrderedDict()
+        self.reconcile_interval = float(os.getenv('LIGHTER_RECONCILE_INTERVAL', '30'))
+
     def _validate_config(self) -> None:
         """Validate Lighter configuration."""
         required_env_vars = ['LIGHTER_PRIVATE_KEY', 'LIGHTER_ACCOUNT_INDEX', 'LIGHTER_API_KEY_INDEX']
@@ -70,11 +101,8 @@ class LighterClient(BaseExchangeClient):
     async def _get_market_config(self, ticker: str) -> Tuple[int, int, int]:
         """Get market configuration for a ticker using official SDK."""
         try:
-            # Use shared API client
-            order_api = lighter.OrderApi(self.api_client)
-
             # Get order books to find market info
-            order_books = await order_api.order_books()
+            order_books = await self.order_api.order_books()
 
             for market in order_books.order_books:
                 if market.symbol == ticker:
@@ -114,17 +142,65 @@ class LighterClient(BaseExchangeClient):
                 if err is not None:
                     raise Exception(f"CheckClient error: {err}")
 
+                # Order submission goes through the signer's own API client; share the pool
+                await self._attach_pooled_session(getattr(self.lighter_client, 'api_client', None))
+
                 self.logger.log("Lighter client initialized successfully", "INFO")
             except Exception as e:
                 self.logger.log(f"Failed to initialize Lighter client: {e}", "ERROR")
                 raise
         return self.lighter_client
 
+    async def _attach_pooled_session(self, api_client) -> None:
+        """Run an SDK ApiClient on the shared keep-alive connection pool."""
+        rest_client = getattr(api_client, 'rest_client', None)
+        if rest_client is None or not hasattr(rest_client, 'pool_manager'):
+            return
+
+        shared_session = self.http_session.get_session(ssl=getattr(rest_client, 'ssl_context', True))
+        # Close the session the SDK opened for itself, it is never used again
+        original_session = rest_client.pool_manager
+        if original_session is not None and original_session is not shared_session and not original_session.closed:
+            await original_session.close()
+        rest_client.pool_manager = shared_session
+
+    def _get_auth_token(self) -> str:
+        """Get an auth token, minting a new one only when the cached one is about to expire."""
+        now = time.time()
+        if self._auth_token and now < self._auth_token_expiry - self.auth_token_refresh_margin:
+            self.auth_token_hits.inc()
+            return self._auth_token
+
+        expiry = int(now + self.auth_token_ttl)
+        auth_token, error = self.lighter_client.create_auth_token_with_expiry(expiry)
+        if error is not None:
+            self.logger.log(f"Error creating auth token: {error}", "ERROR")
+            raise ValueError(f"Error creating auth token: {error}")
+
+        self._auth_token = auth_token
+        self._auth_token_expiry = expiry
+        self.auth_token_mints.inc()
+        return auth_token
+
+    def get_transport_metrics(self) -> Dict[str, Any]:
+        """Token mint rate and connection reuse counters."""
+        return {
+            'auth_token_mints': self.auth_token_mints.value,
+            'auth_token_mint_rate': self.auth_token_mints.rate(),
+            'auth_token_cache_hits': self.auth_token_hits.value,
+            'http_requests': self.http_session.requests.value,
+            'connections_created': self.http_session.connections_created.value,
+            'connections_reused': self.http_session.connections_reused.value,
+        }
+
     async def connect(self) -> None:
         """Connect to Lighter."""
         try:
-            # Initialize shared API client
+            # Initialize shared API client on the pooled keep-alive session
             self.api_client = ApiClient(configuration=Configuration(host=self.base_url))
+            await self._attach_pooled_session(self.api_client)
+            self.order_api = lighter.OrderApi(self.api_client)
+            self.account_api = lighter.AccountApi(self.api_client)
 
             # Initialize Lighter client
             await self._initialize_lighter_client()
@@ -146,7 +222,8 @@ class LighterClient(BaseExchangeClient):
             # Initialize WebSocket manager (using custom implementation)
             self.ws_manager = LighterCustomWebSocketManager(
                 config=self.config,
-                order_update_callback=self._handle_websocket_order_update
+                order_update_callback=self._handle_websocket_order_update,
+                account_state=self.account_state
             )
 
             # Set logger for WebSocket manager
@@ -167,10 +244,12 @@ class LighterClient(BaseExchangeClient):
             if hasattr(self, 'ws_manager') and self.ws_manager:
                 await self.ws_manager.disconnect()
 
-            # Close shared API client
-            if self.api_client:
-                await self.api_client.close()
-                self.api_client = None
+            # The API clients run on the shared session; only the session manager closes it
+            self.api_client = None
+            self.order_api = None
+            self.account_api = None
+
+            await self.http_session.close()
         except Exception as e:
             self.logger.log(f"Error during Lighter disconnect: {e}", "ERROR")
 
@@ -182,6 +261,19 @@ class LighterClient(BaseExchangeClient):
         """Setup order update handler for WebSocket."""
         self._order_update_handler = handler
 
+    def _remember_order_index(self, client_order_index, order_index) -> None:
+        """Record which exchange order index a client order index was assigned."""
+        if client_order_index is None:
+            return
+        self._order_index_by_client_id[str(client_order_index)] = str(order_index)
+        self._order_index_by_client_id.move_to_end(str(client_order_index))
+        while len(self._order_index_by_client_id) > self.account_state.max_closed_orders:
+            self._order_index_by_client_id.popitem(last=False)
+
+    def _resolve_order_index(self, order_id: str) -> str:
+        """Exchange order index for an order index or a client order index returned by place_*_order."""
+        return self._order_index_by_client_id.get(str(order_id), str(order_id))
+
     def _handle_websocket_order_update(self, order_data_list: List[Dict[str, Any]]):
         """Handle order updates from WebSocket."""
         for order_data in order_data_list:
@@ -196,11 +288,19 @@ class LighterClient(BaseExchangeClient):
 
             order_id = order_data['order_index']
             status = order_data['status'].upper()
+            cancel_reason = ''
+            if status.startswith('CANCELED'):
+                # Lighter reports e.g. canceled-post-only; keep the reason, normalize the status
+                cancel_reason = status
+                status = 'CANCELED'
+
             filled_size = Decimal(order_data['filled_base_amount'])
             size = Decimal(order_data['initial_base_amount'])
             price = Decimal(order_data['price'])
             remaining_size = Decimal(order_data['remaining_base_amount'])
 
+            self._remember_order_index(order_data.get('client_order_index'), order_id)
+
             if order_id in self.orders_cache.keys():
                 if (self.orders_cache[order_id]['status'] == 'OPEN' and
                         status == 'OPEN' and
@@ -217,6 +317,18 @@ class LighterClient(BaseExchangeClient):
             if status == 'OPEN' and filled_size > 0:
                 status = 'PARTIALLY_FILLED'
 
+            self._notify_fill_listeners(order_id, side, filled_size)
+            self.account_state.upsert_order(OrderInfo(
+                order_id=str(order_id),
+                side=side,
+                size=size,
+                price=price,
+                status=status,
+                filled_size=filled_size,
+                remaining_size=remaining_size,
+                cancel_reason=cancel_reason
+            ))
+
             if status == 'OPEN':
                 self.logger.log(f"[{order_type}] [{order_id}] {status} "
                                 f"{size} @ {price}", "INFO")
@@ -225,6 +337,7 @@ class LighterClient(BaseExchangeClient):
                                 f"{filled_size} @ {price}", "INFO")
 
             if order_data['client_order_index'] == self.current_order_client_id or order_type == 'OPEN':
+                filled_quote = order_data.get('filled_quote_amount')
                 current_order = OrderInfo(
                     order_id=order_id,
                     side=side,
@@ -233,30 +346,53 @@ class LighterClient(BaseExchangeClient):
                     status=status,
                     filled_size=filled_size,
                     remaining_size=remaining_size,
-                    cancel_reason=''
+                    cancel_reason='',
+                    avg_fill_price=Decimal(filled_quote) / filled_size if filled_quote and filled_size > 0 else None
                 )
                 self.current_order = current_order
 
             if status in ['FILLED', 'CANCELED']:
                 self.logger.log_transaction(order_id, side, filled_size, price, status)
 
+    def get_cached_top_of_book(self) -> Optional[TopOfBook]:
+        """Latest top of book from the order book stream."""
+        return self.ws_manager.top_of_book if hasattr(self, 'ws_manager') else None
+
+    def get_cached_margin(self) -> Optional[MarginInfo]:
+        """Collateral and margin in use from the user_stats stream."""
+        return self.account_state.get_margin()
+
+    def get_cached_position(self) -> Optional[Decimal]:
+        """Position from the account_all stream."""
+        return self.account_state.get_position(str(self.config.contract_id))
+
+    def get_cached_open_orders(self) -> Optional[List[OrderInfo]]:
+        """Open orders from the account_orders stream, once seeded."""
+        if not self.account_state.orders_ready:
+            return None
+        return self.account_state.get_open_orders()
+
+    def expire_account_cache(self) -> None:
+        self.account_state.expire_reconcile()
+
     @query_retry(default_return=(0, 0))
     async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
-        """Get orderbook using official SDK."""
-        # Use WebSocket data if available
-        if (hasattr(self, 'ws_manager') and
-                self.ws_manager.best_bid and self.ws_manager.best_ask):
-            best_bid = Decimal(str(self.ws_manager.best_bid))
-            best_ask = Decimal(str(self.ws_manager.best_ask))
-
-            if best_bid <= 0 or best_ask <= 0 or best_bid >= best_ask:
-                self.logger.log("Invalid bid/ask prices", "ERROR")
-                raise ValueError("Invalid bid/ask prices")
-        else:
+        """Get best bid/ask from one fresh WebSocket top-of-book snapshot."""
+        # A single reference read gives a consistent bid/ask pair
+        top_of_book = self.get_fresh_top_of_book()
+        if top_of_book is not None:
+            return top_of_book.best_bid, top_of_book.best_ask
+
+        # There is no REST fallback: refuse to price rather than use a missing, crossed or stale quote
+        top_of_book = self.get_cached_top_of_book()
+        if top_of_book is None:
             self.logger.log("Unable to get bid/ask prices from WebSocket.", "ERROR")
             raise ValueError("WebSocket not running. No bid/ask prices available")
-
-        return best_bid, best_ask
+        if not top_of_book.is_valid():
+            self.logger.log("Invalid bid/ask prices", "ERROR")
+            raise ValueError("Invalid bid/ask prices")
+        self.logger.log(f"Stale bid/ask prices ({top_of_book.age():.1f}s old)", "ERROR")
+        raise ValueError("Stale bid/ask prices")
 
     async def _submit_order_with_retry(self, order_params: Dict[str, Any]) -> OrderResult:
         """Submit an order with Lighter using official SDK."""
@@ -277,8 +413,8 @@ class LighterClient(BaseExchangeClient):
             return OrderResult(success=True, order_id=str(order_params['client_order_index']))
 
     async def place_limit_order(self, contract_id: str, quantity: Decimal, price: Decimal,
-                                side: str) -> OrderResult:
-        """Place a post only order with Lighter using official SDK."""
+                                side: str, ioc: bool = False) -> OrderResult:
+        """Place a limit order (GTT, or IOC when ioc is set) with Lighter using official SDK."""
         # Ensure client is initialized
         if self.lighter_client is None:
             await self._initialize_lighter_client()
@@ -307,6 +443,9 @@ class LighterClient(BaseExchangeClient):
             'reduce_only': False,
             'trigger_price': 0,
         }
+        if ioc:
+            order_params['time_in_force'] = self.lighter_client.ORDER_TIME_IN_FORCE_IMMEDIATE_OR_CANCEL
+            order_params['order_expiry'] = self.lighter_client.DEFAULT_IOC_EXPIRY
 
         order_result = await self._submit_order_with_retry(order_params)
         return order_result
@@ -316,7 +455,7 @@ class LighterClient(BaseExchangeClient):
 
         self.current_order = None
         self.current_order_client_id = None
-        order_price = await self.get_order_price(direction)
+        order_price = await self.get_order_price(direction, quantity)
 
         order_price = self.round_to_tick(order_price)
         order_result = await self.place_limit_order(contract_id, quantity, order_price, direction)
@@ -341,6 +480,54 @@ class LighterClient(BaseExchangeClient):
             status=self.current_order.status
         )
 
+    async def place_taker_order(self, quantity: Decimal, side: str, max_slippage: Decimal) -> OrderResult:
+        """Place an IOC limit order with Lighter and wait for its fill on the order stream."""
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        if best_bid <= 0 or best_ask <= 0:
+            return OrderResult(success=False, error_message='Invalid bid/ask prices')
+        order_price = self.get_taker_limit_price(side, best_bid, best_ask, max_slippage)
+
+        # Tighten the limit to just beyond the depth needed for this size, never past the slippage cap
+        depth_price, quote = self.get_depth_price(side, quantity)
+        if depth_price is not None and quote.sufficient:
+            order_price = min(order_price, depth_price) if side == 'buy' else max(order_price, depth_price)
+        elif quote is not None:
+            self.logger.log(f"[TAKER] Book depth {quote.available} < {quantity} within walked levels, "
+                            f"suggest splitting into {quote.suggested_slices} orders", "WARNING")
+
+        self.current_order = None
+        self.current_order_client_id = None
+        order_result = await self.place_limit_order(self.config.contract_id, quantity, order_price, side, ioc=True)
+        if not order_result.success:
+            return order_result
+
+        # IOC orders end FILLED or CANCELED (unfilled remainder)
+        start_time = time.time()
+        while time.time() - start_time < 5:
+            if self.current_order is not None and self.current_order.status in ['FILLED', 'CANCELED']:
+                break
+            await asyncio.sleep(0.01)
+
+        if self.current_order is None or self.current_order.status not in ['FILLED', 'CANCELED']:
+            return OrderResult(success=False, order_id=order_result.order_id, side=side,
+                               error_message='IOC order not finished after 5 seconds')
+
+        filled_size = self.current_order.filled_size
+        if filled_size <= 0:
+            return OrderResult(success=False, order_id=str(self.current_order.order_id), side=side,
+                               filled_size=Decimal(0), status='CANCELED',
+                               error_message=f'IOC order not filled within {max_slippage} slippage')
+
+        return OrderResult(
+            success=True,
+            order_id=str(self.current_order.order_id),
+            side=side,
+            size=quantity,
+            price=self.current_order.avg_fill_price or self.current_order.price,
+            status=self.current_order.status,
+            filled_size=filled_size
+        )
+
     async def _get_active_close_orders(self, contract_id: str) -> int:
         """Get active close orders for a contract using official SDK."""
         active_orders = await self.get_active_orders(contract_id)
@@ -370,14 +557,58 @@ class LighterClient(BaseExchangeClient):
         else:
             raise Exception(f"[CLOSE] Error placing order: {order_result.error_message}")
     
-    async def get_order_price(self, side: str = '') -> Decimal:
+    def get_depth_price(self, side: str, quantity: Decimal) -> Tuple[Optional[Decimal], Optional[DepthQuote]]:
+        """
+        Walk the local order book for a taker of `quantity`.
+
+        Returns:
+            (limit price taker_buffer_ticks beyond the worst level needed, depth quote);
+            the price is None when the book is empty or the depth is insufficient
+            (quote.suggested_slices then tells how to split the order).
+        """
+        if not hasattr(self, 'ws_manager') or not self.ws_manager.snapshot_loaded:
+            return None, None
+
+        quote = self.ws_manager.walk_order_book(side, quantity)
+        if not quote.sufficient or quote.worst_price is None:
+            return None, quote
+
+        buffer = self.config.tick_size * self.taker_buffer_ticks
+        if side == 'buy':
+            order_price = quote.worst_price + buffer
+        else:
+            order_price = quote.worst_price - buffer
+        return self.round_to_tick(order_price), quote
+
+    async def get_available_depth(self, side: str, max_slippage: Decimal) -> Optional[Decimal]:
+        """Size fillable within max_slippage of the touch, from the local order book."""
+        if not hasattr(self, 'ws_manager') or not self.ws_manager.snapshot_loaded:
+            return None
+
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        limit_price = self.get_taker_limit_price(side, best_bid, best_ask, max_slippage)
+        return self.ws_manager.depth_within(side, float(limit_price))
+
+    async def get_order_price(self, side: str = '', quantity: Optional[Decimal] = None) -> Decimal:
         """
         Get the price of an order with Lighter using official SDK.
 
-        Uses aggressive pricing with slippage to ensure immediate fill (taker order):
+        With a quantity, prices the taker just beyond the depth the size needs
+        (see get_depth_price). Otherwise, or when the book is too thin, uses
+        aggressive pricing with slippage to ensure immediate fill (taker order):
         - Buy: best_ask + slippage (eat sell orders)
         - Sell: best_bid - slippage (eat buy orders)
         """
+        if quantity is not None and side in ('buy', 'sell'):
+            depth_price, quote = self.get_depth_price(side, quantity)
+            if depth_price is not None:
+                self.logger.log(f"[TAKER] {side} {quantity}: vwap={quote.vwap} worst={quote.worst_price} "
+                                f"levels={quote.levels} limit={depth_price}", "INFO")
+                return depth_price
+            if quote is not None:
+                self.logger.log(f"[TAKER] Book depth {quote.available} < {quantity}, suggest splitting into "
+                                f"{quote.suggested_slices} orders; falling back to slippage pricing", "WARNING")
+
         # Get current market prices
         best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
         if best_bid <= 0 or best_ask <= 0 or best_bid >= best_ask:
@@ -409,7 +640,7 @@ class LighterClient(BaseExchangeClient):
         # Cancel order using official SDK
         cancel_order, tx_hash, error = await self.lighter_client.cancel_order(
             market_index=self.config.contract_id,
-            order_index=int(order_id)  # Assuming order_id is the order index
+            order_index=int(self._resolve_order_index(order_id))
         )
 
         if error is not None:
@@ -420,6 +651,50 @@ class LighterClient(BaseExchangeClient):
         else:
             return OrderResult(success=False, error_message='Failed to send cancellation transaction')
 
+    async def modify_order(self, order_id: str, price: Decimal, quantity: Decimal, side: str) -> OrderResult:
+        """
+        Amend price and size of a resting order in place with Lighter using official SDK.
+
+        Lighter's modify keeps the order index and what has already filled, and sets the
+        order's remaining (unfilled) base amount to base_amount. quantity is therefore the
+        size left to work, matching the BaseExchangeClient.modify_order contract; passing
+        the original total would re-open the filled part.
+        """
+        # Ensure client is initialized
+        if self.lighter_client is None:
+            await self._initialize_lighter_client()
+
+        # order_id may be a client order index; resolve the exchange order index from the
+        # stream-fed cache, only asking REST for orders the stream has not reported
+        order_index = self._resolve_order_index(order_id)
+        if self.account_state.get_order(order_index) is None:
+            order_info = await self.get_order_info(order_id)
+            if order_info is None:
+                return OrderResult(success=False, order_id=order_id, error_message=f"Order {order_id} not found")
+            order_index = str(order_info.order_id)
+
+        price = self.round_to_tick(price)
+        modify_order, tx_hash, error = await self.lighter_client.modify_order(
+            market_index=self.config.contract_id,
+            order_index=int(order_index),
+            base_amount=int(quantity * self.base_amount_multiplier),
+            price=int(price * self.price_multiplier),
+            trigger_price=0,
+        )
+
+        if error is not None:
+            return OrderResult(success=False, order_id=order_id, error_message=f"Modify order error: {error}")
+
+        # The amended order is the same order; keep reporting it under the caller's id
+        return OrderResult(
+            success=True,
+            order_id=order_id,
+            side=side,
+            size=quantity,
+            price=price,
+            status='OPEN'
+        )
+
     async def cancel_all_orders(self) -> None:
         """Cancel all active orders for the configured contract."""
         try:
@@ -443,28 +718,19 @@ class LighterClient(BaseExchangeClient):
             raise
 
     async def get_order_info(self, order_id: str) -> Optional[OrderInfo]:
-        """Get order information from Lighter using official SDK."""
+        """Get order information from the WebSocket-fed account state, falling back to REST."""
+        order_info = self.account_state.get_order(self._resolve_order_index(order_id))
+        if order_info is not None:
+            return order_info
+
+        # Not seen on the stream (yet) or evicted from the cache; check resting, then finished orders via REST
         try:
-            # Use shared API client to get account info
-            account_api = lighter.AccountApi(self.api_client)
-
-            # Get account orders
-            account_data = await account_api.account(by="index", value=str(self.account_index))
-
-            # Look for the specific order in account positions
-            for position in account_data.positions:
-                if position.symbol == self.config.ticker:
-                    position_amt = abs(float(position.position))
-                    if position_amt > 0.001:  # Only include significant positions
-                        return OrderInfo(
-                            order_id=order_id,
-                            side="buy" if float(position.position) > 0 else "sell",
-                            size=Decimal(str(position_amt)),
-                            price=Decimal(str(position.avg_price)),
-                            status="FILLED",  # Positions are filled orders
-                            filled_size=Decimal(str(position_amt)),
-                            remaining_size=Decimal('0')
-                        )
+            for fetch_orders in (self._fetch_orders_with_retry, self._fetch_inactive_orders_with_retry):
+                for order in await fetch_orders():
+                    if str(order.order_index) == str(order_id) or str(order.client_order_index) == str(order_id):
+                        order_info = self._convert_rest_order(order)
+                        self.account_state.upsert_order(order_info)
+                        return order_info
 
             return None
 
@@ -479,20 +745,11 @@ class LighterClient(BaseExchangeClient):
         if self.lighter_client is None:
             await self._initialize_lighter_client()
 
-        # Generate auth token for API call
-        auth_token, error = self.lighter_client.create_auth_token_with_expiry()
-        if error is not None:
-            self.logger.log(f"Error creating auth token: {error}", "ERROR")
-            raise ValueError(f"Error creating auth token: {error}")
-
-        # Use OrderApi to get active orders
-        order_api = lighter.OrderApi(self.api_client)
-
         # Get active orders for the specific market
-        orders_response = await order_api.account_active_orders(
+        orders_response = await self.order_api.account_active_orders(
             account_index=self.account_index,
             market_id=self.config.contract_id,
-            auth=auth_token
+            auth=self._get_auth_token()
         )
 
         if not orders_response:
@@ -501,40 +758,69 @@ class LighterClient(BaseExchangeClient):
 
         return orders_response.orders
 
+    @query_retry(reraise=True)
+    async def _fetch_inactive_orders_with_retry(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get the most recent filled/canceled orders using official SDK."""
+        # Ensure client is initialized
+        if self.lighter_client is None:
+            await self._initialize_lighter_client()
+
+        orders_response = await self.order_api.account_inactive_orders(
+            account_index=self.account_index,
+            market_id=self.config.contract_id,
+            limit=limit,
+            auth=self._get_auth_token()
+        )
+
+        if not orders_response:
+            self.logger.log("Failed to get inactive orders", "ERROR")
+            raise ValueError("Failed to get inactive orders")
+
+        return orders_response.orders
+
+    def _convert_rest_order(self, order) -> OrderInfo:
+        """Convert a Lighter REST order to OrderInfo."""
+        status = order.status.upper()
+        if status.startswith('CANCELED'):
+            # e.g. canceled-post-only, same normalization as the stream
+            status = 'CANCELED'
+        filled_size = Decimal(order.filled_base_amount)
+        if status == 'OPEN' and filled_size > 0:
+            status = 'PARTIALLY_FILLED'
+
+        return OrderInfo(
+            order_id=str(order.order_index),
+            side="sell" if order.is_ask else "buy",
+            size=Decimal(order.initial_base_amount),
+            price=Decimal(order.price),
+            status=status,
+            filled_size=filled_size,
+            remaining_size=Decimal(order.remaining_base_amount)
+        )
+
     async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
-        """Get active orders for a contract using official SDK."""
+        """Get active orders from the WebSocket-fed account state, reconciling with REST periodically."""
+        if self.account_state.orders_ready and not self.account_state.needs_reconcile('orders', self.reconcile_interval):
+            return self.account_state.get_open_orders()
+
         order_list = await self._fetch_orders_with_retry()
 
         # Filter orders for the specific market
         contract_orders = []
         for order in order_list:
-            # Convert Lighter Order to OrderInfo
-            side = "sell" if order.is_ask else "buy"
-            size = Decimal(order.initial_base_amount)
-            price = Decimal(order.price)
-
             # Only include orders with remaining size > 0
-            if size > 0:
-                contract_orders.append(OrderInfo(
-                    order_id=str(order.order_index),
-                    side=side,
-                    size=Decimal(order.remaining_base_amount),  # FIXME: This is wrong. Should be size
-                    price=price,
-                    status=order.status.upper(),
-                    filled_size=Decimal(order.filled_base_amount),
-                    remaining_size=Decimal(order.remaining_base_amount)
-                ))
+            if Decimal(order.initial_base_amount) > 0:
+                contract_orders.append(self._convert_rest_order(order))
 
+        self.account_state.replace_open_orders(contract_orders)
+        self.account_state.mark_reconciled('orders')
         return contract_orders
 
     @query_retry(reraise=True)
     async def _fetch_positions_with_retry(self) -> List[Dict[str, Any]]:
         """Get positions using official SDK."""
-        # Use shared API client
-        account_api = lighter.AccountApi(self.api_client)
-
         # Get account info
-        account_data = await account_api.account(by="index", value=str(self.account_index))
+        account_data = await self.account_api.account(by="index", value=str(self.account_index))
 
         if not account_data or not account_data.accounts:
             self.logger.log("Failed to get positions", "ERROR")
@@ -544,25 +830,38 @@ class LighterClient(BaseExchangeClient):
 
     async def get_account_positions(self) -> Decimal:
         """
-        Get account positions using official SDK.
+        Get account positions from the WebSocket-fed account state.
+
+        Falls back to the official SDK when the stream is not live or the
+        reconcile interval has elapsed.
 
         Returns signed position:
         - Positive = Long position
         - Negative = Short position
         """
+        market = str(self.config.contract_id)
+        cached_position = self.account_state.get_position(market)
+        if cached_position is not None and not self.account_state.needs_reconcile('positions', self.reconcile_interval):
+            return cached_position
+
         # Get account info which includes positions
         positions = await self._fetch_positions_with_retry()
 
         # Find position for current market
+        position_value = Decimal(0)
         for position in positions:
             if position.market_id == self.config.contract_id:
                 # position.position is absolute value
                 # position.sign is '1' (long) or '-1' (short) as string
-                pos_value = Decimal(position.position)
-                sign = int(position.sign)
-                return pos_value * sign
+                position_value = Decimal(position.position) * int(position.sign)
+                break
+
+        if cached_position is not None and cached_position != position_value:
+            self.logger.log(f"Position cache drift: cached={cached_position}, rest={position_value}", "WARNING")
 
-        return Decimal(0)
+        self.account_state.update_position(market, position_value)
+        self.account_state.mark_reconciled('positions')
+        return position_value
 
     async def get_contract_attributes(self) -> Tuple[str, Decimal]:
         """Get contract ID for a ticker."""
@@ -571,9 +870,8 @@ class LighterClient(BaseExchangeClient):
             self.logger.log("Ticker is empty", "ERROR")
             raise ValueError("Ticker is empty")
 
-        order_api = lighter.OrderApi(self.api_client)
         # Get all order books to find the market for our ticker
-        order_books = await order_api.order_books()
+        order_books = await self.order_api.order_books()
 
         # Find the market that matches our ticker
         market_info = None
@@ -586,7 +884,7 @@ class LighterClient(BaseExchangeClient):
             self.logger.log("Failed to get markets", "ERROR")
             raise ValueError("Failed to get markets")
 
-        market_summary = await order_api.order_book_details(market_id=market_info.market_id)
+        market_summary = await self.order_api.order_book_details(market_id=market_info.market_id)
         order_book_details = market_summary.order_book_details[0]
         # Set contract_id to market name (Lighter uses market IDs as identifiers)
         self.config.contract_id = market_info.market_id
@@ -4,31 +4,56 @@ Based on the sample code provided by the user.
 """
 
 import asyncio
+import bisect
 import json
 import time
+from decimal import Decimal
 from typing import Dict, Any, List, Optional, Tuple, Callable
 import websockets
 
+from .account_state import AccountStateCache
+from .base import MarginInfo
+from .event_queue import ConflatingEventQueue
+from .feed_merger import RedundantFeedMerger
+from .market_data import DepthQuote, TopOfBook, exchange_time, record_quote, walk_levels
+
 
 class LighterCustomWebSocketManager:
     """Custom WebSocket manager for Lighter order updates and order book without SDK."""
 
-    def __init__(self, config: Dict[str, Any], order_update_callback: Optional[Callable] = None):
+    def __init__(self, config: Dict[str, Any], order_update_callback: Optional[Callable] = None,
+                 account_state: Optional[AccountStateCache] = None):
         self.config = config
         self.order_update_callback = order_update_callback
+        self.account_state = account_state
         self.logger = None
         self.running = False
         self.ws = None
+        self._closing = False
+
+        # Independent connections reading the same channels (hot standby), merged first-arrival-wins
+        self.ws_connections = max(1, int(getattr(config, 'ws_connections', 1) or 1))
+        self.feed_merger = RedundantFeedMerger("lighter")
+        self._sockets: Dict[int, Any] = {}
 
         # Order book state
         self.order_book = {"bids": {}, "asks": {}}
-        self.best_bid = None
-        self.best_ask = None
+        # Ascending price levels of each side, kept in sync with order_book for depth walks
+        self.sorted_prices = {"bids": [], "asks": []}
+        # Single writer (the reader loop) publishes immutable snapshots; readers never lock
+        self.top_of_book: Optional[TopOfBook] = None
+        self.top_of_book_version = 0
         self.snapshot_loaded = False
         self.order_book_offset = None
         self.order_book_sequence_gap = False
+        # Set when the shared book failed validation and must be rebuilt from a fresh snapshot
+        self._book_invalid = False
         self.order_book_lock = asyncio.Lock()
 
+        # Account/order messages are handled by a consumer task so the reader only applies book diffs
+        self.events = ConflatingEventQueue("lighter")
+        self._consumer_task: Optional[asyncio.Task] = None
+
         # WebSocket URL
         self.ws_url = "wss://mainnet.zklighter.elliot.ai/stream"
         self.market_index = config.contract_id
@@ -79,13 +104,56 @@ class LighterCustomWebSocketManager:
                     continue
 
                 if size == 0:
-                    ob.pop(price, None)
+                    if ob.pop(price, None) is not None:
+                        self._remove_price_level(side, price)
                 else:
+                    if price not in ob:
+                        bisect.insort(self.sorted_prices[side], price)
                     ob[price] = size
             except (KeyError, ValueError, TypeError) as e:
                 self._log(f"Error processing order book update: {e}, update: {update}", "ERROR")
                 continue
 
+    def _remove_price_level(self, side: str, price: float):
+        """Remove a price from the sorted level index."""
+        prices = self.sorted_prices[side]
+        index = bisect.bisect_left(prices, price)
+        if index < len(prices) and prices[index] == price:
+            del prices[index]
+
+    def _clear_order_book(self):
+        """Clear both sides of the book and the level index."""
+        for side in ("bids", "asks"):
+            self.order_book[side].clear()
+            self.sorted_prices[side].clear()
+
+    def walk_order_book(self, side: str, quantity: Decimal, max_levels: Optional[int] = None) -> DepthQuote:
+        """
+        Walk the book for a taker order.
+
+        Args:
+            side: Taker side; 'buy' consumes asks from the lowest price, 'sell' consumes bids from the highest
+            quantity: Size to fill
+            max_levels: Stop after this many levels
+        """
+        if side == 'buy':
+            book, prices = self.order_book["asks"], self.sorted_prices["asks"]
+            ordered = prices
+        else:
+            book, prices = self.order_book["bids"], self.sorted_prices["bids"]
+            ordered = reversed(prices)
+        return walk_levels(((price, book[price]) for price in ordered), quantity, max_levels)
+
+    def depth_within(self, side: str, limit_price: float) -> Decimal:
+        """Total size a taker of `side` can fill at prices no worse than limit_price."""
+        if side == 'buy':
+            book, prices = self.order_book["asks"], self.sorted_prices["asks"]
+            levels = prices[:bisect.bisect_right(prices, limit_price)]
+        else:
+            book, prices = self.order_book["bids"], self.sorted_prices["bids"]
+            levels = prices[bisect.bisect_left(prices, limit_price):]
+        return sum((Decimal(str(book[price])) for price in levels), Decimal(0))
+
     def validate_order_book_offset(self, new_offset: int) -> bool:
         """Validate that the new offset is sequential and handle gaps."""
         if self.order_book_offset is None:
@@ -194,6 +262,30 @@ class LighterCustomWebSocketManager:
             self._log(f"Error getting best levels: {e}", "ERROR")
             return (None, None), (None, None)
 
+    def publish_top_of_book(self, exchange_timestamp: Optional[float] = None):
+        """
+        Publish the current best levels as a new immutable snapshot.
+
+        The snapshot is built completely before the single reference assignment, so readers
+        see either the previous or the new quote, never a mix. If a side has no qualifying
+        level the previous snapshot is kept; its age and offset show how old it is.
+        """
+        (best_bid_price, best_bid_size), (best_ask_price, best_ask_size) = self.get_best_levels()
+        if best_bid_price is None or best_ask_price is None:
+            return
+
+        self.top_of_book_version += 1
+        self.top_of_book = TopOfBook(
+            best_bid=Decimal(str(best_bid_price)),
+            best_ask=Decimal(str(best_ask_price)),
+            bid_size=Decimal(str(best_bid_size)),
+            ask_size=Decimal(str(best_ask_size)),
+            offset=self.order_book_offset,
+            version=self.top_of_book_version,
+            exchange_timestamp=exchange_timestamp
+        )
+        record_quote("lighter", self.top_of_book)
+
     def cleanup_old_order_book_levels(self):
         """Clean up old order book levels to prevent memory leaks."""
         try:
@@ -202,17 +294,17 @@ class LighterCustomWebSocketManager:
 
             # Clean up bids (keep highest prices)
             if len(self.order_book["bids"]) > max_levels:
-                sorted_bids = sorted(self.order_book["bids"].items(), reverse=True)
-                self.order_book["bids"].clear()
-                for price, size in sorted_bids[:max_levels]:
-                    self.order_book["bids"][price] = size
+                prices = self.sorted_prices["bids"]
+                for price in prices[:-max_levels]:
+                    del self.order_book["bids"][price]
+                del prices[:-max_levels]
 
             # Clean up asks (keep lowest prices)
             if len(self.order_book["asks"]) > max_levels:
-                sorted_asks = sorted(self.order_book["asks"].items())
-                self.order_book["asks"].clear()
-                for price, size in sorted_asks[:max_levels]:
-                    self.order_book["asks"][price] = size
+                prices = self.sorted_prices["asks"]
+                for price in prices[max_levels:]:
+                    del self.order_book["asks"][price]
+                del prices[max_levels:]
 
         except Exception as e:
             self._log(f"Error cleaning up order book levels: {e}", "ERROR")
@@ -220,13 +312,77 @@ class LighterCustomWebSocketManager:
     async def reset_order_book(self):
         """Reset the order book state when reconnecting."""
         async with self.order_book_lock:
-            self.order_book["bids"].clear()
-            self.order_book["asks"].clear()
+            self._clear_order_book()
             self.snapshot_loaded = False
-            self.best_bid = None
-            self.best_ask = None
+            self.top_of_book = None
             self.order_book_offset = None
             self.order_book_sequence_gap = False
+            self._book_invalid = False
+
+    async def invalidate_account_state(self):
+        """Stop trusting the account cache after the last live connection dropped."""
+        # Account updates may have been missed while disconnected. Invalidate again behind any
+        # queued events from the old connection so they cannot mark the cache live.
+        self.events.discard("user_stats")
+        if self.account_state:
+            self.account_state.invalidate()
+            await self.events.put(("reset", None))
+
+    def _dispatch_event(self, event):
+        """Handle one queued (kind, data) event on the consumer task."""
+        kind, data = event
+        if kind == "account_orders":
+            self.handle_order_update(data)
+        elif kind == "account_all":
+            self.handle_account_update(data)
+        elif kind == "user_stats":
+            self.handle_user_stats(data)
+        elif kind == "reset" and self.account_state:
+            self.account_state.invalidate()
+
+    def handle_account_update(self, data: Dict[str, Any]):
+        """Handle account_all snapshot/update from WebSocket and refresh cached positions."""
+        if not self.account_state:
+            return
+
+        try:
+            positions = data.get("positions") or {}
+            seen_markets = set()
+            for position in positions.values():
+                market_id = position.get("market_id")
+                if market_id is None:
+                    continue
+                # position is absolute value, sign is 1 (long) or -1 (short)
+                signed_position = Decimal(str(position.get("position", "0"))) * int(position.get("sign", 1))
+                self.account_state.update_position(str(market_id), signed_position)
+                seen_markets.add(str(market_id))
+
+            # No entry for our market in the initial snapshot means flat
+            if data.get("type") == "subscribed/account_all" and str(self.market_index) not in seen_markets:
+                self.account_state.update_position(str(self.market_index), Decimal(0))
+
+            self.account_state.mark_stream_live()
+        except Exception as e:
+            self._log(f"Error handling account update: {e}", "ERROR")
+
+    def handle_user_stats(self, data: Dict[str, Any]):
+        """Handle user_stats snapshot/update from WebSocket and refresh cached collateral/margin."""
+        if not self.account_state:
+            return
+
+        try:
+            stats = data.get("stats") or {}
+            portfolio_value = stats.get("portfolio_value")
+            available_balance = stats.get("available_balance")
+            if portfolio_value is None or available_balance is None:
+                return
+            collateral = Decimal(str(portfolio_value))
+            self.account_state.update_margin(MarginInfo(
+                collateral=collateral,
+                margin_used=max(collateral - Decimal(str(available_balance)), Decimal(0))
+            ))
+        except Exception as e:
+            self._log(f"Error handling user stats: {e}", "ERROR")
 
     def handle_order_update(self, order_data_list: List[Dict[str, Any]]):
         """Handle order update from WebSocket."""
@@ -239,20 +395,40 @@ class LighterCustomWebSocketManager:
             self._log(f"Error handling order update: {e}", "ERROR")
 
     async def connect(self):
-        """Connect to Lighter WebSocket using custom implementation."""
+        """
+        Connect to Lighter WebSocket using custom implementation.
+
+        With ws_connections > 1 the same channels are read over independent connections. Book
+        updates are merged by offset and account messages by their sequence, first arrival wins, so one
+        connection's reconnect backoff does not blind the book.
+        """
+        if self._consumer_task is None or self._consumer_task.done():
+            self._consumer_task = asyncio.create_task(self.events.run(self._dispatch_event))
+
+        self._closing = False
+        await asyncio.gather(*(self._run_connection(connection) for connection in range(self.ws_connections)))
+
+    async def _run_connection(self, connection: int):
+        """Reconnect loop of one WebSocket connection."""
         cleanup_counter = 0
         timeout_count = 0
         reconnect_delay = 1  # Start with 1 second delay
         max_reconnect_delay = 30  # Maximum delay of 30 seconds
 
-        while True:
+        while not self._closing:
             try:
-                # Reset order book state before connecting
-                await self.reset_order_book()
+                # Reset shared state before connecting unless another connection is still feeding it
+                if self._book_invalid or not self.feed_merger.has_other_live(connection):
+                    await self.reset_order_book()
+                if not self.feed_merger.has_other_live(connection):
+                    await self.invalidate_account_state()
+
+                async with websockets.connect(self.ws_url) as ws:
+                    self.ws = ws
+                    self._sockets[connection] = ws
 
-                async with websockets.connect(self.ws_url) as self.ws:
                     # Subscribe to order book updates
-                    await self.ws.send(json.dumps({
+                    await ws.send(json.dumps({
                         "type": "subscribe",
                         "channel": f"order_book/{self.market_index}"
                     }))
@@ -274,20 +450,32 @@ class LighterCustomWebSocketManager:
                                     "channel": account_orders_channel,
                                     "auth": auth_token
                                 }
-                                await self.ws.send(json.dumps(auth_message))
+                                await ws.send(json.dumps(auth_message))
                                 self._log("Subscribed to account orders with auth token (expires in 10 minutes)", "INFO")
                     except Exception as e:
                         self._log(f"Error creating auth token for account orders subscription: {e}", "WARNING")
 
+                    # Subscribe to account updates (positions) for the local account state cache
+                    if self.account_state:
+                        await ws.send(json.dumps({
+                            "type": "subscribe",
+                            "channel": f"account_all/{self.account_index}"
+                        }))
+                        await ws.send(json.dumps({
+                            "type": "subscribe",
+                            "channel": f"user_stats/{self.account_index}"
+                        }))
+
                     self.running = True
+                    self.feed_merger.set_live(connection, True)
                     # Reset reconnect delay on successful connection
                     reconnect_delay = 1
-                    self._log("WebSocket connected using custom implementation", "INFO")
+                    self._log(f"WebSocket connection {connection} connected using custom implementation", "INFO")
 
                     # Main message processing loop
                     while self.running:
                         try:
-                            msg = await asyncio.wait_for(self.ws.recv(), timeout=1)
+                            msg = await asyncio.wait_for(ws.recv(), timeout=1)
 
                             try:
                                 data = json.loads(msg)
@@ -299,82 +487,11 @@ class LighterCustomWebSocketManager:
                             timeout_count = 0
 
                             async with self.order_book_lock:
-                                if data.get("type") == "subscribed/order_book":
-                                    # Initial snapshot - clear and populate the order book
-                                    self.order_book["bids"].clear()
-                                    self.order_book["asks"].clear()
-
-                                    # Handle the initial snapshot
-                                    order_book = data.get("order_book", {})
-                                    if order_book and "offset" in order_book:
-                                        # Set the initial offset from the snapshot
-                                        self.order_book_offset = order_book["offset"]
-                                        self._log(f"Initial order book offset set to: {self.order_book_offset}", "INFO")
-
-                                    self.update_order_book("bids", order_book.get("bids", []))
-                                    self.update_order_book("asks", order_book.get("asks", []))
-                                    self.snapshot_loaded = True
-
-                                    self._log(f"Lighter order book snapshot loaded with "
-                                              f"{len(self.order_book['bids'])} bids and "
-                                              f"{len(self.order_book['asks'])} asks", "INFO")
-
-                                elif data.get("type") == "update/order_book" and self.snapshot_loaded:
-                                    # Check for cutoff/incomplete updates first
-                                    if not self.handle_order_book_cutoff(data):
-                                        self._log("Skipping incomplete order book update", "WARNING")
-                                        continue
-
-                                    # Extract offset from the message
-                                    order_book = data.get("order_book", {})
-                                    if not order_book or "offset" not in order_book:
-                                        self._log("Order book update missing offset, skipping", "WARNING")
-                                        continue
-
-                                    new_offset = order_book["offset"]
-
-                                    # Validate offset sequence
-                                    if not self.validate_order_book_offset(new_offset):
-                                        # Sequence gap detected, try to request fresh snapshot first
-                                        if self.order_book_sequence_gap:
-                                            self._log("Sequence gap detected, requesting fresh snapshot...", "WARNING")
-                                            # Release lock before network I/O
-                                            break
-                                        else:
-                                            # For out-of-order updates, just continue
-                                            continue
-
-                                    # Update the order book with new data
-                                    self.update_order_book("bids", order_book.get("bids", []))
-                                    self.update_order_book("asks", order_book.get("asks", []))
-
-                                    # Validate order book integrity after update
-                                    if not self.validate_order_book_integrity():
-                                        self._log("Order book integrity check failed, requesting fresh snapshot...", "WARNING")
-                                        # Release lock before network I/O
-                                        break
-
-                                    # Get the best bid and ask levels
-                                    (best_bid_price, best_bid_size), (best_ask_price, best_ask_size) = self.get_best_levels()
-
-                                    # Update global variables
-                                    if best_bid_price is not None:
-                                        self.best_bid = best_bid_price
-                                    if best_ask_price is not None:
-                                        self.best_ask = best_ask_price
-
-                                elif data.get("type") == "ping":
-                                    # Respond to ping with pong
-                                    await self.ws.send(json.dumps({"type": "pong"}))
-                                elif data.get("type") == "update/account_orders":
-                                    # Handle account orders updates
-                                    orders = data.get("orders", {}).get(str(self.market_index), [])
-                                    self.handle_order_update(orders)
-                                elif data.get("type") == "update/order_book" and not self.snapshot_loaded:
-                                    # Ignore updates until we have the initial snapshot
-                                    continue
-                                else:
-                                    self._log(f"Unknown message type: {data.get('type', 'unknown')}", "DEBUG")
+                                keep_connection = await self._handle_message(connection, ws, data)
+                            if not keep_connection:
+                                self._log(f"Reconnecting connection {connection} for a fresh order book snapshot...",
+                                          "WARNING")
+                                break
 
                             # Periodic cleanup outside the lock
                             cleanup_counter += 1
@@ -382,24 +499,14 @@ class LighterCustomWebSocketManager:
                                 self.cleanup_old_order_book_levels()
                                 cleanup_counter = 0
 
-                            # Handle sequence gap and integrity issues outside the lock
-                            if self.order_book_sequence_gap:
-                                try:
-                                    await self.request_fresh_snapshot()
-                                    self.order_book_sequence_gap = False
-                                except Exception as e:
-                                    self._log(f"Failed to request fresh snapshot: {e}", "ERROR")
-                                    self._log("Reconnecting due to sequence gap...", "WARNING")
-                                    break
-
                         except asyncio.TimeoutError:
                             timeout_count += 1
                             if timeout_count % 30 == 0:
-                                self._log(f"No message from Lighter websocket for {timeout_count} seconds "
-                                          f"(abnormal behavior)", "WARNING")
+                                self._log(f"No message from Lighter websocket connection {connection} for "
+                                          f"{timeout_count} seconds (abnormal behavior)", "WARNING")
                             continue
                         except websockets.exceptions.ConnectionClosed as e:
-                            self._log(f"Lighter websocket connection closed: {e}", "WARNING")
+                            self._log(f"Lighter websocket connection {connection} closed: {e}", "WARNING")
                             self._log("Connection lost, will attempt to reconnect...", "INFO")
                             break  # Break inner loop to reconnect
                         except websockets.exceptions.WebSocketException as e:
@@ -413,20 +520,145 @@ class LighterCustomWebSocketManager:
 
             except Exception as e:
                 self._log(f"Failed to connect to Lighter websocket: {e}", "ERROR")
+            finally:
+                self._sockets.pop(connection, None)
+                self.feed_merger.set_live(connection, False)
 
             # Wait before reconnecting with exponential backoff
-            if self.running:
-                self._log(f"Waiting {reconnect_delay} seconds before reconnecting...", "INFO")
+            if not self._closing:
+                self._log(f"Waiting {reconnect_delay} seconds before reconnecting connection {connection}...", "INFO")
                 await asyncio.sleep(reconnect_delay)
                 # Exponential backoff: double the delay, but cap at max_reconnect_delay
                 reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
 
+    async def _handle_message(self, connection: int, ws, data: Dict[str, Any]) -> bool:
+        """
+        Apply one message from a connection (called under order_book_lock).
+
+        Returns:
+            False when this connection missed book updates and must reconnect for a fresh snapshot
+        """
+        message_type = data.get("type")
+
+        if message_type == "ping":
+            # Respond to ping with pong on the connection that sent it
+            await ws.send(json.dumps({"type": "pong"}))
+
+        elif message_type == "subscribed/order_book":
+            order_book = data.get("order_book", {})
+            snapshot_offset = order_book.get("offset")
+            if (self.snapshot_loaded and self.order_book_offset is not None and snapshot_offset is not None
+                    and snapshot_offset <= self.order_book_offset):
+                # Another connection already applied this state; follow its updates by offset
+                self._log(f"Connection {connection} snapshot at offset {snapshot_offset} is behind the book "
+                          f"({self.order_book_offset}), skipping", "DEBUG")
+                return True
+
+            # Initial snapshot - clear and populate the order book
+            self._clear_order_book()
+
+            # Handle the initial snapshot
+            if order_book and "offset" in order_book:
+                # Set the initial offset from the snapshot
+                self.order_book_offset = order_book["offset"]
+                self._log(f"Initial order book offset set to: {self.order_book_offset}", "INFO")
+
+            self.update_order_book("bids", order_book.get("bids", []))
+            self.update_order_book("asks", order_book.get("asks", []))
+            self.snapshot_loaded = True
+            self._book_invalid = False
+            self.publish_top_of_book(exchange_time(data.get("timestamp")))
+
+            self._log(f"Lighter order book snapshot loaded with "
+                      f"{len(self.order_book['bids'])} bids and "
+                      f"{len(self.order_book['asks'])} asks", "INFO")
+
+        elif message_type == "update/order_book":
+            if not self.snapshot_loaded:
+                # Ignore updates until we have the initial snapshot
+                return True
+
+            # Check for cutoff/incomplete updates first
+            if not self.handle_order_book_cutoff(data):
+                self._log("Skipping incomplete order book update", "WARNING")
+                return True
+
+            # Extract offset from the message
+            order_book = data.get("order_book", {})
+            if not order_book or "offset" not in order_book:
+                self._log("Order book update missing offset, skipping", "WARNING")
+                return True
+
+            new_offset = order_book["offset"]
+            if self.order_book_offset is not None and new_offset <= self.order_book_offset:
+                # Already applied from another connection: first arrival wins
+                self.feed_merger.accept(connection, ("order_book", new_offset))
+                return True
+
+            # Validate offset sequence
+            if not self.validate_order_book_offset(new_offset):
+                # This connection missed updates; another live connection may still deliver them
+                return False
+
+            self.feed_merger.accept(connection, ("order_book", new_offset))
+
+            # Update the order book with new data
+            self.update_order_book("bids", order_book.get("bids", []))
+            self.update_order_book("asks", order_book.get("asks", []))
+
+            # Validate order book integrity after update
+            if not self.validate_order_book_integrity():
+                self._log("Order book integrity check failed, requesting fresh snapshot...", "WARNING")
+                self._book_invalid = True
+                return False
+
+            self.publish_top_of_book(exchange_time(data.get("timestamp")))
+
+        elif message_type in ("subscribed/account_orders", "update/account_orders",
+                              "subscribed/account_all", "update/account_all",
+                              "subscribed/user_stats", "update/user_stats"):
+            # The same account message arrives once per connection
+            if self.ws_connections > 1 and not self._accept_account_message(connection, message_type, data):
+                return True
+
+            if message_type.endswith("/account_orders"):
+                # Handle account orders updates
+                orders = data.get("orders", {}).get(str(self.market_index), [])
+                await self.events.put(("account_orders", orders))
+            elif message_type.endswith("/account_all"):
+                # Handle account position updates (per-market deltas, never conflated)
+                await self.events.put(("account_all", data))
+            else:
+                # Handle collateral/margin updates (full snapshot, latest wins)
+                self.events.put_latest("user_stats", ("user_stats", data))
+
+        else:
+            self._log(f"Unknown message type: {data.get('type', 'unknown')}", "DEBUG")
+
+        return True
+
+    def _accept_account_message(self, connection: int, message_type: str, data: Dict[str, Any]) -> bool:
+        """
+        Deduplicate an account message across connections by its sequence (nonce, offset or timestamp).
+
+        Messages without a sequence cannot be matched across connections; they are taken only from
+        the lowest-numbered live connection.
+        """
+        sequence = next((data[field] for field in ("nonce", "offset", "timestamp") if data.get(field) is not None),
+                        None)
+        if sequence is None:
+            return self.feed_merger.is_primary(connection)
+        return self.feed_merger.accept(connection, ("account", message_type, data.get("channel"), sequence))
+
     async def disconnect(self):
         """Disconnect from WebSocket."""
+        self._closing = True
         self.running = False
-        if self.ws:
+        if self._consumer_task:
+            self._consumer_task.cancel()
+        for ws in list(self._sockets.values()):
             try:
-                await self.ws.close()
+                await ws.close()
             except Exception as e:
                 self._log(f"Error closing websocket: {e}", "ERROR")
         self._log("WebSocket disconnected", "INFO")
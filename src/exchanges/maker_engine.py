@@ -0,0 +1,207 @@
+"""
+Shared post-only (maker) order placement loop.
+
+Clients supply the venue-specific primitive:
+
+    async def _submit_post_only_order(contract_id, quantity, price, side) -> OrderResult
+
+Return convention of the primitive:
+    success=False, status='REJECTED'  -> post-only rejected (would cross), engine retries
+    success=False                     -> hard failure, returned to the caller as is
+    success=True,  status set         -> venue already knows the final status
+    success=True,  status None        -> engine checks get_order_info once after a short delay
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from typing import Optional, Tuple
+
+from .base import OrderInfo, OrderResult
+from helpers.metrics import metrics
+
+
+RESTING_STATUSES = ('OPEN', 'NEW', 'PENDING', 'PARTIALLY_FILLED', 'FILLED')
+REJECTED_STATUSES = ('CANCELED', 'CANCELLED', 'REJECTED', 'EXPIRED')
+
+
+class MakerOrderEngine:
+    """Drive post-only placement retries from the live book."""
+
+    def __init__(self, client, venue: str, max_retries: int = 15, max_backoff_ticks: int = 3,
+                 status_check_delay: float = 0.01, error_retry_delay: float = 0.1,
+                 guard_active_orders: bool = False, guard_interval: int = 5):
+        """
+        Args:
+            client: Exchange client providing fetch_bbo_prices, get_order_info,
+                round_to_tick and _submit_post_only_order (and get_active_orders when guarded)
+            venue: Exchange name, used as the metrics prefix
+            max_retries: Maximum submit attempts per placement
+            max_backoff_ticks: Maximum extra ticks stepped away after repeated rejections
+                at an unchanged quote
+            status_check_delay: Delay before checking an order without a known status
+            error_retry_delay: Delay before retrying after an exception
+            guard_active_orders: Every guard_interval attempts, compare the resting orders on the
+                order's side with the count before the first attempt and raise when more than one
+                extra order rests (submits reported as failed that actually rested)
+            guard_interval: Attempts between active order checks
+        """
+        self.client = client
+        self.venue = venue
+        self.max_retries = max_retries
+        self.guard_active_orders = guard_active_orders
+        self.guard_interval = guard_interval
+        self.max_backoff_ticks = max_backoff_ticks
+        self.status_check_delay = status_check_delay
+        self.error_retry_delay = error_retry_delay
+
+        self.attempts = metrics.counter(f"{venue}.maker.attempts")
+        self.rejections = metrics.counter(f"{venue}.maker.rejections")
+        self.placed = metrics.counter(f"{venue}.maker.placed")
+        self.time_to_rest = metrics.histogram(f"{venue}.maker.time_to_rest")
+
+    @property
+    def tick_size(self) -> Decimal:
+        return self.client.config.tick_size
+
+    def maker_price(self, side: str, best_bid: Decimal, best_ask: Decimal,
+                    price: Optional[Decimal] = None, backoff_ticks: int = 0) -> Decimal:
+        """
+        Price that rests on the book.
+
+        Without a price, quote one tick inside the opposite touch. With a price,
+        keep it unless it would cross, in which case pull it back behind the touch.
+        Each backoff tick steps one more tick away from the opposite side.
+        """
+        offset = self.tick_size * (1 + backoff_ticks)
+        if side == 'buy':
+            if price is None or price >= best_ask:
+                price = best_ask - offset
+        elif side == 'sell':
+            if price is None or price <= best_bid:
+                price = best_bid + offset
+        else:
+            raise ValueError(f"Invalid side: {side}")
+        return self.client.round_to_tick(price)
+
+    async def _resolve_status(self, result: OrderResult) -> Optional[OrderInfo]:
+        """Order info of a submitted order whose primitive did not report a status."""
+        await asyncio.sleep(self.status_check_delay)
+        return await self.client.get_order_info(result.order_id)
+
+    async def _count_active_orders(self, contract_id: str, side: str) -> int:
+        """Resting orders on one side of the contract."""
+        active_orders = await self.client.get_active_orders(contract_id)
+        return sum(1 for order in active_orders if order.side == side)
+
+    @staticmethod
+    def _filled_size(status: str, quantity: Decimal, filled_size: Optional[Decimal]) -> Decimal:
+        """Filled quantity reported with a placement result."""
+        if filled_size is not None:
+            return Decimal(str(filled_size))
+        return quantity if status == 'FILLED' else Decimal('0')
+
+    async def place(self, contract_id: str, quantity: Decimal, side: str,
+                    price: Optional[Decimal] = None, **submit_kwargs) -> OrderResult:
+        """
+        Place a post-only order, retrying rejections at a fresh maker price.
+
+        Args:
+            contract_id: Contract to trade
+            quantity: Order size
+            side: 'buy' or 'sell'
+            price: Desired price for close orders; None quotes at the touch
+            **submit_kwargs: Extra venue-specific arguments for _submit_post_only_order
+
+        Returns:
+            OrderResult of the resting (or already filled) order, carrying the venue status
+            (OPEN, NEW, PENDING, PARTIALLY_FILLED or FILLED) and filled_size
+
+        Raises:
+            Exception: With guard_active_orders, when failed submits have left extra resting orders
+        """
+        side = side.lower()
+        if side not in ('buy', 'sell'):
+            return OrderResult(success=False, error_message=f'Invalid side: {side}')
+
+        start_time = time.time()
+        last_rejected_quote: Optional[Tuple[Decimal, Decimal]] = None
+        backoff_ticks = 0
+        last_error = 'Max retries exceeded'
+        active_before = await self._count_active_orders(contract_id, side) if self.guard_active_orders else 0
+
+        for attempt in range(1, self.max_retries + 1):
+            if self.guard_active_orders and attempt % self.guard_interval == 0:
+                active_now = await self._count_active_orders(contract_id, side)
+                if active_now - active_before > 1:
+                    raise Exception(f"[{self.venue}] Active {side} orders abnormal: "
+                                    f"{active_before} before placing, {active_now} after {attempt - 1} attempts")
+
+            try:
+                best_bid, best_ask = await self.client.fetch_bbo_prices(contract_id)
+                if best_bid <= 0 or best_ask <= 0:
+                    return OrderResult(success=False, error_message='Invalid bid/ask prices')
+
+                order_price = self.maker_price(side, best_bid, best_ask, price, backoff_ticks)
+
+                self.attempts.inc()
+                result = await self.client._submit_post_only_order(contract_id, quantity, order_price, side,
+                                                                    **submit_kwargs)
+
+                if not result.success and result.status != 'REJECTED':
+                    return result
+
+                status = result.status
+                filled_size = result.filled_size
+                if result.success and status is None:
+                    order_info = await self._resolve_status(result)
+                    if order_info is None:
+                        # Assume the order is resting if the venue cannot report it yet
+                        status = 'OPEN'
+                    else:
+                        status = order_info.status
+                        filled_size = order_info.filled_size
+
+                if status in REJECTED_STATUSES:
+                    self.rejections.inc()
+                    # Rejected at the same quote: our view of the book is behind, step further away
+                    if last_rejected_quote == (best_bid, best_ask):
+                        backoff_ticks = min(backoff_ticks + 1, self.max_backoff_ticks)
+                    else:
+                        backoff_ticks = 0
+                    last_rejected_quote = (best_bid, best_ask)
+                    last_error = f'Order rejected after {self.max_retries} attempts'
+                    continue
+
+                if status in RESTING_STATUSES:
+                    self.placed.inc()
+                    self.time_to_rest.observe(time.time() - start_time)
+                    return OrderResult(
+                        success=True,
+                        order_id=result.order_id,
+                        side=side,
+                        size=quantity,
+                        price=order_price,
+                        # Keep PARTIALLY_FILLED distinct so callers can hedge the filled part
+                        status=status,
+                        filled_size=self._filled_size(status, quantity, filled_size)
+                    )
+
+                return OrderResult(success=False, order_id=result.order_id,
+                                   error_message=f'Unexpected order status: {status}')
+
+            except Exception as e:
+                last_error = str(e)
+                await asyncio.sleep(self.error_retry_delay)
+
+        return OrderResult(success=False, error_message=last_error)
+
+    def get_stats(self) -> dict:
+        """Rejection rate and time-to-rest for this venue."""
+        attempts = self.attempts.value
+        return {
+            'attempts': attempts,
+            'placed': self.placed.value,
+            'rejection_rate': self.rejections.value / attempts if attempts else 0.0,
+            'time_to_rest': self.time_to_rest.snapshot(),
+        }
@@ -0,0 +1,176 @@
+"""
+WebSocket-fed market data shared by the exchange clients.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from helpers.metrics import metrics
+
+
+@dataclass(frozen=True)
+class TopOfBook:
+    """
+    Best bid/ask as last received from a market data stream.
+
+    Instances are immutable and published by replacing the reference, so a reader that takes
+    one reference always sees a consistent bid/ask pair without locking.
+    """
+    best_bid: Decimal
+    best_ask: Decimal
+    bid_size: Optional[Decimal] = None
+    ask_size: Optional[Decimal] = None
+    timestamp: float = field(default_factory=time.time)  # local receive time
+    offset: Optional[int] = None                          # exchange sequence number of the book update
+    version: int = 0                                      # local publication counter, increases per snapshot
+    exchange_timestamp: Optional[float] = None            # exchange event time, when the feed carries one
+
+    def age(self) -> float:
+        """Seconds since the quote was received."""
+        return time.time() - self.timestamp
+
+    def one_way_delay(self) -> Optional[float]:
+        """Receive time minus exchange event time (includes clock skew), or None without an event time."""
+        if self.exchange_timestamp is None:
+            return None
+        return self.timestamp - self.exchange_timestamp
+
+    def is_valid(self) -> bool:
+        """Both sides present and not crossed."""
+        return 0 < self.best_bid < self.best_ask
+
+
+def exchange_time(value: Any) -> Optional[float]:
+    """Exchange epoch timestamp in seconds, ms, us or ns converted to seconds; None when missing."""
+    if value is None or value == "":
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if value <= 0:
+        return None
+    # Pick the unit by magnitude: seconds are ~1e9 today
+    for divisor in (1.0, 1e3, 1e6, 1e9):
+        if value / divisor < 1e11:
+            return value / divisor
+    return None
+
+
+def record_quote(venue: str, top_of_book: Optional[TopOfBook]) -> Optional[TopOfBook]:
+    """Record the feed one-way delay of a freshly received quote in {venue}.quote.one_way_delay and return it."""
+    if top_of_book is not None:
+        delay = top_of_book.one_way_delay()
+        if delay is not None:
+            metrics.histogram(f"{venue}.quote.one_way_delay").observe(delay)
+    return top_of_book
+
+
+class DepthQuote(NamedTuple):
+    """Result of walking one side of a book for a given size."""
+    quantity: Decimal                # requested size
+    available: Decimal               # size fillable within the walked levels (<= quantity)
+    vwap: Optional[Decimal]          # expected average fill price of the available size
+    worst_price: Optional[Decimal]   # last level touched
+    levels: int                      # number of levels touched
+
+    @property
+    def sufficient(self) -> bool:
+        return self.available >= self.quantity
+
+    @property
+    def suggested_slices(self) -> Optional[int]:
+        """Child orders needed if each can only take the currently available depth."""
+        if self.sufficient:
+            return 1
+        if self.available <= 0:
+            return None
+        return math.ceil(self.quantity / self.available)
+
+
+def walk_levels(levels: Iterable[Tuple[Decimal, Decimal]], quantity: Decimal,
+                max_levels: Optional[int] = None) -> DepthQuote:
+    """
+    Walk (price, size) levels ordered from best to worst until quantity is covered.
+
+    Args:
+        levels: Price levels of the side being taken, best first
+        quantity: Size to fill
+        max_levels: Stop after this many levels
+    """
+    quantity = Decimal(str(quantity))
+    remaining = quantity
+    notional = Decimal(0)
+    worst_price = None
+    touched = 0
+
+    for price, size in levels:
+        if remaining <= 0 or (max_levels is not None and touched >= max_levels):
+            break
+        price, size = Decimal(str(price)), Decimal(str(size))
+        take = min(size, remaining)
+        notional += take * price
+        remaining -= take
+        worst_price = price
+        touched += 1
+
+    available = quantity - remaining
+    vwap = notional / available if available > 0 else None
+    return DepthQuote(quantity=quantity, available=available, vwap=vwap, worst_price=worst_price, levels=touched)
+
+
+class L2Book:
+    """Small price-level book maintained from snapshot/delta depth streams."""
+
+    def __init__(self):
+        self.bids: Dict[Decimal, Decimal] = {}
+        self.asks: Dict[Decimal, Decimal] = {}
+
+    @staticmethod
+    def _apply(side: Dict[Decimal, Decimal], levels: Iterable[Tuple[str, str]]) -> None:
+        for price, size in levels:
+            price, size = Decimal(str(price)), Decimal(str(size))
+            if size == 0:
+                side.pop(price, None)
+            else:
+                side[price] = size
+
+    def apply_snapshot(self, bids: Iterable[Tuple[str, str]], asks: Iterable[Tuple[str, str]]) -> None:
+        """Replace the book with a snapshot of (price, size) levels."""
+        self.bids.clear()
+        self.asks.clear()
+        self.apply_delta(bids, asks)
+
+    def apply_delta(self, bids: Iterable[Tuple[str, str]], asks: Iterable[Tuple[str, str]]) -> None:
+        """Apply (price, size) level changes; size 0 removes the level."""
+        self._apply(self.bids, bids)
+        self._apply(self.asks, asks)
+
+    def clear(self) -> None:
+        self.bids.clear()
+        self.asks.clear()
+
+    def walk(self, side: str, quantity: Decimal) -> DepthQuote:
+        """Walk the side a taker of `side` ('buy' takes asks, 'sell' takes bids) would consume."""
+        if side == 'buy':
+            levels = sorted(self.asks.items())
+        else:
+            levels = sorted(self.bids.items(), reverse=True)
+        return walk_levels(levels, quantity)
+
+    def top_of_book(self, exchange_timestamp: Optional[float] = None) -> Optional[TopOfBook]:
+        """Best bid/ask of the current book, or None if a side is empty."""
+        if not self.bids or not self.asks:
+            return None
+        best_bid = max(self.bids)
+        best_ask = min(self.asks)
+        return TopOfBook(
+            best_bid=best_bid,
+            best_ask=best_ask,
+            bid_size=self.bids[best_bid],
+            ask_size=self.asks[best_ask],
+            exchange_timestamp=exchange_timestamp,
+        )
@@ -4,21 +4,37 @@ Simplified Paradex exchange client implementation - L2 credentials only.
 
 import os
 import asyncio
+import functools
 import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
 
 from .base import BaseExchangeClient, OrderResult, OrderInfo
+from .maker_engine import MakerOrderEngine
+from .market_data import TopOfBook, exchange_time, record_quote
 from helpers.logger import TradingLogger
+from helpers.metrics import metrics
+
+
+def _endpoint_name(http_method: str, url: str) -> str:
+    """Metric name for an endpoint, with IDs collapsed, e.g. 'DELETE /v1/orders/{id}'."""
+    segments = [
+        '{id}' if segment.isdigit() or len(segment) > 16 else segment
+        for segment in urlparse(url).path.split('/')
+    ]
+    return f"{http_method} {'/'.join(segments)}"
 
 
 def patch_paradex_http_client():
-    """Patch Paradex SDK HttpClient to suppress unwanted print statements."""
+    """Patch Paradex SDK HttpClient to suppress unwanted print statements and record per-endpoint latency."""
     try:
         from paradex_py.api.http_client import HttpClient
 
         def patched_request(self, url, http_method, params=None, payload=None, headers=None):
+            start_time = time.perf_counter()
             res = self.client.request(
                 method=http_method.value,
                 url=url,
@@ -26,6 +42,9 @@ def patch_paradex_http_client():
                 json=payload,
                 headers=headers,
             )
+            metrics.histogram(f"paradex.http.latency.{_endpoint_name(http_method.value, url)}").observe(
+                time.perf_counter() - start_time
+            )
             if res.status_code >= 300:
                 from paradex_py.api.models import ApiErrorSchema
                 error = ApiErrorSchema().loads(res.text)
@@ -49,6 +68,9 @@ def patch_paradex_http_client():
 class ParadexClient(BaseExchangeClient):
     """Simplified Paradex exchange client - L2 credentials only."""
 
+    supports_amend = True
+    supports_taker = True
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize Paradex client with L2 credentials only."""
         # Import paradex_py modules only when this class is instantiated
@@ -107,6 +129,16 @@ class ParadexClient(BaseExchangeClient):
         self._order_update_handler = None
         self.order_size_increment = ''
 
+        # The SDK's HTTP client is synchronous; run it on a dedicated pool so REST calls never block the event loop.
+        # The SDK keeps a single httpx client, so connections are reused across these threads.
+        # Created on first use so the client can connect again after disconnect() shut it down
+        self._api_executor: Optional[ThreadPoolExecutor] = None
+
+        # Best bid/ask from the BBO WebSocket channel
+        self.top_of_book: Optional[TopOfBook] = None
+
+        self.maker_engine = MakerOrderEngine(self, 'paradex', guard_active_orders=True)
+
     def _initialize_paradex_client(self) -> None:
         """Initialize the Paradex client with L2 credentials only."""
         try:
@@ -132,6 +164,13 @@ class ParadexClient(BaseExchangeClient):
         except Exception as e:
             raise ValueError(f"Failed to initialize Paradex client: {e}")
 
+    async def _run_api(self, fn, *args, **kwargs):
+        """Run a synchronous SDK call on the API executor."""
+        if self._api_executor is None:
+            self._api_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='paradex-api')
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._api_executor, functools.partial(fn, *args, **kwargs))
+
     def _validate_config(self) -> None:
         """Validate Paradex configuration."""
         if not self.l2_private_key_hex:
@@ -152,12 +191,20 @@ class ParadexClient(BaseExchangeClient):
         # Setup WebSocket subscription for order updates if handler is set
         await self._setup_websocket_subscription()
 
+        # Subscribe to best bid/ask updates
+        await self._setup_bbo_subscription()
+
     async def disconnect(self) -> None:
         """Disconnect from Paradex."""
         try:
             if hasattr(self, 'paradex') and self.paradex:
                 await self.paradex.ws_client._close_connection()
                 self._ws_connected = False
+                self.top_of_book = None
+
+            if self._api_executor is not None:
+                self._api_executor.shutdown(wait=False)
+                self._api_executor = None
         except Exception as e:
             self.logger.log(f"Error during Paradex disconnect: {e}", "ERROR")
 
@@ -209,6 +256,8 @@ class ParadexClient(BaseExchangeClient):
                         mapped_status = "PARTIALLY_FILLED"
 
                     if mapped_status in ['OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED']:
+                        self._notify_fill_listeners(order_id, side, filled_size)
+                        self._notify_account_listeners()
                         if self._order_update_handler:
                             self._order_update_handler({
                                 'order_id': order_id,
@@ -254,6 +303,41 @@ class ParadexClient(BaseExchangeClient):
         except Exception as e:
             self.logger.log(f"Failed to subscribe to order updates: {e}", "ERROR")
 
+    async def _setup_bbo_subscription(self) -> None:
+        """Setup WebSocket subscription for best bid/ask updates."""
+        from paradex_py.api.ws_client import ParadexWebsocketChannel
+
+        async def bbo_handler(ws_channel, message):
+            """Handle BBO updates from WebSocket."""
+            data = message.get("params", {}).get("data", {})
+            if data.get("market") != self.config.contract_id:
+                return
+            if not data.get("bid") or not data.get("ask"):
+                return
+
+            self.top_of_book = record_quote("paradex", TopOfBook(
+                best_bid=Decimal(data["bid"]),
+                best_ask=Decimal(data["ask"]),
+                bid_size=Decimal(data.get("bid_size") or "0"),
+                ask_size=Decimal(data.get("ask_size") or "0"),
+                exchange_timestamp=exchange_time(data.get("last_updated_at"))
+            ))
+
+        contract_id = self.config.contract_id
+        try:
+            await self.paradex.ws_client.subscribe(
+                ParadexWebsocketChannel.BBO,
+                callback=bbo_handler,
+                params={"market": contract_id}
+            )
+            self.logger.log(f"Subscribed to BBO updates for {contract_id}", "INFO")
+        except Exception as e:
+            self.logger.log(f"Failed to subscribe to BBO updates: {e}", "ERROR")
+
+    def get_cached_top_of_book(self) -> Optional[TopOfBook]:
+        """Latest top of book from the BBO stream."""
+        return self.top_of_book
+
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_fixed(3),
@@ -261,8 +345,12 @@ class ParadexClient(BaseExchangeClient):
         reraise=True
     )
     async def fetch_bbo_prices(self, contract_id: str) -> Dict[str, Any]:
-        """Get orderbook using official SDK."""
-        orderbook_data = self.paradex.api_client.fetch_orderbook(contract_id, {"depth": 1})
+        """Get best bid/ask from a fresh WebSocket BBO quote, falling back to the official SDK."""
+        top_of_book = self.get_fresh_top_of_book()
+        if top_of_book:
+            return top_of_book.best_bid, top_of_book.best_ask
+
+        orderbook_data = await self._run_api(self.paradex.api_client.fetch_orderbook, contract_id, {"depth": 1})
         if not orderbook_data:
             self.logger.log("Failed to get orderbook", "ERROR")
             raise ValueError("Failed to get orderbook")
@@ -312,10 +400,10 @@ class ParadexClient(BaseExchangeClient):
         retry=retry_if_exception_type(Exception),
         reraise=True
     )
-    def _submit_order_with_retry(self, order) -> OrderResult:
+    async def _submit_order_with_retry(self, order) -> OrderResult:
         """Submit an order with Paradex using official SDK."""
         # Submit order using official SDK
-        order_result = self.paradex.api_client.submit_order(order)
+        order_result = await self._run_api(self.paradex.api_client.submit_order, order)
 
         # Extract order ID from response
         order_id = order_result.get('id')
@@ -338,7 +426,7 @@ class ParadexClient(BaseExchangeClient):
             instruction="POST_ONLY"
         )
 
-        order_result = self._submit_order_with_retry(order)
+        order_result = await self._submit_order_with_retry(order)
 
         order_id = order_result.get('id')
         order_status = order_result.get('status')
@@ -358,156 +446,129 @@ class ParadexClient(BaseExchangeClient):
         else:
             return order_info
 
-    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
-        """Place an open order with Paradex using official SDK."""
-        attempt = 0
+    async def _submit_post_only_order(self, contract_id: str, quantity: Decimal, price: Decimal,
+                                      side: str) -> OrderResult:
+        """Submit a single post-only order with Paradex and map its final status for the maker engine."""
         from paradex_py.common.order import OrderSide
-        while True:
-            attempt += 1
-            if attempt % 5 == 0:
-                self.logger.log(f"[OPEN] Attempt {attempt} to place order", "INFO")
-                active_orders = await self.get_active_orders(contract_id)
-                active_open_orders = 0
-                for order in active_orders:
-                    if order.side == self.config.direction:
-                        active_open_orders += 1
-                if active_open_orders > 1:
-                    self.logger.log(f"[OPEN] ERROR: Active open orders abnormal: {active_open_orders}", "ERROR")
-                    raise Exception(f"[OPEN] ERROR: Active open orders abnormal: {active_open_orders}")
-
-            if direction == 'buy':
-                order_side = OrderSide.Buy
-            elif direction == 'sell':
-                order_side = OrderSide.Sell
-            else:
-                raise Exception(f"[OPEN] Invalid direction: {direction}")
-
-            order_price = await self.get_order_price(direction)
-            order_result = await self.place_post_only_order(contract_id, quantity, order_price, order_side)
-            order_status = order_result.status
-            order_id = order_result.order_id
-
-            if order_status == 'CLOSED':
-                remaining_size = order_result.remaining_size
-                cancel_reason = order_result.cancel_reason
-                if remaining_size == 0:
-                    break
-                elif cancel_reason == 'POST_ONLY_WOULD_CROSS':
-                    continue
-                else:
-                    raise Exception(f"[OPEN] [{order_id}] Error placing order: {cancel_reason}")
+        order_side = OrderSide.Buy if side == 'buy' else OrderSide.Sell
+
+        try:
+            order_info = await self.place_post_only_order(contract_id, quantity, price, order_side)
+        except Exception as e:
+            # Submit retries exhausted or order stuck in NEW; do not stack another order on top
+            return OrderResult(success=False, error_message=str(e))
+
+        order_id = order_info.order_id
+        if order_info.status == 'CLOSED':
+            if order_info.remaining_size == 0:
+                status = 'FILLED'
+            elif order_info.cancel_reason == 'POST_ONLY_WOULD_CROSS':
+                return OrderResult(success=False, order_id=order_id, status='REJECTED',
+                                   error_message=order_info.cancel_reason)
             else:
-                break
-
-        if order_status in ['OPEN']:
-            # Order successfully placed
-            return OrderResult(
-                success=True,
-                order_id=order_id,
-                side=direction,
-                size=quantity,
-                price=order_price,
-                status=order_status
-            )
-        elif order_status == 'CLOSED' and remaining_size == 0:
-            return OrderResult(
-                success=True,
-                order_id=order_id,
-                side=direction,
-                size=quantity,
-                price=order_price,
-                status=order_status
-            )
+                return OrderResult(success=False, order_id=order_id,
+                                   error_message=f"[{order_id}] Error placing order: {order_info.cancel_reason}")
         else:
-            raise Exception(f"[OPEN] [{order_id}] Unexpected order status: {order_status}")
+            status = order_info.status
 
-    async def _get_active_close_orders(self, contract_id: str) -> int:
-        """Get active close orders for a contract using official SDK."""
-        active_orders = await self.get_active_orders(contract_id)
-        active_close_orders = 0
-        for order in active_orders:
-            if order.side == self.config.close_order_side:
-                active_close_orders += 1
-        return active_close_orders
+        return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price, status=status)
 
-    async def place_close_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
-        """Place a close order with Paradex using official SDK."""
-        # Get current market prices
-        attempt = 0
-        active_close_orders = await self._get_active_close_orders(contract_id)
-        while True:
-            attempt += 1
-            if attempt % 5 == 0:
-                self.logger.log(f"[CLOSE] Attempt {attempt} to place order", "INFO")
-                current_close_orders = await self._get_active_close_orders(contract_id)
-
-                if current_close_orders - active_close_orders > 1:
-                    self.logger.log(f"[CLOSE] ERROR: Active close orders abnormal: {active_close_orders}, {current_close_orders}", "ERROR")
-                    raise Exception(f"[CLOSE] ERROR: Active close orders abnormal: {active_close_orders}, {current_close_orders}")
-                else:
-                    active_close_orders = current_close_orders
-            # Get current market prices
-            best_bid, best_ask = await self.fetch_bbo_prices(contract_id)
-
-            # Convert side string to OrderSide enum
-            from paradex_py.common.order import OrderSide
-            order_side = OrderSide.Buy if side.lower() == 'buy' else OrderSide.Sell
-
-            # Adjust order price based on market conditions and side
-            if side.lower() == 'sell':
-                # For sell orders, ensure price is above best bid to be a maker order
-                if price <= best_bid:
-                    adjusted_price = best_bid + self.config.tick_size
-                else:
-                    adjusted_price = price
-            elif side.lower() == 'buy':
-                # For buy orders, ensure price is below best ask to be a maker order
-                if price >= best_ask:
-                    adjusted_price = best_ask - self.config.tick_size
-                else:
-                    adjusted_price = price
-
-            adjusted_price = self.round_to_tick(adjusted_price)
-            order_result = await self.place_post_only_order(contract_id, quantity, adjusted_price, order_side)
-            order_status = order_result.status
-            order_id = order_result.order_id
-
-            if order_status == 'CLOSED':
-                remaining_size = order_result.remaining_size
-                cancel_reason = order_result.cancel_reason
-                if remaining_size == 0:
-                    break
-                elif cancel_reason == 'POST_ONLY_WOULD_CROSS':
-                    continue
-                else:
-                    raise Exception(f"[CLOSE] [{order_id}] Error placing order: {cancel_reason}")
-            else:
-                break
+    async def place_taker_order(self, quantity: Decimal, side: str, max_slippage: Decimal) -> OrderResult:
+        """Place an IOC limit order with Paradex and wait until it is closed."""
+        from paradex_py.common.order import Order, OrderType, OrderSide
+
+        best_bid, best_ask = await self.fetch_bbo_prices(self.config.contract_id)
+        if best_bid <= 0 or best_ask <= 0:
+            return OrderResult(success=False, error_message='Invalid bid/ask prices')
+
+        order_price = self.get_taker_limit_price(side, best_bid, best_ask, max_slippage)
+        order = Order(
+            market=self.config.contract_id,
+            order_type=OrderType.Limit,
+            order_side=OrderSide.Buy if side == 'buy' else OrderSide.Sell,
+            size=quantity.quantize(self.order_size_increment, rounding=ROUND_HALF_UP),
+            limit_price=order_price,
+            instruction="IOC"
+        )
+
+        try:
+            order_result = await self._submit_order_with_retry(order)
+        except Exception as e:
+            return OrderResult(success=False, side=side, error_message=str(e))
+        if isinstance(order_result, OrderResult):
+            return order_result
+
+        order_id = order_result.get('id')
+        order_info = await self._wait_for_order_done(order_id)
+        if order_info is None or order_info.status != 'CLOSED':
+            return OrderResult(success=False, order_id=order_id, side=side,
+                               error_message='IOC order not closed after 5 seconds')
+
+        if order_info.filled_size <= 0:
+            return OrderResult(success=False, order_id=order_id, side=side, status='CANCELED',
+                               filled_size=Decimal(0), error_message=f'IOC order not filled: {order_info.cancel_reason}')
 
         return OrderResult(
             success=True,
             order_id=order_id,
             side=side,
             size=quantity,
-            price=adjusted_price,
-            status=order_status
+            price=order_info.avg_fill_price or order_price,
+            status='FILLED' if order_info.remaining_size == 0 else 'PARTIALLY_FILLED',
+            filled_size=order_info.filled_size
         )
 
+    async def place_open_order(self, contract_id: str, quantity: Decimal, direction: str) -> OrderResult:
+        """Place an open order with Paradex using official SDK."""
+        return await self.maker_engine.place(contract_id, quantity, direction)
+
+    async def place_close_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
+        """Place a close order with Paradex using official SDK."""
+        return await self.maker_engine.place(contract_id, quantity, side, price=price)
+
     async def cancel_order(self, order_id: str) -> OrderResult:
         """Cancel an order with Paradex using official SDK."""
         try:
             # Cancel the order using official SDK
-            self.paradex.api_client.cancel_order(order_id)
+            await self._run_api(self.paradex.api_client.cancel_order, order_id)
             return OrderResult(success=True)
 
         except Exception as e:
             return OrderResult(success=False, error_message=str(e))
 
+    async def modify_order(self, order_id: str, price: Decimal, quantity: Decimal, side: str) -> OrderResult:
+        """Amend price and size of a resting order in place with Paradex using official SDK."""
+        from paradex_py.common.order import Order, OrderType, OrderSide
+
+        price = self.round_to_tick(price)
+        order = Order(
+            market=self.config.contract_id,
+            order_type=OrderType.Limit,
+            order_side=OrderSide.Buy if side == 'buy' else OrderSide.Sell,
+            size=quantity.quantize(self.order_size_increment, rounding=ROUND_HALF_UP),
+            limit_price=price,
+            instruction="POST_ONLY"
+        )
+
+        try:
+            order_result = await self._run_api(self.paradex.api_client.modify_order, order_id, order)
+        except Exception as e:
+            return OrderResult(success=False, order_id=order_id, error_message=str(e))
+
+        return OrderResult(
+            success=True,
+            order_id=order_result.get('id', order_id),
+            side=side,
+            size=quantity,
+            price=price,
+            status='OPEN'
+        )
+
     async def get_order_info(self, order_id: str) -> Optional[OrderInfo]:
         """Get order information from Paradex using official SDK."""
         try:
             # Get order by ID using official SDK
-            order_data = self.paradex.api_client.fetch_order(order_id)
+            order_data = await self._run_api(self.paradex.api_client.fetch_order, order_id)
             size = Decimal(order_data.get('size', 0)).quantize(self.order_size_increment, rounding=ROUND_HALF_UP)
             remaining_size = Decimal(order_data.get('remaining_size', 0))
             return OrderInfo(
@@ -518,7 +579,8 @@ class ParadexClient(BaseExchangeClient):
                 status=order_data.get('status', ''),
                 filled_size=size - remaining_size,
                 remaining_size=remaining_size,
-                cancel_reason=order_data.get('cancel_reason', '')
+                cancel_reason=order_data.get('cancel_reason', ''),
+                avg_fill_price=Decimal(order_data['avg_fill_price']) if order_data.get('avg_fill_price') else None
             )
 
         except Exception as e:
@@ -533,7 +595,7 @@ class ParadexClient(BaseExchangeClient):
     )
     async def _fetch_orders_with_retry(self, contract_id: str) -> List[Dict[str, Any]]:
         """Get orders using official SDK."""
-        orders_response = self.paradex.api_client.fetch_orders({"market": contract_id, "status": "OPEN"})
+        orders_response = await self._run_api(self.paradex.api_client.fetch_orders, {"market": contract_id, "status": "OPEN"})
         if not orders_response or 'results' not in orders_response:
             self.logger.log("Failed to get orders", "ERROR")
             raise ValueError("Failed to get orders")
@@ -567,7 +629,7 @@ class ParadexClient(BaseExchangeClient):
     )
     async def _fetch_positions_with_retry(self) -> List[Dict[str, Any]]:
         """Get positions using official SDK."""
-        positions_response = self.paradex.api_client.fetch_positions()
+        positions_response = await self._run_api(self.paradex.api_client.fetch_positions)
         if not positions_response or 'results' not in positions_response:
             self.logger.log("Failed to get positions", "ERROR")
             raise ValueError("Failed to get positions")
@@ -599,7 +661,7 @@ class ParadexClient(BaseExchangeClient):
     )
     async def _fetch_market_with_retry(self, symbol: str) -> Dict[str, Any]:
         """Get market using official SDK."""
-        market_response = self.paradex.api_client.fetch_markets({"market": symbol})
+        market_response = await self._run_api(self.paradex.api_client.fetch_markets, {"market": symbol})
         if not market_response or 'results' not in market_response:
             self.logger.log("Failed to get markets", "ERROR")
             raise ValueError("Failed to get markets")
@@ -620,7 +682,7 @@ class ParadexClient(BaseExchangeClient):
     )
     async def _fetch_markets_summary_with_retry(self, symbol: str) -> Dict[str, Any]:
         """Get markets summary using official SDK."""
-        market_summary_response = self.paradex.api_client.fetch_markets_summary({"market": symbol})
+        market_summary_response = await self._run_api(self.paradex.api_client.fetch_markets_summary, {"market": symbol})
         if not market_summary_response or 'results' not in market_summary_response:
             self.logger.log("Failed to get markets summary", "ERROR")
             raise ValueError("Failed to get markets summary")
@@ -0,0 +1,97 @@
+"""
+持仓计时器 - 用单调时钟记录持仓截止时间。
+
+职责：
+1. 建仓成交时设置截止时间（monotonic，不受系统时间调整影响）
+2. HOLDING阶段精确睡到截止时间，期间不发任何API请求
+3. 为PhaseDetector提供已持仓时间
+"""
+
+import asyncio
+import time
+from typing import Callable, Optional
+
+
+class HoldScheduler:
+    """
+    持仓计时器。
+
+    arm()在建仓成交时调用；wait()睡到截止时间后返回，期间重新arm()或disarm()会立即唤醒。
+    """
+
+    def __init__(self, hold_time: float, clock: Callable[[], float] = time.monotonic):
+        """
+        初始化计时器。
+
+        Args:
+            hold_time: 持仓时间（秒）
+            clock: 单调时钟（测试时可替换）
+        """
+        self.hold_time = hold_time
+        self.clock = clock
+        self._armed_at: Optional[float] = None
+        self._changed: Optional[asyncio.Event] = None
+
+    @property
+    def armed(self) -> bool:
+        """是否已设置截止时间"""
+        return self._armed_at is not None
+
+    def arm(self, elapsed: float = 0.0) -> None:
+        """
+        设置截止时间 = 现在 + hold_time - elapsed。
+
+        Args:
+            elapsed: 最后一笔建仓成交距今的秒数（例如重启后从成交历史恢复）
+        """
+        self._armed_at = self.clock() - max(elapsed, 0.0)
+        self._notify()
+
+    def disarm(self) -> None:
+        """清除截止时间（仓位回到0，开始新一轮）"""
+        self._armed_at = None
+        self._notify()
+
+    def elapsed(self) -> Optional[float]:
+        """已持仓时间（秒），未设置时返回None"""
+        if self._armed_at is None:
+            return None
+        return self.clock() - self._armed_at
+
+    def remaining(self) -> Optional[float]:
+        """距离截止时间的秒数（可能为负），未设置时返回None"""
+        elapsed = self.elapsed()
+        if elapsed is None:
+            return None
+        return self.hold_time - elapsed
+
+    def is_due(self) -> bool:
+        """是否已到截止时间"""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    async def wait(self) -> bool:
+        """
+        睡到截止时间。
+
+        Returns:
+            True 到达截止时间；False 未设置或等待期间被disarm()
+        """
+        while True:
+            remaining = self.remaining()
+            if remaining is None:
+                return False
+            if remaining <= 0:
+                return True
+
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
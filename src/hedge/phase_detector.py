@@ -42,7 +42,8 @@ class PhaseDetector:
         order_size: Decimal,
         hold_time: int,
         last_order_side: Optional[str] = None,
-        last_order_time: Optional[datetime] = None
+        last_order_time: Optional[datetime] = None,
+        hold_elapsed: Optional[float] = None
     ) -> PhaseInfo:
         """
         原子化判断：这一轮该做什么？
@@ -60,6 +61,7 @@ class PhaseDetector:
             hold_time: 持仓时间（秒）
             last_order_side: 最后一笔成交订单的方向（仅用于记录）
             last_order_time: 最后一笔成交订单的时间（用于计算超时）
+            hold_elapsed: 距最后一笔建仓成交的秒数（来自HoldScheduler，提供时优先于last_order_time）
 
         Returns:
             PhaseInfo: 这一轮应该做什么
@@ -68,8 +70,8 @@ class PhaseDetector:
         target_grvt = order_size * target_cycles
 
         # 计算距离最后一笔buy订单的时间
-        time_since_last_build = None
-        if last_order_time:
+        time_since_last_build = hold_elapsed
+        if time_since_last_build is None and last_order_time:
             time_since_last_build = (datetime.utcnow() - last_order_time).total_seconds()
 
         # ========== 判断1: 仓位接近0 → BUILD ==========
@@ -0,0 +1,209 @@
+"""
+组合风控引擎 - 多个对冲交易对的向量化安全检查。
+
+职责：
+1. 用NumPy数组保存所有交易对的仓位、标记价格和限额
+2. 每个tick一次向量化计算名义敞口、单交易所/单币种限额和总体不平衡
+3. 为每个交易对返回SafetyCheckResult，判断规则与SafetyChecker.check_all一致
+4. 不执行任何交易操作，只返回判断结果
+
+数组使用float64：风控判断不需要Decimal精度，换来的是交易对数量增加时计算成本基本不变。
+"""
+
+from decimal import Decimal
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+from hedge.safety_checker import SafetyAction, SafetyCheckResult
+
+
+class HedgePair(NamedTuple):
+    """对冲交易对及其限额（基础资产数量）"""
+    symbol: str
+    exchange_a: str
+    exchange_b: str
+    max_position_per_side: Decimal
+    max_total_position: Decimal
+    max_imbalance: Decimal
+    max_pending_per_side: int = 1
+
+
+class PortfolioRiskResult(NamedTuple):
+    """组合风控结果"""
+    actions: List[SafetyCheckResult]     # 与交易对顺序一致
+    gross_notional: float                 # 所有交易所仓位名义价值绝对值之和（USD）
+    net_notional: float                   # 所有交易对净敞口之和（USD）
+    imbalance_notional: float             # 所有交易对不平衡名义价值之和（USD）
+    venue_gross_notional: Dict[str, float]
+    symbol_net_notional: Dict[str, float]
+
+    @property
+    def breached(self) -> List[int]:
+        """需要操作的交易对下标"""
+        return [i for i, r in enumerate(self.actions) if r.action != SafetyAction.CONTINUE]
+
+
+class PortfolioRiskEngine:
+    """
+    组合风控引擎。
+
+    仓位、标记价格和挂单数通过update_*写入数组，evaluate()对全部交易对做一次向量化检查。
+    """
+
+    def __init__(self, pairs: List[HedgePair]):
+        """
+        初始化引擎。
+
+        Args:
+            pairs: 所有对冲交易对
+        """
+        self.pairs = list(pairs)
+        n = len(self.pairs)
+
+        self.symbols = sorted({p.symbol for p in self.pairs})
+        self.venues = sorted({p.exchange_a for p in self.pairs} | {p.exchange_b for p in self.pairs})
+        symbol_index = {s: i for i, s in enumerate(self.symbols)}
+        venue_index = {v: i for i, v in enumerate(self.venues)}
+
+        self.symbol_idx = np.array([symbol_index[p.symbol] for p in self.pairs], dtype=np.int64)
+        self.venue_a_idx = np.array([venue_index[p.exchange_a] for p in self.pairs], dtype=np.int64)
+        self.venue_b_idx = np.array([venue_index[p.exchange_b] for p in self.pairs], dtype=np.int64)
+
+        # 限额（基础资产数量）
+        self.max_position_per_side = np.array([float(p.max_position_per_side) for p in self.pairs])
+        self.max_total_position = np.array([float(p.max_total_position) for p in self.pairs])
+        self.max_imbalance = np.array([float(p.max_imbalance) for p in self.pairs])
+        self.max_pending_per_side = np.array([p.max_pending_per_side for p in self.pairs], dtype=np.int64)
+
+        # 组合限额（USD名义价值），inf表示不限制
+        self.venue_max_gross_notional = np.full(len(self.venues), np.inf)
+        self.symbol_max_net_notional = np.full(len(self.symbols), np.inf)
+
+        # 实时状态
+        self.position_a = np.zeros(n)
+        self.position_b = np.zeros(n)
+        self.mark_price = np.zeros(n)
+        self.pending_a = np.zeros(n, dtype=np.int64)
+        self.pending_b = np.zeros(n, dtype=np.int64)
+
+    # ---------------------------
+    # 限额
+    # ---------------------------
+
+    def set_venue_limit(self, venue: str, max_gross_notional: Decimal) -> None:
+        """设置单个交易所所有交易对仓位名义价值绝对值之和的上限"""
+        self.venue_max_gross_notional[self.venues.index(venue)] = float(max_gross_notional)
+
+    def set_symbol_limit(self, symbol: str, max_net_notional: Decimal) -> None:
+        """设置单个币种所有交易对净敞口名义价值的上限"""
+        self.symbol_max_net_notional[self.symbols.index(symbol)] = float(max_net_notional)
+
+    # ---------------------------
+    # 状态更新
+    # ---------------------------
+
+    def update_position(self, index: int, exchange_a_position: Decimal, exchange_b_position: Decimal) -> None:
+        """更新一个交易对的两边仓位"""
+        self.position_a[index] = float(exchange_a_position)
+        self.position_b[index] = float(exchange_b_position)
+
+    def update_positions(self, exchange_a_positions, exchange_b_positions) -> None:
+        """批量更新所有交易对的仓位（与pairs顺序一致的序列）"""
+        self.position_a[:] = np.asarray(exchange_a_positions, dtype=np.float64)
+        self.position_b[:] = np.asarray(exchange_b_positions, dtype=np.float64)
+
+    def update_mark_price(self, symbol: str, price: Decimal) -> None:
+        """更新某币种的标记价格（该币种的所有交易对）"""
+        self.mark_price[self.symbol_idx == self.symbols.index(symbol)] = float(price)
+
+    def update_pending_orders(self, index: int, exchange_a_pending: int, exchange_b_pending: int) -> None:
+        """更新一个交易对两边的未成交订单数"""
+        self.pending_a[index] = exchange_a_pending
+        self.pending_b[index] = exchange_b_pending
+
+    # ---------------------------
+    # 检查
+    # ---------------------------
+
+    def evaluate(self) -> PortfolioRiskResult:
+        """
+        对所有交易对执行一次向量化安全检查。
+
+        优先级与SafetyChecker.check_all一致：挂单超限(CANCEL_ALL_ORDERS) > 单边/总仓位超限 >
+        不平衡超限 > 交易所名义敞口超限 > 币种净敞口超限（后四项均为PAUSE）。
+
+        Returns:
+            PortfolioRiskResult
+        """
+        total = self.position_a + self.position_b
+        imbalance = np.abs(total)
+
+        notional_a = np.abs(self.position_a) * self.mark_price
+        notional_b = np.abs(self.position_b) * self.mark_price
+        net_notional = total * self.mark_price
+
+        n_venues = len(self.venues)
+        venue_gross = (np.bincount(self.venue_a_idx, weights=notional_a, minlength=n_venues)
+                       + np.bincount(self.venue_b_idx, weights=notional_b, minlength=n_venues))
+        symbol_net = np.bincount(self.symbol_idx, weights=net_notional, minlength=len(self.symbols))
+
+        venue_breach = venue_gross > self.venue_max_gross_notional
+        symbol_breach = np.abs(symbol_net) > self.symbol_max_net_notional
+
+        # 每项检查一个布尔数组，按优先级从高到低排列
+        checks = [
+            (SafetyAction.CANCEL_ALL_ORDERS, (self.pending_a > self.max_pending_per_side)
+             | (self.pending_b > self.max_pending_per_side)),
+            (SafetyAction.PAUSE, np.abs(self.position_a) > self.max_position_per_side),
+            (SafetyAction.PAUSE, np.abs(self.position_b) > self.max_position_per_side),
+            (SafetyAction.PAUSE, np.abs(total) > self.max_total_position),
+            (SafetyAction.PAUSE, imbalance > self.max_imbalance),
+            (SafetyAction.PAUSE, venue_breach[self.venue_a_idx] | venue_breach[self.venue_b_idx]),
+            (SafetyAction.PAUSE, symbol_breach[self.symbol_idx]),
+        ]
+
+        # 第一个命中的检查下标，未命中为len(checks)
+        hits = np.vstack([mask for _, mask in checks])
+        first_hit = np.where(hits.any(axis=0), hits.argmax(axis=0), len(checks))
+
+        actions = [SafetyCheckResult(action=SafetyAction.CONTINUE)] * len(self.pairs)
+        for i in np.flatnonzero(first_hit < len(checks)):
+            check = int(first_hit[i])
+            actions[i] = SafetyCheckResult(
+                action=checks[check][0],
+                reason=self._reason(int(i), check, venue_gross, symbol_net)
+            )
+
+        return PortfolioRiskResult(
+            actions=actions,
+            gross_notional=float(notional_a.sum() + notional_b.sum()),
+            net_notional=float(net_notional.sum()),
+            imbalance_notional=float((imbalance * self.mark_price).sum()),
+            venue_gross_notional={v: float(venue_gross[i]) for i, v in enumerate(self.venues)},
+            symbol_net_notional={s: float(symbol_net[i]) for i, s in enumerate(self.symbols)}
+        )
+
+    def _reason(self, i: int, check: int, venue_gross: np.ndarray, symbol_net: np.ndarray) -> str:
+        """只为超限的交易对生成原因文本"""
+        pair = self.pairs[i]
+        prefix = f"[{pair.symbol} {pair.exchange_a}/{pair.exchange_b}]"
+        if check == 0:
+            return (f"{prefix} pending orders {self.pending_a[i]}/{self.pending_b[i]} "
+                    f"exceeds limit {self.max_pending_per_side[i]}")
+        if check == 1:
+            return f"{prefix} {pair.exchange_a} position {self.position_a[i]} exceeds limit {self.max_position_per_side[i]}"
+        if check == 2:
+            return f"{prefix} {pair.exchange_b} position {self.position_b[i]} exceeds limit {self.max_position_per_side[i]}"
+        if check == 3:
+            total = self.position_a[i] + self.position_b[i]
+            return f"{prefix} total position {total} exceeds limit {self.max_total_position[i]}"
+        if check == 4:
+            imbalance = abs(self.position_a[i] + self.position_b[i])
+            return f"{prefix} imbalance {imbalance} exceeds limit {self.max_imbalance[i]}"
+        if check == 5:
+            breached = [v for v in (pair.exchange_a, pair.exchange_b)
+                        if venue_gross[self.venues.index(v)] > self.venue_max_gross_notional[self.venues.index(v)]]
+            return f"{prefix} venue gross notional exceeds limit on {', '.join(breached)}"
+        s = self.symbols.index(pair.symbol)
+        return f"{prefix} {pair.symbol} net notional {symbol_net[s]:.2f} exceeds limit {self.symbol_max_net_notional[s]:.2f}"
@@ -0,0 +1,135 @@
+"""
+仓位账本 - 从一次REST快照开始，用WebSocket成交事件增量更新仓位。
+
+职责：
+1. seed()用REST仓位初始化
+2. on_fill()按订单累计成交量的增量更新仓位（重复/乱序推送不会重复计算）
+3. reconcile()用REST仓位校正漂移，并把漂移量记录为指标；REST请求发出后又收到成交推送时推迟校正
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Optional
+
+from helpers.metrics import metrics
+
+
+class PositionLedger:
+    """
+    单个交易所的仓位账本。
+
+    成交回调可能来自交易所SDK的线程，所有状态修改都在锁内完成。
+    账本建立前已部分成交的订单，之后的推送会把建立前的成交也计入，由下一次reconcile()校正。
+    REST快照可能还不包含请求发出后推送的成交，调用方在请求前记下fill_seq，reconcile()据此判断快照是否过期。
+    """
+
+    def __init__(self, venue: str, max_tracked_orders: int = 1000):
+        """
+        初始化账本。
+
+        Args:
+            venue: 交易所名称，用作指标前缀
+            max_tracked_orders: 记录累计成交量的最近订单数
+        """
+        self.venue = venue
+        self.max_tracked_orders = max_tracked_orders
+
+        self._position: Optional[Decimal] = None
+        # order_id -> 已计入的累计成交量
+        self._order_fills: "OrderedDict[str, Decimal]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.last_reconcile_time: Optional[float] = None
+        self.last_fill_time: Optional[float] = None
+        # 已计入仓位的成交推送序号，每计入一次加1
+        self._fill_seq = 0
+
+        self.fills = metrics.counter(f"{venue}.ledger.fills")
+        self.reconciles = metrics.counter(f"{venue}.ledger.reconciles")
+        self.drift_events = metrics.counter(f"{venue}.ledger.drift_events")
+        self.deferred_reconciles = metrics.counter(f"{venue}.ledger.deferred_reconciles")
+        self.drift = metrics.gauge(f"{venue}.ledger.drift")
+
+    @property
+    def is_ready(self) -> bool:
+        """是否已用REST快照初始化"""
+        return self._position is not None
+
+    @property
+    def position(self) -> Optional[Decimal]:
+        """当前仓位，未初始化时为None"""
+        return self._position
+
+    @property
+    def fill_seq(self) -> int:
+        """成交推送序号，发REST仓位请求前记下，传给reconcile()"""
+        return self._fill_seq
+
+    def seed(self, position: Decimal) -> None:
+        """用REST快照初始化仓位"""
+        with self._lock:
+            self._position = Decimal(position)
+            self.last_reconcile_time = time.time()
+
+    def on_fill(self, order_id: str, side: str, filled_size: Decimal) -> None:
+        """
+        订单成交推送回调。
+
+        Args:
+            order_id: 订单ID
+            side: 'buy' / 'sell'
+            filled_size: 该订单的累计成交量
+        """
+        with self._lock:
+            order_id = str(order_id)
+            delta = Decimal(filled_size) - self._order_fills.get(order_id, Decimal(0))
+            if delta <= 0:
+                return
+
+            self._order_fills[order_id] = Decimal(filled_size)
+            self._order_fills.move_to_end(order_id)
+            while len(self._order_fills) > self.max_tracked_orders:
+                self._order_fills.popitem(last=False)
+
+            if self._position is None:
+                return
+            self._position += delta if side == 'buy' else -delta
+            self._fill_seq += 1
+            self.last_fill_time = time.time()
+            self.fills.inc()
+
+    def needs_reconcile(self, interval: float) -> bool:
+        """是否需要用REST校正"""
+        if self.last_reconcile_time is None:
+            return True
+        return time.time() - self.last_reconcile_time >= interval
+
+    def reconcile(self, rest_position: Decimal, fill_seq: Optional[int] = None) -> Optional[Decimal]:
+        """
+        用REST仓位校正账本。
+
+        REST请求发出后账本又计入了成交时，快照可能不包含这些成交，直接覆盖会把它们抹掉且不会再补回，
+        此时不校正，等下一次对账。
+
+        Args:
+            rest_position: REST返回的仓位
+            fill_seq: 发出REST请求前的fill_seq；不传则总是校正
+
+        Returns:
+            漂移量（REST - 账本），未初始化时为0；推迟校正时为None
+        """
+        with self._lock:
+            if fill_seq is not None and self._position is not None and self._fill_seq != fill_seq:
+                self.deferred_reconciles.inc()
+                return None
+            rest_position = Decimal(rest_position)
+            drift = rest_position - self._position if self._position is not None else Decimal(0)
+            self._position = rest_position
+            self.last_reconcile_time = time.time()
+
+        self.reconciles.inc()
+        self.drift.set(float(drift))
+        if drift != 0:
+            self.drift_events.inc()
+        return drift
@@ -8,7 +8,7 @@
 
 from decimal import Decimal
 from enum import Enum
-from typing import NamedTuple
+from typing import List, NamedTuple, Optional
 
 from hedge.safety_checker import PositionState
 
@@ -27,6 +27,27 @@ class TradeInstruction(NamedTuple):
     action: TradeAction
     quantity: Decimal
     reason: str
+    venue: str = "exchange_b"      # 再平衡子订单的执行交易所：exchange_a / exchange_b
+
+
+class VenueStats(NamedTuple):
+    """交易所实时指标，用于再平衡路由"""
+    venue: str                      # exchange_a / exchange_b
+    rtt: Optional[float]            # 最近下单往返时间（秒），未知为None
+    depth: Optional[Decimal]        # 可接受滑点内的可成交深度，未知为None
+    taker_fee: Decimal              # taker费率（比例，0.0002 = 2bps）
+    can_take: bool = True           # 是否支持taker单
+
+
+class RebalancePlan(NamedTuple):
+    """再平衡计划：一次性覆盖全部不平衡的子订单列表"""
+    slices: List[TradeInstruction]
+    total_quantity: Decimal
+    reason: str
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.slices
 
 
 class Rebalancer:
@@ -88,3 +109,120 @@ class Rebalancer:
                 quantity=min(order_size, abs(diff)),
                 reason=f"Rebalancing: Lighter sell to increase short (total={current_total} -> {target_total_position})"
             )
+
+    @staticmethod
+    def plan_rebalance(
+        current_position: PositionState,
+        target_total_position: Decimal,
+        order_size: Decimal,
+        tolerance: Decimal = Decimal("0.01"),
+        available_depth: Optional[Decimal] = None,
+        max_slices: int = 20
+    ) -> RebalancePlan:
+        """
+        计算覆盖全部不平衡的再平衡计划（拆分为多个子订单）。
+
+        与calculate_rebalance的区别：不再每轮只处理一个order_size，
+        而是一次给出全部子订单，由执行器并发或连续提交。
+
+        子订单大小 = min(order_size, available_depth)，available_depth为对冲交易所
+        在可接受滑点内的挂单量（未知时传None）。
+
+        Args:
+            current_position: 当前仓位状态
+            target_total_position: 目标总仓位（通常是0）
+            order_size: 单个子订单的最大数量
+            tolerance: 允许的偏差范围
+            available_depth: 可接受滑点内的盘口深度（可选）
+            max_slices: 子订单数量上限
+
+        Returns:
+            RebalancePlan: 再平衡计划（平衡时slices为空）
+        """
+        current_total = current_position.total_position
+        diff = target_total_position - current_total
+
+        if abs(diff) < tolerance:
+            return RebalancePlan(
+                slices=[],
+                total_quantity=Decimal(0),
+                reason=f"Position balanced: total={current_total}, target={target_total_position}"
+            )
+
+        slice_size = order_size
+        if available_depth is not None and 0 < available_depth < slice_size:
+            slice_size = available_depth
+
+        if diff > 0:
+            action = TradeAction.CLOSE_SHORT  # Lighter买入，减少空头仓位
+            reason = f"Rebalancing: Lighter buy to reduce short (total={current_total} -> {target_total_position})"
+        else:
+            action = TradeAction.BUILD_SHORT  # Lighter卖出，增加空头仓位
+            reason = f"Rebalancing: Lighter sell to increase short (total={current_total} -> {target_total_position})"
+
+        remaining = abs(diff)
+        slices = []
+        while remaining > 0 and len(slices) < max_slices:
+            quantity = min(slice_size, remaining)
+            slices.append(TradeInstruction(action=action, quantity=quantity, reason=reason))
+            remaining -= quantity
+
+        return RebalancePlan(
+            slices=slices,
+            total_quantity=abs(diff) - remaining,
+            reason=f"{reason}, {len(slices)} slices of <= {slice_size}"
+        )
+
+    @staticmethod
+    def score_venue(stats: VenueStats, rtt_cost: Decimal, default_rtt: float = 1.0) -> Decimal:
+        """
+        交易所成本评分（越低越好）：taker费率 + RTT折算成本。
+
+        Args:
+            stats: 交易所指标
+            rtt_cost: 每秒RTT折算的成本（比例）
+            default_rtt: RTT未知时使用的值（秒）
+        """
+        rtt = stats.rtt if stats.rtt is not None else default_rtt
+        return stats.taker_fee + Decimal(str(rtt)) * rtt_cost
+
+    @staticmethod
+    def route_plan(
+        plan: RebalancePlan,
+        venues: List[VenueStats],
+        rtt_cost: Decimal = Decimal("0.0005"),
+        default_venue: str = "exchange_b"
+    ) -> RebalancePlan:
+        """
+        为每个子订单选择成本最低且深度足够的交易所。
+
+        逐个子订单贪心分配：深度已知的交易所分配后扣减剩余深度，
+        深度不足或不支持taker单的交易所不参与；都不满足时使用default_venue。
+
+        Args:
+            plan: 再平衡计划
+            venues: 各交易所指标
+            rtt_cost: 每秒RTT折算的成本（比例）
+            default_venue: 没有合适交易所时的默认交易所
+
+        Returns:
+            RebalancePlan: 子订单带venue的计划
+        """
+        remaining_depth = {v.venue: v.depth for v in venues}
+        ranked = sorted((v for v in venues if v.can_take), key=lambda v: Rebalancer.score_venue(v, rtt_cost))
+
+        slices = []
+        for instruction in plan.slices:
+            venue = default_venue
+            for stats in ranked:
+                depth = remaining_depth[stats.venue]
+                if depth is None or depth >= instruction.quantity:
+                    venue = stats.venue
+                    if depth is not None:
+                        remaining_depth[stats.venue] = depth - instruction.quantity
+                    break
+            slices.append(instruction._replace(venue=venue))
+
+        counts = {v: sum(1 for s in slices if s.venue == v) for v in {s.venue for s in slices}}
+        routing = ", ".join(f"{v}={n}" for v, n in sorted(counts.items()))
+        return plan._replace(slices=slices, reason=f"{plan.reason}, routed {routing}")
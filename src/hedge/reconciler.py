@@ -0,0 +1,149 @@
+"""
+后台对账 - 定期用REST校验WebSocket缓存的仓位和挂单。
+
+职责：
+1. 每个交易所一个低优先级任务，按固定间隔对比缓存与REST（get_account_positions / get_active_orders）
+2. 发现偏差时以REST为准修复缓存（仓位账本、客户端订单缓存）
+3. 导出偏差次数和距上次无偏差对账的时间，热路径可以放心只读内存
+"""
+
+import asyncio
+import logging
+import time
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+from helpers.metrics import metrics
+
+
+class ReconcileResult(NamedTuple):
+    """一次对账结果"""
+    position_drift: Decimal = Decimal(0)    # REST - 缓存
+    missing_orders: int = 0                 # REST有、缓存没有的挂单
+    stale_orders: int = 0                   # 缓存有、REST已没有的挂单
+
+    @property
+    def clean(self) -> bool:
+        return self.position_drift == 0 and self.missing_orders == 0 and self.stale_orders == 0
+
+
+class AccountReconciler:
+    """
+    单个交易所的后台对账任务。
+
+    仓位缓存优先使用仓位账本（ledger），其次是客户端自己的缓存；客户端没有缓存的部分跳过对比。
+    REST读取本身会刷新客户端缓存（expire_account_cache后get_*走REST并写回缓存），账本由reconcile()校正。
+    """
+
+    def __init__(self, client, venue: str, ledger=None, interval: float = 10.0, logger=None):
+        """
+        初始化对账任务。
+
+        Args:
+            client: 交易所客户端
+            venue: 交易所名称，用作指标前缀
+            ledger: 该交易所的PositionLedger（可选）
+            interval: 对账间隔（秒）
+            logger: 日志记录器
+        """
+        self.client = client
+        self.venue = venue
+        self.ledger = ledger
+        self.interval = interval
+        self.logger = logger or logging.getLogger(__name__)
+        self._running = False
+
+        self.runs = metrics.counter(f"{venue}.reconcile.runs")
+        self.position_drifts = metrics.counter(f"{venue}.reconcile.position_drifts")
+        self.order_drifts = metrics.counter(f"{venue}.reconcile.order_drifts")
+        self.errors = metrics.counter(f"{venue}.reconcile.errors")
+        self.last_clean = metrics.gauge(f"{venue}.reconcile.last_clean_time")
+
+    def seconds_since_clean(self) -> Optional[float]:
+        """距上次无偏差对账的秒数，从未无偏差时返回None"""
+        if self.last_clean.value is None:
+            return None
+        return time.time() - self.last_clean.value
+
+    async def reconcile_once(self) -> ReconcileResult:
+        """
+        执行一次对账并修复缓存。
+
+        Returns:
+            ReconcileResult
+        """
+        # 先取缓存快照，再读REST
+        fill_seq = None
+        if self.ledger is not None and self.ledger.is_ready:
+            cached_position = self.ledger.position
+            fill_seq = self.ledger.fill_seq
+        else:
+            cached_position = self.client.get_cached_position()
+        cached_orders = self.client.get_cached_open_orders()
+
+        self.client.expire_account_cache()
+        rest_position = await self.client.get_account_positions()
+        rest_orders = await self.client.get_active_orders(self.client.config.contract_id)
+        self.runs.inc()
+
+        # 仓位
+        position_drift = Decimal(0)
+        deferred = False
+        if self.ledger is not None and self.ledger.is_ready:
+            drift = self.ledger.reconcile(rest_position, fill_seq)
+            # REST读取期间收到成交推送：快照可能已过期，本次不校正仓位
+            deferred = drift is None
+            position_drift = drift if drift is not None else Decimal(0)
+        elif cached_position is not None:
+            position_drift = Decimal(rest_position) - Decimal(cached_position)
+        if self.ledger is not None and not self.ledger.is_ready:
+            self.ledger.seed(rest_position)
+
+        # 挂单（REST读取期间新下/刚成交的订单也会计入，偶发的单次偏差可以忽略）
+        missing_orders = stale_orders = 0
+        if cached_orders is not None:
+            cached_ids = {str(order.order_id) for order in cached_orders}
+            rest_ids = {str(order.order_id) for order in rest_orders}
+            missing_orders = len(rest_ids - cached_ids)
+            stale_orders = len(cached_ids - rest_ids)
+
+        result = ReconcileResult(position_drift, missing_orders, stale_orders)
+        if position_drift != 0:
+            self.position_drifts.inc()
+        if missing_orders or stale_orders:
+            self.order_drifts.inc()
+
+        if result.clean:
+            if not deferred:
+                self.last_clean.set(time.time())
+        else:
+            self.logger.warning(f"{self.venue} reconcile drift: position {position_drift}, "
+                                f"orders missing {missing_orders}, stale {stale_orders} (repaired from REST)")
+        return result
+
+    def stop(self) -> None:
+        """停止对账任务"""
+        self._running = False
+
+    async def run(self):
+        """对账任务主循环，作为独立task运行"""
+        self._running = True
+        while self._running:
+            await asyncio.sleep(self.interval)
+            if not self._running:
+                break
+            try:
+                await self.reconcile_once()
+            except Exception as e:
+                self.errors.inc()
+                self.logger.error(f"{self.venue} reconcile failed: {e}")
+
+    def get_stats(self) -> dict:
+        """偏差次数和距上次无偏差对账的时间"""
+        return {
+            'runs': self.runs.value,
+            'position_drifts': self.position_drifts.value,
+            'order_drifts': self.order_drifts.value,
+            'errors': self.errors.value,
+            'seconds_since_clean': self.seconds_since_clean(),
+        }
@@ -4,7 +4,9 @@
 职责：
 1. 检查仓位是否在安全范围内
 2. 检查两边对冲是否平衡
-3. 不执行任何交易操作，只返回判断结果
+3. 按标记价格检查名义价值限额，按保证金使用率检查账户风险
+4. 通过PortfolioRiskEngine检查组合级限额（交易所名义敞口、币种净敞口）
+5. 不执行任何交易操作，只返回判断结果
 """
 
 from decimal import Decimal
@@ -39,6 +41,21 @@ class PositionState(NamedTuple):
         return abs(self.total_position)
 
 
+class MarketState(NamedTuple):
+    """从WebSocket缓存读取的标记价格和保证金使用率，None表示不可用"""
+    exchange_a_mark_price: Optional[Decimal] = None
+    exchange_b_mark_price: Optional[Decimal] = None
+    exchange_a_margin_utilization: Optional[Decimal] = None
+    exchange_b_margin_utilization: Optional[Decimal] = None
+
+    @property
+    def mark_price(self) -> Optional[Decimal]:
+        """用于不平衡估值的标记价格：优先交易所A"""
+        if self.exchange_a_mark_price is not None:
+            return self.exchange_a_mark_price
+        return self.exchange_b_mark_price
+
+
 class SafetyAction(Enum):
     """安全检查后需要的操作"""
     CONTINUE = "CONTINUE"                    # 安全，继续执行
@@ -172,6 +189,115 @@ class SafetyChecker:
 
         return SafetyCheckResult(action=SafetyAction.CONTINUE)
 
+    @staticmethod
+    def check_notional_limits(
+        position: PositionState,
+        market: MarketState,
+        max_notional_per_side: Optional[Decimal] = None,
+        max_imbalance_notional: Optional[Decimal] = None
+    ) -> SafetyCheckResult:
+        """
+        按标记价格检查名义价值（USD）限额。缺少标记价格的一边跳过检查。
+
+        Args:
+            position: 当前仓位状态
+            market: 缓存的标记价格
+            max_notional_per_side: 单边最大名义价值
+            max_imbalance_notional: 不平衡部分的最大名义价值
+
+        Returns:
+            SafetyCheckResult
+        """
+        if max_notional_per_side is not None:
+            sides = (
+                ("Exchange A", position.exchange_a_position, market.exchange_a_mark_price),
+                ("Exchange B", position.exchange_b_position, market.exchange_b_mark_price),
+            )
+            for name, side_position, mark_price in sides:
+                if mark_price is None:
+                    continue
+                notional = abs(side_position) * mark_price
+                if notional > max_notional_per_side:
+                    return SafetyCheckResult(
+                        action=SafetyAction.PAUSE,
+                        reason=f"{name} notional ${notional:.2f} exceeds limit ${max_notional_per_side}"
+                    )
+
+        if max_imbalance_notional is not None and market.mark_price is not None:
+            imbalance_notional = position.imbalance * market.mark_price
+            if imbalance_notional > max_imbalance_notional:
+                return SafetyCheckResult(
+                    action=SafetyAction.PAUSE,
+                    reason=f"Imbalance notional ${imbalance_notional:.2f} exceeds limit ${max_imbalance_notional}"
+                )
+
+        return SafetyCheckResult(action=SafetyAction.CONTINUE)
+
+    @staticmethod
+    def check_margin(
+        market: MarketState,
+        max_margin_utilization: Decimal
+    ) -> SafetyCheckResult:
+        """
+        检查保证金使用率。没有保证金数据的交易所跳过检查。
+
+        Args:
+            market: 缓存的保证金使用率
+            max_margin_utilization: 最大保证金使用率（比例，0.8 = 80%）
+
+        Returns:
+            SafetyCheckResult
+        """
+        sides = (
+            ("Exchange A", market.exchange_a_margin_utilization),
+            ("Exchange B", market.exchange_b_margin_utilization),
+        )
+        for name, utilization in sides:
+            if utilization is not None and utilization > max_margin_utilization:
+                return SafetyCheckResult(
+                    action=SafetyAction.PAUSE,
+                    reason=f"{name} margin utilization {utilization:.1%} exceeds limit {max_margin_utilization:.1%}"
+                )
+
+        return SafetyCheckResult(action=SafetyAction.CONTINUE)
+
+    @staticmethod
+    def check_portfolio(
+        portfolio,
+        position: PositionState,
+        market: Optional[MarketState] = None,
+        pending_orders: Optional[PendingOrdersInfo] = None,
+        pair_index: int = 0
+    ) -> SafetyCheckResult:
+        """
+        组合风控检查：把本交易对的最新状态写入PortfolioRiskEngine，对所有交易对做一次向量化检查。
+
+        Args:
+            portfolio: PortfolioRiskEngine
+            position: 本交易对当前仓位状态
+            market: 缓存的标记价格（可选，没有时沿用引擎中上一次的价格）
+            pending_orders: 本交易对未成交订单信息（可选）
+            pair_index: 本交易对在引擎pairs中的下标
+
+        Returns:
+            SafetyCheckResult: 任一交易对超限时返回PAUSE
+        """
+        portfolio.update_position(pair_index, position.exchange_a_position, position.exchange_b_position)
+        if market is not None and market.mark_price is not None:
+            portfolio.update_mark_price(portfolio.pairs[pair_index].symbol, market.mark_price)
+        if pending_orders is not None:
+            portfolio.update_pending_orders(pair_index, pending_orders.exchange_a_pending_count,
+                                            pending_orders.exchange_b_pending_count)
+
+        result = portfolio.evaluate()
+        if not result.breached:
+            return SafetyCheckResult(action=SafetyAction.CONTINUE)
+
+        return SafetyCheckResult(
+            action=SafetyAction.PAUSE,
+            reason="Portfolio risk: " + "; ".join(result.actions[i].reason for i in result.breached)
+        )
+
     @staticmethod
     def check_all(
         position: PositionState,
@@ -179,7 +305,13 @@ class SafetyChecker:
         max_total_position: Decimal,
         max_imbalance: Decimal,
         pending_orders: Optional[PendingOrdersInfo] = None,
-        max_pending_per_side: int = 1
+        max_pending_per_side: int = 1,
+        market: Optional[MarketState] = None,
+        max_notional_per_side: Optional[Decimal] = None,
+        max_imbalance_notional: Optional[Decimal] = None,
+        max_margin_utilization: Optional[Decimal] = None,
+        portfolio=None,
+        portfolio_index: int = 0
     ) -> SafetyCheckResult:
         """
         执行所有安全检查。
@@ -191,6 +323,12 @@ class SafetyChecker:
             max_imbalance: 允许的最大不平衡度
             pending_orders: 未成交订单信息（可选）
             max_pending_per_side: 单边最大未成交订单数
+            market: 缓存的标记价格和保证金使用率（可选，不提供时跳过名义价值和保证金检查）
+            max_notional_per_side: 单边最大名义价值（USD，可选）
+            max_imbalance_notional: 不平衡部分的最大名义价值（USD，可选）
+            max_margin_utilization: 最大保证金使用率（可选）
+            portfolio: PortfolioRiskEngine（可选，不提供时跳过组合风控）
+            portfolio_index: 本交易对在portfolio中的下标
 
         Returns:
             SafetyCheckResult
@@ -213,4 +351,24 @@ class SafetyChecker:
         if result.action != SafetyAction.CONTINUE:
             return result
 
+        if market is not None:
+            # 检查名义价值限额
+            result = SafetyChecker.check_notional_limits(
+                position, market, max_notional_per_side, max_imbalance_notional
+            )
+            if result.action != SafetyAction.CONTINUE:
+                return result
+
+            # 检查保证金使用率
+            if max_margin_utilization is not None:
+                result = SafetyChecker.check_margin(market, max_margin_utilization)
+                if result.action != SafetyAction.CONTINUE:
+                    return result
+
+        # 组合风控
+        if portfolio is not None:
+            result = SafetyChecker.check_portfolio(portfolio, position, market, pending_orders, portfolio_index)
+            if result.action != SafetyAction.CONTINUE:
+                return result
+
         return SafetyCheckResult(action=SafetyAction.CONTINUE)
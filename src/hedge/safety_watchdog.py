@@ -0,0 +1,178 @@
+"""
+安全看门狗 - 由WebSocket仓位/订单事件驱动的独立安全检查任务。
+
+职责：
+1. 每收到一次仓位或订单事件就重新执行SafetyChecker.check_all（读取WebSocket账户缓存，不发REST请求）
+2. 没有事件时按心跳间隔用REST兜底检查
+3. 超限时立即撤销所有挂单，不依赖主循环（主循环可能正阻塞在等待成交或HOLDING中）
+4. 记录最近一次超限结果，供主循环查看
+"""
+
+import asyncio
+import logging
+import time
+from decimal import Decimal
+from typing import Optional
+
+from hedge.safety_checker import SafetyAction, SafetyChecker, SafetyCheckResult
+
+
+class SafetyWatchdog:
+    """
+    安全看门狗。
+
+    交易所客户端通过add_account_listener注册notify，事件到达后唤醒run()中的检查。
+    一批连续事件只触发一次检查（min_interval内合并），事件触发的检查读取账户缓存；
+    没有事件时每heartbeat秒用REST兜底检查一次。
+    """
+
+    def __init__(
+        self,
+        executor,
+        max_position_per_side: Decimal,
+        max_total_position: Decimal,
+        max_imbalance: Decimal,
+        max_pending_per_side: int = 1,
+        max_notional_per_side: Optional[Decimal] = None,
+        max_imbalance_notional: Optional[Decimal] = None,
+        max_margin_utilization: Optional[Decimal] = None,
+        portfolio=None,
+        min_interval: float = 0.05,
+        heartbeat: float = 5.0,
+        cancel_cooldown: float = 1.0,
+        logger=None
+    ):
+        """
+        初始化看门狗。
+
+        Args:
+            executor: TradingExecutor，用于读取仓位/挂单和撤单
+            max_position_per_side: 单边最大仓位
+            max_total_position: 总仓位最大值
+            max_imbalance: 允许的最大不平衡度
+            max_pending_per_side: 单边最大未成交订单数
+            max_notional_per_side: 单边最大名义价值（USD，可选）
+            max_imbalance_notional: 不平衡部分的最大名义价值（USD，可选）
+            max_margin_utilization: 最大保证金使用率（可选）
+            portfolio: PortfolioRiskEngine，组合风控（可选）
+            min_interval: 两次检查之间的最小间隔（秒），用于合并突发事件
+            heartbeat: 没有事件时的兜底检查间隔（秒）
+            cancel_cooldown: 同一次超限重复撤单的最小间隔（秒）
+            logger: 日志记录器
+        """
+        self.executor = executor
+        self.max_position_per_side = max_position_per_side
+        self.max_total_position = max_total_position
+        self.max_imbalance = max_imbalance
+        self.max_pending_per_side = max_pending_per_side
+        self.max_notional_per_side = max_notional_per_side
+        self.max_imbalance_notional = max_imbalance_notional
+        self.max_margin_utilization = max_margin_utilization
+        self.portfolio = portfolio
+        self.min_interval = min_interval
+        self.heartbeat = heartbeat
+        self.cancel_cooldown = cancel_cooldown
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.last_breach: Optional[SafetyCheckResult] = None
+        self.check_count = 0
+
+        self._event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_cancel_time = 0.0
+        self._running = False
+
+    def notify(self) -> None:
+        """
+        仓位/订单事件回调。可以从任意线程调用，只负责唤醒检查任务。
+        """
+        if self._loop is None or self._event is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
+
+    def stop(self) -> None:
+        """停止检查任务"""
+        self._running = False
+        self.notify()
+
+    async def check_once(self, from_cache: bool = False) -> SafetyCheckResult:
+        """
+        执行一次安全检查，超限时撤销所有挂单。
+
+        Args:
+            from_cache: 从WebSocket账户缓存读取仓位和挂单（事件路径），
+                交易所没有缓存时仍走REST；False时直接请求REST（心跳路径）
+
+        Returns:
+            SafetyCheckResult
+        """
+        position = self.executor.get_cached_positions() if from_cache else None
+        if position is None:
+            position = await self.executor.get_positions()
+        pending_orders = self.executor.get_cached_pending_orders() if from_cache else None
+        if pending_orders is None:
+            pending_orders = await self.executor.get_pending_orders()
+        market = None
+        if any(limit is not None for limit in
+               (self.max_notional_per_side, self.max_imbalance_notional, self.max_margin_utilization,
+                self.portfolio)):
+            market = self.executor.get_market_state()
+        self.check_count += 1
+
+        result = SafetyChecker.check_all(
+            position,
+            self.max_position_per_side,
+            self.max_total_position,
+            self.max_imbalance,
+            pending_orders=pending_orders,
+            max_pending_per_side=self.max_pending_per_side,
+            market=market,
+            max_notional_per_side=self.max_notional_per_side,
+            max_imbalance_notional=self.max_imbalance_notional,
+            max_margin_utilization=self.max_margin_utilization,
+            portfolio=self.portfolio
+        )
+
+        if result.action == SafetyAction.CONTINUE:
+            self.last_breach = None
+            return result
+
+        self.last_breach = result
+        now = time.time()
+        if now - self._last_cancel_time >= self.cancel_cooldown:
+            self._last_cancel_time = now
+            self.logger.warning(f"🐕 Watchdog: {result.reason}, cancelling all orders")
+            await self.executor.cancel_all_orders()
+
+        return result
+
+    async def run(self):
+        """检查任务主循环，作为独立task运行"""
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        self._running = True
+        self.logger.info("Safety watchdog started")
+
+        while self._running:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout=self.heartbeat)
+                from_cache = True
+            except asyncio.TimeoutError:
+                from_cache = False
+            if not self._running:
+                break
+
+            self._event.clear()
+            try:
+                await self.check_once(from_cache=from_cache)
+            except Exception as e:
+                self.logger.error(f"Watchdog check failed: {e}")
+
+            # 检查期间和min_interval内到达的事件合并到下一次检查
+            await asyncio.sleep(self.min_interval)
+
+        self.logger.info("Safety watchdog stopped")
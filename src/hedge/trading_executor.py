@@ -10,11 +10,15 @@
 
 import asyncio
 import logging
+import time
 from decimal import Decimal
-from typing import NamedTuple, Optional
+from typing import List, NamedTuple, Optional
 
-from hedge.rebalancer import TradeAction
-from hedge.safety_checker import PositionState, PendingOrdersInfo
+from exchanges.base import OrderResult
+from hedge.position_ledger import PositionLedger
+from hedge.rebalancer import RebalancePlan, TradeAction, TradeInstruction, VenueStats
+from hedge.safety_checker import MarketState, PositionState, PendingOrdersInfo
+from helpers.metrics import metrics
 
 
 class ExecutionResult(NamedTuple):
@@ -27,6 +31,29 @@ class ExecutionResult(NamedTuple):
     error: Optional[str] = None
 
 
+class ChaseResult(NamedTuple):
+    """追单结果"""
+    filled: bool
+    order_id: Optional[str] = None
+    price: Optional[Decimal] = None
+    requotes: int = 0
+    fill_time: Optional[float] = None
+    filled_quantity: Decimal = Decimal(0)  # 所有订单（包括被替换的）累计成交数量
+
+
+class PipelineResult(NamedTuple):
+    """流水线建仓结果"""
+    filled_quantity: Decimal       # 交易所A做市单成交数量
+    hedged_quantity: Decimal       # 交易所B已对冲数量
+    orders_placed: int
+    hedge_failures: int            # 失败的对冲下单次数（未对冲部分会在下一轮重试）
+    elapsed: float
+
+    @property
+    def success(self) -> bool:
+        return self.filled_quantity > 0 and self.hedged_quantity >= self.filled_quantity
+
+
 class TradingExecutor:
     """
     交易执行器。
@@ -34,7 +61,21 @@ class TradingExecutor:
     封装所有与交易所的交互，但不包含业务逻辑。
     """
 
-    def __init__(self, exchange_a_client, exchange_b_client, logger=None):
+    def __init__(
+        self,
+        exchange_a_client,
+        exchange_b_client,
+        logger=None,
+        chase_enabled: bool = True,
+        chase_distance_ticks: int = 1,
+        requote_threshold_ticks: int = 1,
+        max_requotes_per_second: float = 2.0,
+        poll_interval: float = 0.2,
+        hedge_max_slippage: Decimal = Decimal("0.005"),
+        hedge_max_attempts: int = 3,
+        exchange_a_taker_fee: Decimal = Decimal("0.0005"),
+        exchange_b_taker_fee: Decimal = Decimal("0")
+    ):
         """
         初始化执行器。
 
@@ -42,30 +83,166 @@ class TradingExecutor:
             exchange_a_client: 交易所A客户端 (主交易所，使用做市单)
             exchange_b_client: 交易所B客户端 (对冲交易所，使用市价单)
             logger: 日志记录器
+            chase_enabled: 是否开启追单模式（做市单跟随盘口改价，而不是等待超时后撤单）
+            chase_distance_ticks: 追单目标价距离对手盘的tick数（买单 = best_ask - N*tick）
+            requote_threshold_ticks: 订单价格落后目标价多少tick时改价
+            max_requotes_per_second: 每秒最多改价次数
+            poll_interval: 订单状态/盘口轮询间隔（秒）
+            hedge_max_slippage: 对冲腿taker单相对盘口的最大滑点（比例，0.005 = 0.5%）
+            hedge_max_attempts: 对冲腿IOC单部分成交时，连同首单最多下单次数
+            exchange_a_taker_fee: 交易所A taker费率（比例），用于再平衡路由
+            exchange_b_taker_fee: 交易所B taker费率（比例），用于再平衡路由
         """
+        # 对冲腿必须能吃单：挂做市单对冲会让敞口一直暴露到成交为止
+        if not exchange_b_client.supports_taker:
+            raise ValueError(f"Hedge exchange {exchange_b_client.get_exchange_name()} "
+                             f"does not support taker orders")
+
         self.exchange_a = exchange_a_client
         self.exchange_b = exchange_b_client
         self.logger = logger or logging.getLogger(__name__)
 
+        # 追单参数
+        self.chase_enabled = chase_enabled
+        self.chase_distance_ticks = chase_distance_ticks
+        self.requote_threshold_ticks = requote_threshold_ticks
+        self.min_requote_interval = 1 / max_requotes_per_second if max_requotes_per_second > 0 else 0
+        self.poll_interval = poll_interval
+
+        # 对冲腿参数
+        self.hedge_max_slippage = hedge_max_slippage
+        self.hedge_max_attempts = max(1, hedge_max_attempts)
+
         # 获取交易所名称用于日志
         self.exchange_a_name = exchange_a_client.get_exchange_name().upper()
         self.exchange_b_name = exchange_b_client.get_exchange_name().upper()
 
+        # 再平衡路由：各交易所taker费率和下单往返时间
+        self.taker_fees = {"exchange_a": exchange_a_taker_fee, "exchange_b": exchange_b_taker_fee}
+        self.order_rtt = {
+            "exchange_a": metrics.histogram(f"{self.exchange_a_name.lower()}.order.rtt"),
+            "exchange_b": metrics.histogram(f"{self.exchange_b_name.lower()}.order.rtt"),
+        }
+
+        # 仓位账本（enable_position_ledgers后启用）
+        self.ledger_a: Optional[PositionLedger] = None
+        self.ledger_b: Optional[PositionLedger] = None
+        self.ledger_reconcile_interval = 30.0
+
+    def enable_position_ledgers(self, reconcile_interval: float = 30.0) -> None:
+        """
+        启用仓位账本：仓位由成交推送增量更新，每reconcile_interval秒用REST校正一次。
+
+        Args:
+            reconcile_interval: REST校正间隔（秒）
+        """
+        self.ledger_a = PositionLedger(self.exchange_a_name.lower())
+        self.ledger_b = PositionLedger(self.exchange_b_name.lower())
+        self.ledger_reconcile_interval = reconcile_interval
+        self.exchange_a.add_fill_listener(self.ledger_a.on_fill)
+        self.exchange_b.add_fill_listener(self.ledger_b.on_fill)
+
     async def get_positions(self) -> PositionState:
         """
-        从交易所获取当前真实仓位。
+        获取当前仓位。
+
+        启用仓位账本且未到校正时间时直接返回账本仓位（不请求API），否则从交易所获取并校正账本。
+
+        Returns:
+            PositionState
+        """
+        ledgers = (self.ledger_a, self.ledger_b)
+        if all(ledger is not None and ledger.is_ready
+               and not ledger.needs_reconcile(self.ledger_reconcile_interval) for ledger in ledgers):
+            return PositionState(
+                exchange_a_position=self.ledger_a.position,
+                exchange_b_position=self.ledger_b.position
+            )
+
+        return await self.reconcile_positions()
+
+    async def reconcile_positions(self) -> PositionState:
+        """
+        从交易所获取真实仓位，并用它校正仓位账本（如已启用）。
 
         Returns:
             PositionState
         """
+        # REST请求前记下成交推送序号，请求期间有新成交时账本推迟校正
+        fill_seqs = [ledger.fill_seq if ledger is not None else None for ledger in (self.ledger_a, self.ledger_b)]
         exchange_a_pos = await self.exchange_a.get_account_positions()
         exchange_b_pos = await self.exchange_b.get_account_positions()
 
+        for name, ledger, rest_position, fill_seq in (
+                (self.exchange_a_name, self.ledger_a, exchange_a_pos, fill_seqs[0]),
+                (self.exchange_b_name, self.ledger_b, exchange_b_pos, fill_seqs[1])):
+            if ledger is None:
+                continue
+            if not ledger.is_ready:
+                ledger.seed(rest_position)
+                continue
+            drift = ledger.reconcile(rest_position, fill_seq)
+            if drift is None:
+                self.logger.debug(f"{name} position ledger reconcile deferred: fills arrived during REST read")
+            elif drift != 0:
+                self.logger.warning(f"{name} position ledger drift {drift} corrected from REST")
+
         return PositionState(
             exchange_a_position=exchange_a_pos,
             exchange_b_position=exchange_b_pos
         )
 
+    def get_cached_positions(self) -> Optional[PositionState]:
+        """
+        从仓位账本（已就绪时）或交易所客户端的WebSocket账户缓存读取仓位，不发REST请求。
+
+        Returns:
+            PositionState；任一交易所没有缓存仓位时返回None
+        """
+        positions = []
+        for ledger, client in ((self.ledger_a, self.exchange_a), (self.ledger_b, self.exchange_b)):
+            if ledger is not None and ledger.is_ready:
+                positions.append(ledger.position)
+            else:
+                positions.append(client.get_cached_position())
+        if any(position is None for position in positions):
+            return None
+        return PositionState(exchange_a_position=positions[0], exchange_b_position=positions[1])
+
+    def get_cached_pending_orders(self) -> Optional[PendingOrdersInfo]:
+        """
+        从交易所客户端的WebSocket账户缓存读取未成交订单数量，不发REST请求。
+
+        Returns:
+            PendingOrdersInfo；任一交易所没有缓存挂单时返回None
+        """
+        exchange_a_orders = self.exchange_a.get_cached_open_orders()
+        exchange_b_orders = self.exchange_b.get_cached_open_orders()
+        if exchange_a_orders is None or exchange_b_orders is None:
+            return None
+        return PendingOrdersInfo(
+            exchange_a_pending_count=len(exchange_a_orders),
+            exchange_b_pending_count=len(exchange_b_orders)
+        )
+
+    def get_market_state(self) -> MarketState:
+        """
+        从交易所客户端的WebSocket缓存读取标记价格和保证金使用率，不发REST请求。
+
+        Returns:
+            MarketState
+        """
+        def margin_utilization(client):
+            margin = client.get_cached_margin()
+            return margin.utilization if margin is not None else None
+
+        return MarketState(
+            exchange_a_mark_price=self.exchange_a.get_cached_mark_price(),
+            exchange_b_mark_price=self.exchange_b.get_cached_mark_price(),
+            exchange_a_margin_utilization=margin_utilization(self.exchange_a),
+            exchange_b_margin_utilization=margin_utilization(self.exchange_b)
+        )
+
     async def get_pending_orders(self) -> PendingOrdersInfo:
         """
         从交易所获取未成交订单数量。
@@ -136,6 +313,101 @@ class TradingExecutor:
 
         return ExecutionResult(success=False, error=f"Unknown action: {action}")
 
+    def _venue_client(self, venue: str):
+        return self.exchange_a if venue == "exchange_a" else self.exchange_b
+
+    async def get_venue_stats(self, action: TradeAction) -> List[VenueStats]:
+        """
+        获取两个交易所的再平衡路由指标：下单RTT中位数、最大滑点内可成交深度、taker费率。
+
+        深度未知（交易所没有本地盘口或查询失败）时为None。
+        """
+        side = "buy" if action == TradeAction.CLOSE_SHORT else "sell"
+        stats = []
+        for venue in ("exchange_a", "exchange_b"):
+            client = self._venue_client(venue)
+            try:
+                depth = await client.get_available_depth(side, self.hedge_max_slippage)
+            except Exception as e:
+                self.logger.debug(f"Failed to get {venue} depth: {e}")
+                depth = None
+            stats.append(VenueStats(
+                venue=venue,
+                rtt=self.order_rtt[venue].percentile(50),
+                depth=depth,
+                taker_fee=self.taker_fees[venue],
+                can_take=client.supports_taker
+            ))
+        return stats
+
+    async def execute_rebalance_plan(self, plan: RebalancePlan) -> List[ExecutionResult]:
+        """
+        执行再平衡计划，每个子订单在其路由的交易所执行。
+
+        用到的交易所都支持并发下单时所有子订单同时提交，否则依次提交；
+        某个子订单失败不影响其余子订单。
+
+        Args:
+            plan: 再平衡计划
+
+        Returns:
+            每个子订单的ExecutionResult
+        """
+        if plan.is_empty:
+            return []
+
+        concurrent = all(self._venue_client(s.venue).supports_concurrent_orders for s in plan.slices)
+        self.logger.info(f"Executing rebalance plan: {len(plan.slices)} slices, total {plan.total_quantity} "
+                         f"({'concurrent' if concurrent else 'back-to-back'})")
+
+        if concurrent:
+            results = await asyncio.gather(
+                *(self._execute_rebalance_slice(s) for s in plan.slices),
+                return_exceptions=True
+            )
+            return [
+                r if isinstance(r, ExecutionResult) else ExecutionResult(success=False, error=str(r))
+                for r in results
+            ]
+
+        results = []
+        for s in plan.slices:
+            results.append(await self._execute_rebalance_slice(s))
+        return results
+
+    async def _execute_rebalance_slice(self, instruction: TradeInstruction) -> ExecutionResult:
+        """
+        执行一个再平衡子订单。路由到交易所B时与execute_trade相同；
+        路由到交易所A时以taker单在A完成同方向的交易。
+        """
+        if instruction.venue != "exchange_a":
+            return await self.execute_trade(instruction.action, instruction.quantity, wait_for_fill=False)
+
+        side = "buy" if instruction.action == TradeAction.CLOSE_SHORT else "sell"
+        try:
+            self.logger.info(f"Rebalancing: {self.exchange_a_name} {side} {instruction.quantity}")
+            start_time = time.time()
+            result = await self.exchange_a.place_taker_order(instruction.quantity, side, self.hedge_max_slippage)
+            self.order_rtt["exchange_a"].observe(time.time() - start_time)
+
+            if not result.success:
+                return ExecutionResult(
+                    success=False,
+                    error=f"Exchange A rebalance {side} failed: {result.error_message}"
+                )
+
+            self.logger.info(f"✓ {self.exchange_a_name} rebalance {side} @ {result.price}")
+
+            return ExecutionResult(
+                success=True,
+                exchange_a_order_id=result.order_id,
+                exchange_a_price=result.price
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error executing rebalance {side} on Exchange A: {e}")
+            return ExecutionResult(success=False, error=str(e))
+
     async def _execute_build_long(
         self, quantity: Decimal, wait_for_fill: bool, timeout: int
     ) -> ExecutionResult:
@@ -159,34 +431,28 @@ class TradingExecutor:
 
             self.logger.info(f"✓ Exchange A buy order placed: {exchange_a_result.order_id} @ {exchange_a_result.price}")
 
-            # 2. 等待GRVT订单成交
+            # 2. 等待GRVT订单成交（追单模式下跟随盘口改价）
             if wait_for_fill:
                 self.logger.info("Waiting for Exchange A order to fill...")
-                filled = await self._wait_for_fill(exchange_a_result.order_id, timeout)
+                chase = await self._fill_maker_order(exchange_a_result, "buy", quantity, timeout)
 
-                if not filled:
-                    self.logger.warning("Exchange A order not filled, cancelling...")
-                    await self.exchange_a.cancel_order(exchange_a_result.order_id)
-                    return ExecutionResult(
-                        success=False,
-                        error="Exchange A order not filled within timeout"
-                    )
+                if not chase.filled:
+                    self.logger.warning(f"Exchange A order not filled, filled {chase.filled_quantity} of {quantity}")
+                    return await self._hedge_unfilled_chase(chase, "sell")
 
-                self.logger.info("✓ Exchange A order filled")
+                exchange_a_result.order_id = chase.order_id
+                exchange_a_result.price = chase.price
+                self.logger.info(f"✓ Exchange A order filled in {chase.fill_time:.1f}s after {chase.requotes} requotes")
 
             # 3. Lighter卖出（对冲）
             self.logger.info(f"Placing Exchange B sell order: {quantity}")
-            exchange_b_result = await self.exchange_b.place_open_order(
-                contract_id=self.exchange_b.config.contract_id,
-                quantity=quantity,
-                direction="sell"
-            )
+            exchange_b_result = await self._place_hedge_order(quantity, "sell")
 
             if not exchange_b_result.success:
                 return ExecutionResult(
                     success=False,
-                    grvt_order_id=exchange_a_result.order_id,
-                    grvt_price=exchange_a_result.price,
+                    exchange_a_order_id=exchange_a_result.order_id,
+                    exchange_a_price=exchange_a_result.price,
                     error=f"Exchange B order failed: {exchange_b_result.error_message}"
                 )
 
@@ -194,10 +460,10 @@ class TradingExecutor:
 
             return ExecutionResult(
                 success=True,
-                grvt_order_id=exchange_a_result.order_id,
-                grvt_price=exchange_a_result.price,
-                lighter_order_id=exchange_b_result.order_id,
-                lighter_price=exchange_b_result.price
+                exchange_a_order_id=exchange_a_result.order_id,
+                exchange_a_price=exchange_a_result.price,
+                exchange_b_order_id=exchange_b_result.order_id,
+                exchange_b_price=exchange_b_result.price
             )
 
         except Exception as e:
@@ -227,34 +493,28 @@ class TradingExecutor:
 
             self.logger.info(f"✓ Exchange A sell order placed: {exchange_a_result.order_id} @ {exchange_a_result.price}")
 
-            # 2. 等待成交
+            # 2. 等待成交（追单模式下跟随盘口改价）
             if wait_for_fill:
                 self.logger.info("Waiting for Exchange A order to fill...")
-                filled = await self._wait_for_fill(exchange_a_result.order_id, timeout)
+                chase = await self._fill_maker_order(exchange_a_result, "sell", quantity, timeout)
 
-                if not filled:
-                    self.logger.warning("Exchange A order not filled, cancelling...")
-                    await self.exchange_a.cancel_order(exchange_a_result.order_id)
-                    return ExecutionResult(
-                        success=False,
-                        error="Exchange A order not filled within timeout"
-                    )
+                if not chase.filled:
+                    self.logger.warning(f"Exchange A order not filled, filled {chase.filled_quantity} of {quantity}")
+                    return await self._hedge_unfilled_chase(chase, "buy")
 
-                self.logger.info("✓ Exchange A order filled")
+                exchange_a_result.order_id = chase.order_id
+                exchange_a_result.price = chase.price
+                self.logger.info(f"✓ Exchange A order filled in {chase.fill_time:.1f}s after {chase.requotes} requotes")
 
             # 3. Lighter买入（对冲）
             self.logger.info(f"Placing Exchange B buy order: {quantity}")
-            exchange_b_result = await self.exchange_b.place_open_order(
-                contract_id=self.exchange_b.config.contract_id,
-                quantity=quantity,
-                direction="buy"
-            )
+            exchange_b_result = await self._place_hedge_order(quantity, "buy")
 
             if not exchange_b_result.success:
                 return ExecutionResult(
                     success=False,
-                    grvt_order_id=exchange_a_result.order_id,
-                    grvt_price=exchange_a_result.price,
+                    exchange_a_order_id=exchange_a_result.order_id,
+                    exchange_a_price=exchange_a_result.price,
                     error=f"Exchange B order failed: {exchange_b_result.error_message}"
                 )
 
@@ -262,10 +522,10 @@ class TradingExecutor:
 
             return ExecutionResult(
                 success=True,
-                grvt_order_id=exchange_a_result.order_id,
-                grvt_price=exchange_a_result.price,
-                lighter_order_id=exchange_b_result.order_id,
-                lighter_price=exchange_b_result.price
+                exchange_a_order_id=exchange_a_result.order_id,
+                exchange_a_price=exchange_a_result.price,
+                exchange_b_order_id=exchange_b_result.order_id,
+                exchange_b_price=exchange_b_result.price
             )
 
         except Exception as e:
@@ -281,11 +541,7 @@ class TradingExecutor:
         """
         try:
             self.logger.info(f"Rebalancing: Lighter sell {quantity}")
-            exchange_b_result = await self.exchange_b.place_open_order(
-                contract_id=self.exchange_b.config.contract_id,
-                quantity=quantity,
-                direction="sell"
-            )
+            exchange_b_result = await self._place_hedge_order(quantity, "sell")
 
             if not exchange_b_result.success:
                 return ExecutionResult(
@@ -297,8 +553,8 @@ class TradingExecutor:
 
             return ExecutionResult(
                 success=True,
-                lighter_order_id=exchange_b_result.order_id,
-                lighter_price=exchange_b_result.price
+                exchange_b_order_id=exchange_b_result.order_id,
+                exchange_b_price=exchange_b_result.price
             )
 
         except Exception as e:
@@ -314,11 +570,7 @@ class TradingExecutor:
         """
         try:
             self.logger.info(f"Rebalancing: Lighter buy {quantity}")
-            exchange_b_result = await self.exchange_b.place_open_order(
-                contract_id=self.exchange_b.config.contract_id,
-                quantity=quantity,
-                direction="buy"
-            )
+            exchange_b_result = await self._place_hedge_order(quantity, "buy")
 
             if not exchange_b_result.success:
                 return ExecutionResult(
@@ -330,14 +582,374 @@ class TradingExecutor:
 
             return ExecutionResult(
                 success=True,
-                lighter_order_id=exchange_b_result.order_id,
-                lighter_price=exchange_b_result.price
+                exchange_b_order_id=exchange_b_result.order_id,
+                exchange_b_price=exchange_b_result.price
             )
 
         except Exception as e:
             self.logger.error(f"Error executing rebalance buy: {e}")
             return ExecutionResult(success=False, error=str(e))
 
+    async def _hedge_unfilled_chase(self, chase: ChaseResult, hedge_side: str) -> ExecutionResult:
+        """
+        做市单未全部成交：先对冲已成交部分，再返回失败结果，避免留下单边敞口。
+        """
+        error = "Exchange A order not filled within timeout"
+        if chase.filled_quantity <= 0:
+            return ExecutionResult(success=False, exchange_a_order_id=chase.order_id, error=error)
+
+        self.logger.info(f"Hedging partial Exchange A fill: {hedge_side} {chase.filled_quantity}")
+        exchange_b_result = await self._place_hedge_order(chase.filled_quantity, hedge_side)
+        if exchange_b_result.success:
+            error += f" (partial fill {chase.filled_quantity} hedged)"
+        else:
+            error += f" (partial fill {chase.filled_quantity} not hedged: {exchange_b_result.error_message})"
+            self.logger.error(f"Failed to hedge partial Exchange A fill: {exchange_b_result.error_message}")
+
+        return ExecutionResult(
+            success=False,
+            exchange_a_order_id=chase.order_id,
+            exchange_a_price=chase.price,
+            exchange_b_order_id=exchange_b_result.order_id,
+            exchange_b_price=exchange_b_result.price,
+            error=error
+        )
+
+    async def _place_hedge_order(self, quantity: Decimal, direction: str) -> OrderResult:
+        """
+        对冲腿下单：用IOC/市价单（构造时已确认交易所B支持taker单）。
+
+        IOC单只保证成交数量大于0：按实际filled_size累计，未成交部分重新下单，最多hedge_max_attempts次。
+        全部成交才返回success=True；否则success=False，filled_size为已对冲数量，error_message注明剩余敞口。
+        """
+        filled_total = Decimal(0)
+        notional = Decimal(0)
+        result = None
+
+        for attempt in range(1, self.hedge_max_attempts + 1):
+            remaining = quantity - filled_total
+            start_time = time.time()
+            result = await self.exchange_b.place_taker_order(remaining, direction, self.hedge_max_slippage)
+            self.order_rtt["exchange_b"].observe(time.time() - start_time)
+
+            filled = self._hedge_filled_size(result, remaining)
+            filled_total += filled
+            if filled > 0 and result.price:
+                notional += filled * Decimal(result.price)
+
+            if filled_total >= quantity:
+                break
+            self.logger.warning(f"Hedge {direction} attempt {attempt}: filled {filled_total} of {quantity}"
+                                f"{f' ({result.error_message})' if result.error_message else ''}")
+
+        avg_price = notional / filled_total if notional > 0 else result.price
+        residual = quantity - filled_total
+        if residual <= 0:
+            return OrderResult(success=True, order_id=result.order_id, side=direction, size=quantity,
+                               price=avg_price, status='FILLED', filled_size=filled_total)
+
+        self.logger.error(f"Hedge {direction} left {residual} of {quantity} unhedged "
+                          f"after {self.hedge_max_attempts} attempts")
+        return OrderResult(
+            success=False,
+            order_id=result.order_id,
+            side=direction,
+            size=quantity,
+            price=avg_price,
+            status='PARTIALLY_FILLED' if filled_total > 0 else result.status,
+            filled_size=filled_total,
+            error_message=f"Hedge filled {filled_total} of {quantity}, {residual} unhedged: {result.error_message}"
+        )
+
+    @staticmethod
+    def _hedge_filled_size(result: OrderResult, requested: Decimal) -> Decimal:
+        """
+        对冲单实际成交数量。成功但未报告filled_size时视为全部成交。
+        """
+        if result.filled_size is not None:
+            return min(Decimal(result.filled_size), requested)
+        return requested if result.success else Decimal(0)
+
+    def _chase_target_price(self, side: str, best_bid: Decimal, best_ask: Decimal) -> Decimal:
+        """
+        追单目标价：与开仓挂单一致，距离对手盘 chase_distance_ticks 个tick。
+        """
+        offset = self.exchange_a.config.tick_size * self.chase_distance_ticks
+        if side == "buy":
+            return self.exchange_a.round_to_tick(best_ask - offset)
+        return self.exchange_a.round_to_tick(best_bid + offset)
+
+    def _needs_requote(self, side: str, order_price: Decimal, target_price: Decimal) -> bool:
+        """
+        订单价格是否落后目标价（盘口远离）超过阈值。
+        """
+        threshold = self.exchange_a.config.tick_size * self.requote_threshold_ticks
+        if side == "buy":
+            return target_price - order_price >= threshold
+        return order_price - target_price >= threshold
+
+    async def _fill_maker_order(self, order_result, side: str, quantity: Decimal, timeout: int) -> ChaseResult:
+        """
+        等待做市单成交。
+
+        追单模式：订单价格落后盘口时改价（支持amend的交易所原地改单，其余撤单重挂；
+        受最大改价频率限制），直到全部成交或超时；
+        未开启追单时退化为原来的等待成交。
+
+        Args:
+            order_result: 初始挂单结果
+            side: 订单方向
+            quantity: 目标成交数量
+            timeout: 超时时间（秒）
+
+        Returns:
+            ChaseResult。未全部成交时剩余挂单已撤销，filled_quantity为撤单后所有订单的累计成交数量
+        """
+        start = time.time()
+
+        if not self.chase_enabled:
+            filled = await self._wait_for_fill(order_result.order_id, timeout)
+            if filled:
+                filled_quantity = quantity
+            else:
+                filled_quantity = await self._cancel_and_get_filled(order_result.order_id)
+            return ChaseResult(filled=filled, order_id=order_result.order_id, price=order_result.price,
+                               fill_time=time.time() - start, filled_quantity=filled_quantity)
+
+        order_id = order_result.order_id
+        order_price = order_result.price
+        filled_before = Decimal(0)  # 已被替换的订单上的成交数量
+        current_filled = Decimal(0)  # 当前订单最近一次查询到的成交数量
+        requotes = 0
+        last_requote = 0.0
+        contract_id = self.exchange_a.config.contract_id
+        requote_mode = "amend" if self.exchange_a.supports_amend else "cancel/replace"
+
+        while time.time() - start < timeout:
+            try:
+                order_info = await self.exchange_a.get_order_info(order_id=order_id)
+                if order_info:
+                    current_filled = Decimal(order_info.filled_size or 0)
+
+                if order_info and order_info.status == 'FILLED':
+                    return ChaseResult(filled=True, order_id=order_id, price=order_price,
+                                       requotes=requotes, fill_time=time.time() - start,
+                                       filled_quantity=quantity)
+
+                if order_info and order_info.status in ['CANCELED', 'CANCELLED', 'REJECTED']:
+                    return ChaseResult(filled=False, order_id=order_id, price=order_price, requotes=requotes,
+                                       filled_quantity=filled_before + current_filled)
+
+                if time.time() - last_requote >= self.min_requote_interval:
+                    best_bid, best_ask = await self.exchange_a.fetch_bbo_prices(contract_id)
+                    if best_bid > 0 and best_ask > 0:
+                        target_price = self._chase_target_price(side, best_bid, best_ask)
+
+                        if self._needs_requote(side, order_price, target_price):
+                            remaining = quantity - filled_before - current_filled
+
+                            if remaining > 0:
+                                self.logger.info(f"Requoting Exchange A {side} {order_id} ({requote_mode}): "
+                                                 f"{order_price} -> {target_price}, remaining {remaining}")
+                                last_requote = time.time()
+                                result = await self.exchange_a.modify_order(order_id, target_price, remaining, side)
+
+                                if result.success:
+                                    if result.order_id and str(result.order_id) != str(order_id):
+                                        # 交易所以新订单替换了原订单，记录原订单的成交
+                                        filled_before += Decimal(result.filled_size or 0)
+                                        order_id = result.order_id
+                                        current_filled = Decimal(0)
+                                    order_price = result.price or target_price
+                                    requotes += 1
+                                    continue
+
+                                if result.status == 'CANCELED':
+                                    # 撤单重挂时新单下单失败：原订单已撤销，不能再追
+                                    self.logger.warning(f"Requote failed after cancel: {result.error_message}")
+                                    filled_quantity = filled_before + Decimal(result.filled_size or current_filled)
+                                    return ChaseResult(filled=False, order_id=order_id, price=order_price,
+                                                       requotes=requotes, filled_quantity=filled_quantity)
+
+                                # 改价失败（通常是订单已成交或已撤销），由下一轮状态检查处理
+                                self.logger.warning(f"Requote failed: {result.error_message}")
+
+                await asyncio.sleep(self.poll_interval)
+
+            except Exception as e:
+                self.logger.debug(f"Error chasing order: {e}")
+                await asyncio.sleep(1)
+
+        # 超时：撤销剩余挂单，以撤单后的成交数量为准
+        filled_quantity = filled_before + await self._cancel_and_get_filled(order_id, current_filled)
+        if filled_quantity >= quantity:
+            return ChaseResult(filled=True, order_id=order_id, price=order_price,
+                               requotes=requotes, fill_time=time.time() - start, filled_quantity=quantity)
+        return ChaseResult(filled=False, order_id=order_id, price=order_price, requotes=requotes,
+                           filled_quantity=filled_quantity)
+
+    async def _cancel_and_get_filled(self, order_id: str, last_filled: Decimal = Decimal(0)) -> Decimal:
+        """
+        撤销交易所A挂单，返回撤单后该订单的最终成交数量；查询失败时返回last_filled。
+        """
+        try:
+            await self.exchange_a.cancel_order(order_id)
+            order_info = await self.exchange_a.get_order_info(order_id=order_id)
+        except Exception as e:
+            self.logger.error(f"Error cancelling Exchange A order {order_id}: {e}")
+            return last_filled
+        if order_info is None:
+            return last_filled
+        return Decimal(order_info.filled_size or 0)
+
+    def _ladder_price(self, side: str, best_bid: Decimal, best_ask: Decimal, level: int, stagger_ticks: int) -> Decimal:
+        """
+        流水线第level档挂单价：从追单目标价开始，每档远离对手盘 stagger_ticks 个tick。
+        """
+        offset = self.exchange_a.config.tick_size * stagger_ticks * level
+        target_price = self._chase_target_price(side, best_bid, best_ask)
+        if side == "buy":
+            return self.exchange_a.round_to_tick(target_price - offset)
+        return self.exchange_a.round_to_tick(target_price + offset)
+
+    async def execute_pipelined_build(
+        self,
+        action: TradeAction,
+        order_quantity: Decimal,
+        total_quantity: Decimal,
+        max_in_flight: int,
+        stagger_ticks: int = 1,
+        timeout: float = 120
+    ) -> PipelineResult:
+        """
+        流水线建仓：交易所A同时挂max_in_flight个阶梯价做市单，每次成交（包括部分成交）立即在交易所B对冲，
+        成交完的订单由新订单补上，直到total_quantity全部挂出并处理完或超时。
+
+        未对冲敞口最多为 max_in_flight * order_quantity。对冲失败或只部分成交时，剩余部分在下一轮轮询重试，
+        该订单在对冲完成前一直占用在途名额。交易所A不支持并发下单时退化为单笔。
+
+        Args:
+            action: BUILD_LONG（A买B卖）或 CLOSE_LONG（A卖B买）
+            order_quantity: 每笔做市单数量
+            total_quantity: 本次建仓总数量
+            max_in_flight: 同时挂单数（K）
+            stagger_ticks: 相邻两档挂单的价差（tick数）
+            timeout: 超时时间（秒），超时后撤销剩余挂单
+
+        Returns:
+            PipelineResult
+        """
+        side = "buy" if action == TradeAction.BUILD_LONG else "sell"
+        hedge_side = "sell" if side == "buy" else "buy"
+        if not self.exchange_a.supports_concurrent_orders:
+            max_in_flight = 1
+
+        contract_id = self.exchange_a.config.contract_id
+        start = time.time()
+        to_place = total_quantity
+        # order_id -> [下单数量, 已成交数量, 已对冲数量, 订单已结束]
+        in_flight = {}
+        filled_total = Decimal(0)
+        hedged_total = Decimal(0)
+        orders_placed = 0
+        hedge_failures = 0
+
+        async def hedge(order_id: str, filled_size: Decimal) -> None:
+            nonlocal filled_total, hedged_total, hedge_failures
+            entry = in_flight[order_id]
+            if filled_size > entry[1]:
+                filled_total += filled_size - entry[1]
+                entry[1] = filled_size
+            # 已成交但未对冲的部分（包括之前对冲失败的剩余）
+            delta = entry[1] - entry[2]
+            if delta <= 0:
+                return
+            result = await self._place_hedge_order(delta, hedge_side)
+            hedged = Decimal(result.filled_size or 0)
+            entry[2] += hedged
+            hedged_total += hedged
+            if result.success:
+                self.logger.info(f"✓ Pipeline hedge {hedge_side} {delta} @ {result.price} (order {order_id})")
+            else:
+                hedge_failures += 1
+                self.logger.error(f"Pipeline hedge {hedge_side} {delta} failed, "
+                                  f"{delta - hedged} left for retry: {result.error_message}")
+
+        self.logger.info(f"Pipelined build: {self.exchange_a_name} {side} {total_quantity} "
+                         f"in lots of {order_quantity}, {max_in_flight} in flight")
+
+        while (to_place > 0 or in_flight) and time.time() - start < timeout:
+            try:
+                # 补足在途订单
+                if to_place > 0 and len(in_flight) < max_in_flight:
+                    best_bid, best_ask = await self.exchange_a.fetch_bbo_prices(contract_id)
+                    while to_place > 0 and len(in_flight) < max_in_flight:
+                        quantity = min(order_quantity, to_place)
+                        price = self._ladder_price(side, best_bid, best_ask, len(in_flight), stagger_ticks)
+                        result = await self.exchange_a.place_close_order(contract_id, quantity, price, side)
+                        if not result.success:
+                            self.logger.warning(f"Pipeline order failed: {result.error_message}")
+                            break
+                        in_flight[result.order_id] = [quantity, Decimal(0), Decimal(0), False]
+                        to_place -= quantity
+                        orders_placed += 1
+                        filled = quantity if result.status == 'FILLED' else Decimal(result.filled_size or 0)
+                        if filled > 0:
+                            await hedge(result.order_id, filled)
+
+                # 对冲新成交，移除已结束且已对冲完的订单
+                for order_id in list(in_flight):
+                    quantity, filled, hedged, done = in_flight[order_id]
+                    if not done and filled < quantity:
+                        order_info = await self.exchange_a.get_order_info(order_id=order_id)
+                        if order_info is None:
+                            continue
+                        filled = Decimal(order_info.filled_size or 0)
+                        if order_info.status in ('FILLED', 'CANCELED', 'CANCELLED', 'REJECTED', 'EXPIRED'):
+                            if order_info.status != 'FILLED':
+                                # 未成交部分重新放回待挂数量
+                                to_place += quantity - filled
+                            in_flight[order_id][3] = True
+                    elif filled >= quantity:
+                        in_flight[order_id][3] = True
+
+                    await hedge(order_id, filled)
+                    if in_flight[order_id][3] and in_flight[order_id][2] >= in_flight[order_id][1]:
+                        del in_flight[order_id]
+
+                await asyncio.sleep(self.poll_interval)
+
+            except Exception as e:
+                self.logger.error(f"Error in pipelined build: {e}")
+                await asyncio.sleep(1)
+
+        # 超时：撤销剩余挂单，对冲撤单前的成交和之前未对冲的剩余
+        for order_id in list(in_flight):
+            try:
+                filled = in_flight[order_id][1]
+                if not in_flight[order_id][3]:
+                    await self.exchange_a.cancel_order(order_id)
+                    order_info = await self.exchange_a.get_order_info(order_id=order_id)
+                    if order_info is not None:
+                        filled = Decimal(order_info.filled_size or 0)
+                await hedge(order_id, filled)
+            except Exception as e:
+                self.logger.error(f"Error cancelling pipeline order {order_id}: {e}")
+
+        if hedged_total < filled_total:
+            self.logger.error(f"Pipelined build left {filled_total - hedged_total} unhedged")
+
+        elapsed = time.time() - start
+        self.logger.info(f"Pipelined build done: filled {filled_total}, hedged {hedged_total}, "
+                         f"{orders_placed} orders in {elapsed:.1f}s")
+        return PipelineResult(
+            filled_quantity=filled_total,
+            hedged_quantity=hedged_total,
+            orders_placed=orders_placed,
+            hedge_failures=hedge_failures,
+            elapsed=elapsed
+        )
+
     async def _wait_for_fill(self, order_id: str, timeout: int) -> bool:
         """
         等待GRVT订单成交。
@@ -349,7 +961,6 @@ class TradingExecutor:
         Returns:
             bool: 是否成交
         """
-        import time
         start = time.time()
 
         while time.time() - start < timeout:
@@ -359,7 +970,7 @@ class TradingExecutor:
                 if order_info and order_info.status == 'FILLED':
                     return True
 
-                if order_info and order_info.status in ['CANCELLED', 'REJECTED']:
+                if order_info and order_info.status in ['CANCELED', 'CANCELLED', 'REJECTED', 'EXPIRED']:
                     return False
 
                 await asyncio.sleep(0.5)
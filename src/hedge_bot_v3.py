@@ -3,6 +3,7 @@
 
 架构：
 ├── SafetyChecker (纯函数 - 安全检查)
+├── SafetyWatchdog (事件驱动 - 独立安全检查)
 ├── Rebalancer (纯函数 - 计算操作)
 ├── TradingExecutor (执行层 - 调用exchange)
 └── HedgeBot (协调器 - 主循环)
@@ -10,8 +11,10 @@
 
 import asyncio
 import logging
+import math
 import os
 import sys
+from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 from pathlib import Path
@@ -24,9 +27,13 @@ logging.getLogger('pysdk').setLevel(logging.ERROR)
 
 from exchanges.factory import ExchangeFactory
 from hedge.safety_checker import SafetyChecker, PositionState, SafetyAction
+from hedge.portfolio_risk import HedgePair, PortfolioRiskEngine
+from hedge.safety_watchdog import SafetyWatchdog
 from hedge.rebalancer import Rebalancer, TradeAction
 from hedge.trading_executor import TradingExecutor
 from hedge.phase_detector import PhaseDetector, TradingPhase
+from hedge.hold_scheduler import HoldScheduler
+from hedge.reconciler import AccountReconciler
 from helpers.pushover_notifier import PushoverNotifier
 
 
@@ -55,7 +62,34 @@ class HedgeBotV3:
         )
 
         # 初始化模块
-        self.executor = TradingExecutor(self.exchange_a, self.exchange_b, self.logger)
+        self.executor = TradingExecutor(
+            self.exchange_a,
+            self.exchange_b,
+            self.logger,
+            chase_enabled=self.chase_enabled,
+            chase_distance_ticks=self.chase_distance_ticks,
+            max_requotes_per_second=self.max_requotes_per_second,
+            hedge_max_slippage=self.hedge_max_slippage,
+            exchange_a_taker_fee=self.exchange_a_taker_fee,
+            exchange_b_taker_fee=self.exchange_b_taker_fee
+        )
+        self.portfolio = self._init_portfolio_risk()
+        self.watchdog = SafetyWatchdog(
+            self.executor,
+            self.max_position_per_side,
+            self.max_total_position,
+            self.max_imbalance,
+            max_pending_per_side=self.build_pipeline_depth,
+            max_notional_per_side=self.max_notional_per_side,
+            max_imbalance_notional=self.max_imbalance_notional,
+            max_margin_utilization=self.max_margin_utilization,
+            portfolio=self.portfolio,
+            logger=self.logger
+        )
+        self._watchdog_task = None
+        self.reconcilers = []
+        self._reconciler_tasks = []
+        self.hold_scheduler = HoldScheduler(self.hold_time)
         self.notifier = PushoverNotifier()
 
     def _setup_logger(self):
@@ -91,15 +125,79 @@ class HedgeBotV3:
         if self.direction not in ["long", "short"]:
             raise ValueError(f"Invalid TRADING_DIRECTION: {self.direction}. Must be 'long' or 'short'")
 
+        # 追单参数：做市单跟随盘口改价
+        self.chase_enabled = os.getenv("CHASE_ENABLED", "true").lower() == "true"
+        self.chase_distance_ticks = int(os.getenv("CHASE_DISTANCE_TICKS", "1"))
+        self.max_requotes_per_second = float(os.getenv("CHASE_MAX_REQUOTES_PER_SEC", "2"))
+
+        # 流水线建仓：同时挂单数（1 = 逐笔建仓）和相邻挂单价差(tick)
+        self.build_pipeline_depth = max(1, int(os.getenv("BUILD_PIPELINE_DEPTH", "1")))
+        self.build_pipeline_stagger_ticks = int(os.getenv("BUILD_PIPELINE_STAGGER_TICKS", "1"))
+
+        # 仓位账本：成交推送增量更新仓位，定期用REST校正
+        self.position_ledger_enabled = os.getenv("POSITION_LEDGER_ENABLED", "true").lower() == "true"
+        self.position_reconcile_interval = float(os.getenv("POSITION_RECONCILE_INTERVAL", "30"))
+
+        # 后台对账：定期用REST校验并修复缓存的仓位和挂单
+        self.account_reconcile_interval = float(os.getenv("ACCOUNT_RECONCILE_INTERVAL", "10"))
+
+        # 盘口报价最大年龄（秒），超过则拒绝用该报价定价
+        self.max_quote_age = float(os.getenv("MAX_QUOTE_AGE", "5"))
+
+        # 每个行情/订单流的独立WebSocket连接数（Lighter/GRVT），2 = 热备冗余，先到先用
+        self.ws_connections = int(os.getenv("WS_CONNECTIONS", "1"))
+
+        # 对冲腿taker单最大滑点（比例）
+        self.hedge_max_slippage = Decimal(os.getenv("HEDGE_MAX_SLIPPAGE", "0.005"))
+
+        # 再平衡路由：各交易所taker费率（比例）和每秒RTT折算成本
+        self.exchange_a_taker_fee = Decimal(os.getenv("EXCHANGE_A_TAKER_FEE", "0.0005"))
+        self.exchange_b_taker_fee = Decimal(os.getenv("EXCHANGE_B_TAKER_FEE", "0"))
+        self.rebalance_rtt_cost = Decimal(os.getenv("REBALANCE_RTT_COST", "0.0005"))
+
         # 安全参数
         self.max_position_per_side = self.order_quantity * self.target_cycles * Decimal("1.5")
         self.max_total_position = self.order_quantity * self.target_cycles * Decimal("1.5")
-        self.max_imbalance = self.order_quantity * Decimal("3")
+        # 流水线建仓时最多 build_pipeline_depth 笔成交同时等待对冲，不平衡上限随深度放宽（深度1时为3倍单量）
+        self.max_imbalance = self.order_quantity * (self.build_pipeline_depth + 2)
+
+        # 名义价值(USD)和保证金限额，按WebSocket缓存的标记价格/保证金计算；不设置则不检查
+        max_notional_per_side = os.getenv("MAX_NOTIONAL_PER_SIDE")
+        max_imbalance_notional = os.getenv("MAX_IMBALANCE_NOTIONAL")
+        max_margin_utilization = os.getenv("MAX_MARGIN_UTILIZATION")
+        self.max_notional_per_side = Decimal(max_notional_per_side) if max_notional_per_side else None
+        self.max_imbalance_notional = Decimal(max_imbalance_notional) if max_imbalance_notional else None
+        self.max_margin_utilization = Decimal(max_margin_utilization) if max_margin_utilization else None
+
+        # 组合风控限额(USD)：单个交易所仓位名义价值之和、币种净敞口；不设置则不限制
+        max_venue_gross_notional = os.getenv("MAX_VENUE_GROSS_NOTIONAL")
+        max_symbol_net_notional = os.getenv("MAX_SYMBOL_NET_NOTIONAL")
+        self.max_venue_gross_notional = Decimal(max_venue_gross_notional) if max_venue_gross_notional else None
+        self.max_symbol_net_notional = Decimal(max_symbol_net_notional) if max_symbol_net_notional else None
 
         # 为每个交易所准备配置
         self.exchange_a_config = self._prepare_exchange_config(self.exchange_a_name)
         self.exchange_b_config = self._prepare_exchange_config(self.exchange_b_name)
 
+    def _init_portfolio_risk(self) -> PortfolioRiskEngine:
+        """组合风控引擎：本交易对的限额与SafetyChecker一致，另加交易所/币种名义敞口限额"""
+        pair = HedgePair(
+            symbol=self.symbol,
+            exchange_a=self.exchange_a_name.lower(),
+            exchange_b=self.exchange_b_name.lower(),
+            max_position_per_side=self.max_position_per_side,
+            max_total_position=self.max_total_position,
+            max_imbalance=self.max_imbalance,
+            max_pending_per_side=self.build_pipeline_depth
+        )
+        portfolio = PortfolioRiskEngine([pair])
+        if self.max_venue_gross_notional is not None:
+            for venue in portfolio.venues:
+                portfolio.set_venue_limit(venue, self.max_venue_gross_notional)
+        if self.max_symbol_net_notional is not None:
+            portfolio.set_symbol_limit(self.symbol, self.max_symbol_net_notional)
+        return portfolio
+
     def _prepare_exchange_config(self, exchange_name: str) -> Config:
         """为指定交易所准备配置"""
         exchange_name = exchange_name.upper()
@@ -108,6 +206,8 @@ class HedgeBotV3:
         base_config = {
             "ticker": self.symbol,
             "quantity": self.order_quantity,
+            "max_quote_age": self.max_quote_age,
+            "ws_connections": self.ws_connections,
         }
 
         # 根据交易所转换symbol格式和设置contract_id
@@ -191,6 +291,22 @@ class HedgeBotV3:
         await self.exchange_b.connect()
         self.logger.info(f"✓ {self.exchange_b_name} connected")
 
+        # 安全看门狗：每个仓位/订单事件都重新检查，不受主循环阻塞影响
+        self.exchange_a.add_account_listener(self.watchdog.notify)
+        self.exchange_b.add_account_listener(self.watchdog.notify)
+        if self.position_ledger_enabled:
+            self.executor.enable_position_ledgers(self.position_reconcile_interval)
+        self._watchdog_task = asyncio.create_task(self.watchdog.run())
+
+        # 后台对账任务，每个交易所一个
+        self.reconcilers = [
+            AccountReconciler(self.exchange_a, self.exchange_a_name.lower(), self.executor.ledger_a,
+                              interval=self.account_reconcile_interval, logger=self.logger),
+            AccountReconciler(self.exchange_b, self.exchange_b_name.lower(), self.executor.ledger_b,
+                              interval=self.account_reconcile_interval, logger=self.logger),
+        ]
+        self._reconciler_tasks = [asyncio.create_task(r.run()) for r in self.reconcilers]
+
     async def run(self):
         """主循环"""
         try:
@@ -205,6 +321,7 @@ class HedgeBotV3:
                 # ========== 步骤1: 获取真实状态 ==========
                 position = await self.executor.get_positions()
                 pending_orders = await self.executor.get_pending_orders()
+                market = self.executor.get_market_state()
 
                 # ========== 步骤2: 安全检查 ==========
                 safety_result = SafetyChecker.check_all(
@@ -213,7 +330,12 @@ class HedgeBotV3:
                     self.max_total_position,
                     self.max_imbalance,
                     pending_orders=pending_orders,
-                    max_pending_per_side=1
+                    max_pending_per_side=self.build_pipeline_depth,
+                    market=market,
+                    max_notional_per_side=self.max_notional_per_side,
+                    max_imbalance_notional=self.max_imbalance_notional,
+                    max_margin_utilization=self.max_margin_utilization,
+                    portfolio=self.portfolio
                 )
 
                 # 根据安全检查结果执行对应操作（纯编排）
@@ -245,26 +367,34 @@ class HedgeBotV3:
                     # 通过调整Lighter仓位来实现（市价单立即成交）
                     target_position = Decimal(0)
 
-                    rebalance_instruction = Rebalancer.calculate_rebalance(
+                    # 按可成交深度拆分子订单，一次性处理全部不平衡，
+                    # 再按费率/RTT/深度把每个子订单路由到成本最低的交易所
+                    if target_position > position.total_position:
+                        rebalance_action = TradeAction.CLOSE_SHORT  # 买入
+                    else:
+                        rebalance_action = TradeAction.BUILD_SHORT  # 卖出
+                    venues = await self.executor.get_venue_stats(rebalance_action)
+                    known_depths = [v.depth for v in venues if v.can_take and v.depth is not None]
+                    available_depth = max(known_depths) if known_depths else None
+
+                    rebalance_plan = Rebalancer.plan_rebalance(
                         current_position=position,
                         target_total_position=target_position,
                         order_size=self.order_quantity,
-                        tolerance=rebalance_threshold
+                        tolerance=rebalance_threshold,
+                        available_depth=available_depth
                     )
+                    rebalance_plan = Rebalancer.route_plan(rebalance_plan, venues, self.rebalance_rtt_cost)
 
-                    if rebalance_instruction.action != TradeAction.HOLD:
+                    if not rebalance_plan.is_empty:
                         self.logger.warning(f"⚖️  REBALANCING: Imbalance={position.imbalance}")
-                        self.logger.warning(f"   {rebalance_instruction.reason}")
+                        self.logger.warning(f"   {rebalance_plan.reason}")
 
-                        result = await self.executor.execute_trade(
-                            rebalance_instruction.action,
-                            rebalance_instruction.quantity,
-                            wait_for_fill=False,  # Lighter市价单不需要等待
-                            fill_timeout=30
-                        )
+                        results = await self.executor.execute_rebalance_plan(rebalance_plan)
 
-                        if not result.success:
-                            self.logger.error(f"   Rebalance failed: {result.error}")
+                        for result in results:
+                            if not result.success:
+                                self.logger.error(f"   Rebalance slice failed: {result.error}")
 
                         await asyncio.sleep(2)
                         continue  # 打平后重新开始，跳过阶段判断和正常交易
@@ -273,10 +403,14 @@ class HedgeBotV3:
                 # 根据策略方向确定BUILD阶段的交易方向
                 build_side = "buy" if self.direction == "long" else "sell"
 
-                # 尝试获取最后成交订单(如果交易所支持)
+                # 仓位回到0：本轮持仓结束，下一笔建仓成交重新计时
+                if abs(position.exchange_a_position) < self.order_quantity * Decimal("0.1"):
+                    self.hold_scheduler.disarm()
+
+                # 持仓计时器未设置时（例如重启后）从最后成交订单恢复(如果交易所支持)
                 last_order_side = None
                 last_order_time = None
-                if hasattr(self.exchange_a, 'get_last_filled_order'):
+                if not self.hold_scheduler.armed and hasattr(self.exchange_a, 'get_last_filled_order'):
                     try:
                         last_order = await self.exchange_a.get_last_filled_order(
                             contract_id=self.exchange_a.config.contract_id,
@@ -284,6 +418,9 @@ class HedgeBotV3:
                         )
                         if last_order:
                             last_order_side, last_order_time = last_order
+                            self.hold_scheduler.arm(
+                                elapsed=(datetime.utcnow() - last_order_time).total_seconds()
+                            )
                     except Exception as e:
                         self.logger.debug(f"Failed to get last filled order: {e}")
                         # 继续执行,不影响主流程
@@ -294,7 +431,8 @@ class HedgeBotV3:
                     order_size=self.order_quantity,
                     hold_time=self.hold_time,
                     last_order_side=last_order_side,
-                    last_order_time=last_order_time
+                    last_order_time=last_order_time,
+                    hold_elapsed=self.hold_scheduler.elapsed()
                 )
 
                 self.logger.info(f"📍 Phase: {phase_info.phase.value} | Last order: {last_order_side} | {phase_info.reason}")
@@ -307,6 +445,10 @@ class HedgeBotV3:
                     # 持仓等待中，不执行交易
                     if phase_info.time_remaining:
                         self.logger.info(f"⏳ HOLDING: {phase_info.time_remaining}s remaining")
+                    if self.hold_scheduler.armed:
+                        # 精确睡到截止时间，期间不请求API（安全检查由看门狗负责）
+                        await self.hold_scheduler.wait()
+                        continue
                     await asyncio.sleep(min(10, phase_info.time_remaining or 10))
 
                 elif phase_info.phase == TradingPhase.WINDING_DOWN:
@@ -338,6 +480,10 @@ class HedgeBotV3:
             self.logger.info(f"📈 BUILDING (SHORT): {self.exchange_a_name} sell + {self.exchange_b_name} buy {self.order_quantity}")
             action = TradeAction.CLOSE_LONG
 
+        if self.build_pipeline_depth > 1:
+            await self._run_pipelined_build(action, position)
+            return
+
         result = await self.executor.execute_trade(
             action=action,
             quantity=self.order_quantity,
@@ -345,10 +491,38 @@ class HedgeBotV3:
             fill_timeout=30
         )
 
-        if not result.success:
+        if result.success:
+            # 建仓成交：持仓从这一刻开始计时
+            self.hold_scheduler.arm()
+        else:
             self.logger.warning(f"   Trade failed: {result.error}, retrying in 5s...")
             await asyncio.sleep(5)
 
+    async def _run_pipelined_build(self, action: TradeAction, position: PositionState):
+        """流水线建仓：同时挂多笔做市单，剩余目标仓位一次性挂出，每笔成交立即对冲"""
+        remaining = self.order_quantity * self.target_cycles - abs(position.exchange_a_position)
+        if remaining <= 0:
+            return
+
+        rounds = math.ceil(math.ceil(remaining / self.order_quantity) / self.build_pipeline_depth)
+        result = await self.executor.execute_pipelined_build(
+            action=action,
+            order_quantity=self.order_quantity,
+            total_quantity=remaining,
+            max_in_flight=self.build_pipeline_depth,
+            stagger_ticks=self.build_pipeline_stagger_ticks,
+            timeout=30 * rounds
+        )
+
+        if result.filled_quantity > 0:
+            # 建仓成交：持仓从最后一笔成交开始计时
+            self.hold_scheduler.arm()
+        if not result.success:
+            self.logger.warning(f"   Pipelined build incomplete: filled {result.filled_quantity}, "
+                                f"hedged {result.hedged_quantity}, hedge failures {result.hedge_failures}, "
+                                f"retrying in 5s...")
+            await asyncio.sleep(5)
+
     async def _handle_winddown_phase(self, position: PositionState):
         """处理平仓阶段 - 执行固定的对冲交易"""
         if self.direction == "long":
@@ -375,6 +549,12 @@ class HedgeBotV3:
         """清理资源"""
         try:
             self.logger.info("Cleaning up...")
+            if self._watchdog_task:
+                self.watchdog.stop()
+                self._watchdog_task.cancel()
+            for reconciler, task in zip(self.reconcilers, self._reconciler_tasks):
+                reconciler.stop()
+                task.cancel()
             await self.exchange_a.disconnect()
             await self.exchange_b.disconnect()
         except:
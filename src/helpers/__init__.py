@@ -3,5 +3,6 @@ Helper modules for perp-dex-tools.
 """
 
 from .logger import TradingLogger
+from .metrics import MetricsRegistry, metrics
 
-__all__ = ['TradingLogger']
+__all__ = ['TradingLogger', 'MetricsRegistry', 'metrics']
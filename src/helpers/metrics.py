@@ -0,0 +1,122 @@
+"""
+Lightweight in-process metrics: counters and histograms keyed by name.
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class Counter:
+    """Monotonic counter with a rate since creation."""
+
+    def __init__(self):
+        self.value = 0
+        self.start_time = time.time()
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        """Increment the counter."""
+        with self._lock:
+            self.value += amount
+
+    def rate(self) -> float:
+        """Average increments per second since creation."""
+        elapsed = time.time() - self.start_time
+        return self.value / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'value': self.value, 'rate': self.rate()}
+
+
+class Gauge:
+    """Point-in-time value."""
+
+    def __init__(self):
+        self.value: Optional[float] = None
+        self.update_time: Optional[float] = None
+
+    def set(self, value: float) -> None:
+        """Set the current value."""
+        self.value = value
+        self.update_time = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'value': self.value, 'update_time': self.update_time}
+
+
+class Histogram:
+    """Histogram over a bounded window of recent observations."""
+
+    def __init__(self, window: int = 1024):
+        self._values = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        with self._lock:
+            self._values.append(value)
+            self.count += 1
+            self.total += value
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Percentile (0-100) over the recent window."""
+        with self._lock:
+            values = sorted(self._values)
+        if not values:
+            return None
+        index = min(len(values) - 1, max(0, int(round(p / 100 * (len(values) - 1)))))
+        return values[index]
+
+    def mean(self) -> Optional[float]:
+        """Mean over all observations."""
+        return self.total / self.count if self.count else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean': self.mean(),
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.percentile(100),
+        }
+
+
+class MetricsRegistry:
+    """Get-or-create registry of named metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, metric_type):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_type()
+                self._metrics[name] = metric
+            elif not isinstance(metric, metric_type):
+                raise ValueError(f"Metric {name} already registered as {type(metric).__name__}")
+            return metric
+
+    def counter(self, name: str) -> Counter:
+        return self._get(name, Counter)
+
+    def gauge(self, name: str) -> Gauge:
+        return self._get(name, Gauge)
+
+    def histogram(self, name: str) -> Histogram:
+        return self._get(name, Histogram)
+
+    def snapshot(self, prefix: str = '') -> Dict[str, Dict[str, Any]]:
+        """Snapshot all metrics whose name starts with prefix."""
+        with self._lock:
+            items = list(self._metrics.items())
+        return {name: metric.snapshot() for name, metric in items if name.startswith(prefix)}
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
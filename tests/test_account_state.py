@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+账户状态缓存测试 - 已结束订单淘汰和对账标志，不需要API keys
+"""
+
+import sys
+import os
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from exchanges.account_state import AccountStateCache
+from exchanges.base import OrderInfo
+
+
+def make_order(order_id, status):
+    return OrderInfo(order_id=order_id, side="buy", size=Decimal("1"), price=Decimal("100"), status=status)
+
+
+def test_closed_orders_evicted_oldest_first():
+    cache = AccountStateCache(max_closed_orders=2)
+    cache.upsert_order(make_order("open", "OPEN"))
+    for order_id in ("a", "b", "c"):
+        cache.upsert_order(make_order(order_id, "FILLED"))
+
+    # 只保留最近2个已结束订单，挂单不受影响
+    assert cache.get_order("a") is None
+    assert cache.get_order("b") is not None and cache.get_order("c") is not None
+    assert [order.order_id for order in cache.get_open_orders()] == ["open"]
+
+
+def test_reopened_order_not_evicted():
+    cache = AccountStateCache(max_closed_orders=1)
+    cache.upsert_order(make_order("a", "CANCELED"))
+    cache.upsert_order(make_order("a", "PARTIALLY_FILLED"))
+    cache.upsert_order(make_order("b", "FILLED"))
+    cache.upsert_order(make_order("c", "FILLED"))
+
+    assert cache.get_order("a").status == "PARTIALLY_FILLED"
+    assert cache.get_order("b") is None
+
+
+def test_reconcile_flags():
+    cache = AccountStateCache()
+    # 流未就绪时总是需要对账
+    assert cache.needs_reconcile("orders", interval=60)
+
+    cache.mark_stream_live()
+    cache.mark_reconciled("orders")
+    assert not cache.needs_reconcile("orders", interval=60)
+    assert cache.needs_reconcile("orders", interval=0)
+    assert cache.needs_reconcile("positions", interval=60)
+
+    # REST快照只在流在线时标记订单集就绪
+    cache.replace_open_orders([make_order("a", "OPEN")])
+    assert cache.orders_ready
+
+    cache.invalidate()
+    assert not cache.stream_live and not cache.orders_ready
+    assert cache.needs_reconcile("orders", interval=60)
+
+    cache.mark_stream_live()
+    cache.expire_reconcile()
+    assert cache.needs_reconcile("orders", interval=60)
+
+
+def test_replace_open_orders_drops_missing():
+    cache = AccountStateCache()
+    cache.upsert_order(make_order("a", "OPEN"))
+    cache.upsert_order(make_order("b", "OPEN"))
+
+    cache.replace_open_orders([make_order("b", "OPEN")])
+
+    assert [order.order_id for order in cache.get_open_orders()] == ["b"]
+    assert not cache.orders_ready
+
+
+if __name__ == "__main__":
+    test_closed_orders_evicted_oldest_first()
+    test_reopened_order_not_evicted()
+    test_reconcile_flags()
+    test_replace_open_orders_drops_missing()
+    print("✅ All account state tests passed!")
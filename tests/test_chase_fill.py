@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+追单测试 - 部分成交后超时，撤单并对冲已成交部分，不需要API keys
+"""
+
+import asyncio
+import sys
+import time
+import os
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from exchanges.base import BaseExchangeClient, OrderInfo, OrderResult
+from hedge.rebalancer import TradeAction
+from hedge.trading_executor import TradingExecutor
+
+
+class FakeMaker:
+    """每个订单成交0.3后不再成交；盘口每次查询上移一个tick，触发追单"""
+    supports_concurrent_orders = False
+    supports_amend = False
+    supports_taker = False
+
+    def __init__(self, moving_book=False):
+        self.config = SimpleNamespace(contract_id="BNB", tick_size=Decimal("0.01"))
+        self.moving_book = moving_book
+        self.bid = Decimal("100")
+        self.orders = {}
+        self.cancelled = []
+
+    def get_exchange_name(self):
+        return "maker"
+
+    def round_to_tick(self, price):
+        return Decimal(price).quantize(self.config.tick_size)
+
+    def _new_order(self, quantity, price):
+        order_id = str(len(self.orders) + 1)
+        self.orders[order_id] = {"quantity": quantity, "price": price, "status": "OPEN"}
+        return OrderResult(success=True, order_id=order_id, side="buy", size=quantity, price=price, status="OPEN")
+
+    async def place_open_order(self, contract_id, quantity, direction):
+        return self._new_order(quantity, Decimal("100.09"))
+
+    async def fetch_bbo_prices(self, contract_id):
+        if self.moving_book:
+            self.bid += self.config.tick_size
+        return self.bid, self.bid + Decimal("0.1")
+
+    async def get_order_info(self, order_id):
+        order = self.orders[order_id]
+        filled = min(Decimal("0.3"), order["quantity"])
+        status = order["status"] if order["status"] != "OPEN" else "PARTIALLY_FILLED"
+        return OrderInfo(order_id=order_id, side="buy", size=order["quantity"], price=order["price"],
+                         status=status, filled_size=filled, remaining_size=order["quantity"] - filled)
+
+    async def cancel_order(self, order_id):
+        self.orders[order_id]["status"] = "CANCELED"
+        self.cancelled.append(order_id)
+        return OrderResult(success=True, order_id=order_id)
+
+    async def modify_order(self, order_id, price, quantity, side):
+        # 只追一次，之后盘口不再移动
+        self.moving_book = False
+        await self.cancel_order(order_id)
+        result = self._new_order(quantity, price)
+        result.filled_size = Decimal("0.3")
+        return result
+
+
+class FailingReplaceMaker(FakeMaker):
+    """撤单重挂时新单下单失败"""
+    modify_order = BaseExchangeClient.modify_order
+
+    async def place_close_order(self, contract_id, quantity, price, side):
+        return OrderResult(success=False, error_message="post-only rejected")
+
+
+class FakeHedge:
+    supports_taker = True
+
+    def __init__(self):
+        self.hedges = []
+
+    def get_exchange_name(self):
+        return "hedge"
+
+    async def place_taker_order(self, quantity, side, max_slippage):
+        self.hedges.append((side, quantity))
+        return OrderResult(success=True, order_id="h1", side=side, size=quantity,
+                           price=Decimal("100"), filled_size=quantity)
+
+
+def test_partial_fill_hedged_on_timeout():
+    maker, hedger = FakeMaker(), FakeHedge()
+    executor = TradingExecutor(maker, hedger, poll_interval=0.01, max_requotes_per_second=0)
+
+    result = asyncio.run(executor.execute_trade(TradeAction.BUILD_LONG, Decimal("1"), fill_timeout=0.1))
+
+    assert not result.success
+    # 超时后撤单，并对冲已成交的0.3
+    assert maker.cancelled == ["1"]
+    assert hedger.hedges == [("sell", Decimal("0.3"))]
+    assert result.exchange_b_order_id == "h1"
+
+
+def test_fills_on_replaced_orders_counted():
+    maker, hedger = FakeMaker(moving_book=True), FakeHedge()
+    executor = TradingExecutor(maker, hedger, poll_interval=0.01, max_requotes_per_second=0)
+
+    order = asyncio.run(maker.place_open_order("BNB", Decimal("1"), "buy"))
+    chase = asyncio.run(executor._fill_maker_order(order, "buy", Decimal("1"), timeout=0.1))
+
+    assert not chase.filled
+    assert chase.requotes == 1
+    # 被替换订单成交0.3 + 新订单成交0.3
+    assert chase.filled_quantity == Decimal("0.6")
+    assert maker.cancelled == ["1", "2"]
+
+
+def test_failed_replace_stops_chase():
+    maker, hedger = FailingReplaceMaker(moving_book=True), FakeHedge()
+    executor = TradingExecutor(maker, hedger, poll_interval=0.01, max_requotes_per_second=0)
+
+    order = asyncio.run(maker.place_open_order("BNB", Decimal("1"), "buy"))
+    chase = asyncio.run(executor._fill_maker_order(order, "buy", Decimal("1"), timeout=5))
+
+    # 原订单已撤销：立即结束追单，报告原订单的成交
+    assert not chase.filled
+    assert chase.order_id == "1"
+    assert chase.filled_quantity == Decimal("0.3")
+    assert maker.cancelled == ["1"]
+
+
+def test_wait_for_fill_stops_on_canceled():
+    maker, hedger = FakeMaker(), FakeHedge()
+    executor = TradingExecutor(maker, hedger, chase_enabled=False)
+
+    order = asyncio.run(maker.place_open_order("BNB", Decimal("1"), "buy"))
+    maker.orders["1"]["status"] = "CANCELED"
+    start = time.time()
+    chase = asyncio.run(executor._fill_maker_order(order, "buy", Decimal("1"), timeout=5))
+
+    # 交易所已撤单：不等到超时
+    assert time.time() - start < 1
+    assert not chase.filled
+    assert chase.filled_quantity == Decimal("0.3")
+
+
+if __name__ == "__main__":
+    test_partial_fill_hedged_on_timeout()
+    test_fills_on_replaced_orders_counted()
+    test_failed_replace_stops_chase()
+    test_wait_for_fill_stops_on_canceled()
+    print("✅ All chase fill tests passed!")
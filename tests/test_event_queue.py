@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+事件队列测试 - 合并行情、不丢订单事件、满队列背压
+"""
+
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from exchanges.event_queue import ConflatingEventQueue
+
+
+def test_latest_bbo_conflated_and_orders_kept():
+    queue = ConflatingEventQueue("test_conflate")
+    queue.put_latest("BTC", ("bbo", 1))
+
+    async def run():
+        await queue.put(("order", "a"))
+        queue.put_latest("BTC", ("bbo", 2))
+        queue.put_latest("BTC", ("bbo", 3))
+        await queue.put(("order", "b"))
+        return [queue.get_nowait() for _ in range(len(queue))]
+
+    events = asyncio.run(run())
+    # BBO保留第一次入队的位置，取最新的值；订单事件全部按顺序保留
+    assert events == [("bbo", 3), ("order", "a"), ("order", "b")]
+    assert queue.conflated.value == 2
+    assert queue.lag.count == 3
+
+
+def test_discard_drops_pending_snapshot():
+    queue = ConflatingEventQueue("test_discard")
+    queue.put_latest("BTC", "stale")
+    queue.discard("BTC")
+    assert len(queue) == 0
+
+
+def test_full_queue_applies_backpressure():
+    queue = ConflatingEventQueue("test_backpressure", maxsize=2)
+    handled = []
+
+    async def run():
+        for i in range(2):
+            await queue.put(i)
+        blocked = asyncio.create_task(queue.put(2))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        consumer = asyncio.create_task(queue.run(handled.append))
+        await blocked
+        await asyncio.sleep(0.01)
+        consumer.cancel()
+
+    asyncio.run(run())
+    assert handled == [0, 1, 2]
+    assert queue.backpressure.value == 1
+
+
+if __name__ == "__main__":
+    test_latest_bbo_conflated_and_orders_kept()
+    test_discard_drops_pending_snapshot()
+    test_full_queue_applies_backpressure()
+    print("✅ All event queue tests passed!")
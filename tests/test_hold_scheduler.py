@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+持仓计时器测试 - 不需要API keys
+"""
+
+import asyncio
+import sys
+import os
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from hedge.hold_scheduler import HoldScheduler
+from hedge.phase_detector import PhaseDetector, TradingPhase
+from hedge.safety_checker import PositionState
+
+
+def test_arm_and_elapsed_with_fake_clock():
+    now = [100.0]
+    scheduler = HoldScheduler(hold_time=180, clock=lambda: now[0])
+    assert not scheduler.armed and scheduler.remaining() is None
+
+    scheduler.arm(elapsed=30)
+    now[0] += 100
+    assert scheduler.elapsed() == 130
+    assert scheduler.remaining() == 50
+    assert not scheduler.is_due()
+
+    now[0] += 50
+    assert scheduler.is_due()
+
+
+def test_wait_wakes_at_deadline():
+    scheduler = HoldScheduler(hold_time=0.05)
+
+    async def run():
+        scheduler.arm()
+        start = time.monotonic()
+        reached = await scheduler.wait()
+        return reached, time.monotonic() - start
+
+    reached, waited = asyncio.run(run())
+    assert reached
+    assert 0.04 <= waited < 0.5
+
+
+def test_disarm_interrupts_wait():
+    scheduler = HoldScheduler(hold_time=10)
+
+    async def run():
+        scheduler.arm()
+        asyncio.get_running_loop().call_later(0.01, scheduler.disarm)
+        return await asyncio.wait_for(scheduler.wait(), timeout=1)
+
+    assert asyncio.run(run()) is False
+
+
+def test_phase_detector_uses_hold_elapsed():
+    position = PositionState(exchange_a_position=Decimal("0.5"), exchange_b_position=Decimal("-0.5"))
+    holding = PhaseDetector.detect_phase(position, 5, Decimal("0.1"), hold_time=180, hold_elapsed=100)
+    assert holding.phase == TradingPhase.HOLDING
+    assert holding.time_remaining == 80
+
+    due = PhaseDetector.detect_phase(position, 5, Decimal("0.1"), hold_time=180, hold_elapsed=180)
+    assert due.phase == TradingPhase.WINDING_DOWN
+
+
+if __name__ == "__main__":
+    test_arm_and_elapsed_with_fake_clock()
+    test_wait_wakes_at_deadline()
+    test_disarm_interrupts_wait()
+    test_phase_detector_uses_hold_elapsed()
+    print("✅ All hold scheduler tests passed!")
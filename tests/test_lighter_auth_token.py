@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Lighter认证token缓存测试 - TTL内复用，临近过期才重新签发，不需要API keys
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+pytest.importorskip("lighter")
+
+from exchanges.lighter import LighterClient
+from helpers.metrics import metrics
+
+
+class FakeSigner:
+    def __init__(self):
+        self.expiries = []
+
+    def create_auth_token_with_expiry(self, expiry):
+        self.expiries.append(expiry)
+        return f"token-{len(self.expiries)}", None
+
+
+def make_client():
+    # 跳过__init__，不需要私钥和网络
+    client = LighterClient.__new__(LighterClient)
+    client.lighter_client = FakeSigner()
+    client.logger = SimpleNamespace(log=lambda *args, **kwargs: None)
+    client._auth_token = None
+    client._auth_token_expiry = 0.0
+    client.auth_token_ttl = 600
+    client.auth_token_refresh_margin = 60
+    client.auth_token_mints = metrics.counter('lighter.auth_token.mints')
+    client.auth_token_hits = metrics.counter('lighter.auth_token.cache_hits')
+    return client
+
+
+def test_token_reused_until_refresh_margin():
+    client = make_client()
+    mints = client.auth_token_mints.value
+    hits = client.auth_token_hits.value
+
+    with patch("exchanges.lighter.time.time", return_value=1000.0):
+        assert client._get_auth_token() == "token-1"
+    assert client.lighter_client.expiries == [1600]
+
+    # TTL减去刷新余量之前一直复用
+    with patch("exchanges.lighter.time.time", return_value=1539.0):
+        assert client._get_auth_token() == "token-1"
+
+    # 进入刷新余量后重新签发
+    with patch("exchanges.lighter.time.time", return_value=1540.0):
+        assert client._get_auth_token() == "token-2"
+
+    assert client.auth_token_mints.value - mints == 2
+    assert client.auth_token_hits.value - hits == 1
+
+
+def test_token_error_raises():
+    client = make_client()
+    client.lighter_client.create_auth_token_with_expiry = lambda expiry: (None, "bad key")
+
+    with pytest.raises(ValueError):
+        client._get_auth_token()
+    assert client._auth_token is None
+
+
+if __name__ == "__main__":
+    test_token_reused_until_refresh_margin()
+    test_token_error_raises()
+    print("✅ All Lighter auth token tests passed!")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Maker下单引擎测试 - 挂单定价、被拒后退避、状态透传和重复挂单检查，不需要API keys
+"""
+
+import sys
+import os
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from exchanges.base import BaseExchangeClient, OrderInfo, OrderResult
+from exchanges.maker_engine import MakerOrderEngine
+
+
+class FakeClient:
+    """按顺序返回预设结果的交易所"""
+
+    round_to_tick = BaseExchangeClient.round_to_tick
+
+    def __init__(self, results, order_info=None):
+        self.config = SimpleNamespace(tick_size=Decimal("0.1"))
+        self.results = list(results)
+        self.order_info = order_info
+        self.prices = []
+
+    async def fetch_bbo_prices(self, contract_id):
+        return Decimal("100"), Decimal("101")
+
+    async def get_order_info(self, order_id):
+        return self.order_info
+
+    async def _submit_post_only_order(self, contract_id, quantity, price, side):
+        self.prices.append(price)
+        return self.results.pop(0)
+
+
+def test_maker_price():
+    engine = MakerOrderEngine(FakeClient([]), "test_maker_price")
+    bid, ask = Decimal("100"), Decimal("101")
+
+    # 无指定价格：对手价内一个tick
+    assert engine.maker_price("buy", bid, ask) == Decimal("100.9")
+    assert engine.maker_price("sell", bid, ask) == Decimal("100.1")
+    # 指定价格不穿价则保留，穿价则拉回
+    assert engine.maker_price("sell", bid, ask, price=Decimal("102")) == Decimal("102")
+    assert engine.maker_price("sell", bid, ask, price=Decimal("99")) == Decimal("100.1")
+    # 每个退避tick再远离对手价一个tick
+    assert engine.maker_price("buy", bid, ask, backoff_ticks=2) == Decimal("100.7")
+
+
+def test_backoff_on_repeated_rejection():
+    rejected = OrderResult(success=False, status="REJECTED")
+    client = FakeClient([rejected, rejected, rejected, OrderResult(success=True, order_id="1", status="OPEN")])
+    engine = MakerOrderEngine(client, "test_maker_backoff", max_backoff_ticks=1, status_check_delay=0)
+
+    result = asyncio.run(engine.place("ETH", Decimal("1"), "buy"))
+
+    assert result.success
+    # 同一盘口连续被拒：第二次后退一个tick，且不超过max_backoff_ticks
+    assert client.prices == [Decimal("100.9"), Decimal("100.9"), Decimal("100.8"), Decimal("100.8")]
+    assert engine.get_stats()["attempts"] == 4
+    assert engine.get_stats()["rejection_rate"] == 0.75
+
+
+def test_partial_fill_status_passed_through():
+    order_info = OrderInfo(order_id="1", side="buy", size=Decimal("1"), price=Decimal("100.9"),
+                           status="PARTIALLY_FILLED", filled_size=Decimal("0.4"))
+    client = FakeClient([OrderResult(success=True, order_id="1")], order_info=order_info)
+    engine = MakerOrderEngine(client, "test_maker_partial", status_check_delay=0)
+
+    result = asyncio.run(engine.place("ETH", Decimal("1"), "buy"))
+
+    assert result.success
+    assert result.status == "PARTIALLY_FILLED"
+    assert result.filled_size == Decimal("0.4")
+
+
+def test_filled_status_reports_full_size():
+    client = FakeClient([OrderResult(success=True, order_id="1", status="FILLED")])
+    engine = MakerOrderEngine(client, "test_maker_filled", status_check_delay=0)
+
+    result = asyncio.run(engine.place("ETH", Decimal("2"), "sell"))
+
+    assert result.status == "FILLED"
+    assert result.filled_size == Decimal("2")
+
+
+class StackingClient(FakeClient):
+    """下单报告失败，但订单实际挂上了"""
+
+    def __init__(self, results):
+        super().__init__(results)
+        self.resting = 0
+
+    async def get_active_orders(self, contract_id):
+        return [OrderInfo(order_id=str(i), side="buy", size=Decimal("1"), price=Decimal("100"), status="OPEN")
+                for i in range(self.resting)]
+
+    async def _submit_post_only_order(self, contract_id, quantity, price, side):
+        self.resting += 1
+        return await super()._submit_post_only_order(contract_id, quantity, price, side)
+
+
+def test_guard_stops_stacked_orders():
+    client = StackingClient([OrderResult(success=False, status="REJECTED")] * 15)
+    engine = MakerOrderEngine(client, "test_maker_guard", status_check_delay=0, guard_active_orders=True)
+
+    with pytest.raises(Exception, match="abnormal"):
+        asyncio.run(engine.place("ETH", Decimal("1"), "buy"))
+    # 第5次尝试前检查：已有4笔多余挂单
+    assert len(client.prices) == 4
+
+
+if __name__ == "__main__":
+    test_maker_price()
+    test_backoff_on_repeated_rejection()
+    test_partial_fill_status_passed_through()
+    test_filled_status_reports_full_size()
+    test_guard_stops_stacked_orders()
+    print("✅ All maker engine tests passed!")
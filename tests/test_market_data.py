@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+行情工具测试 - 深度遍历、L2盘口和taker限价，不需要API keys
+"""
+
+import sys
+import os
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from exchanges.base import BaseExchangeClient
+from exchanges.market_data import L2Book, walk_levels
+
+
+def test_walk_levels_vwap():
+    levels = [(Decimal("100"), Decimal("1")), (Decimal("101"), Decimal("2")), (Decimal("102"), Decimal("5"))]
+
+    quote = walk_levels(levels, Decimal("2"))
+    assert quote.sufficient
+    assert quote.vwap == Decimal("100.5")
+    assert quote.worst_price == Decimal("101")
+    assert quote.levels == 2
+    assert quote.suggested_slices == 1
+
+
+def test_walk_levels_insufficient_depth():
+    levels = [(Decimal("100"), Decimal("1")), (Decimal("101"), Decimal("1"))]
+
+    quote = walk_levels(levels, Decimal("5"))
+    assert not quote.sufficient
+    assert quote.available == Decimal("2")
+    assert quote.suggested_slices == 3
+
+    limited = walk_levels(levels, Decimal("5"), max_levels=1)
+    assert limited.available == Decimal("1") and limited.levels == 1
+
+    assert walk_levels([], Decimal("1")).suggested_slices is None
+
+
+def test_l2_book_snapshot_and_delta():
+    book = L2Book()
+    book.apply_snapshot(bids=[("99", "1"), ("98", "2")], asks=[("101", "1"), ("102", "3")])
+    top = book.top_of_book()
+    assert (top.best_bid, top.best_ask, top.ask_size) == (Decimal("99"), Decimal("101"), Decimal("1"))
+
+    # size为0删除价位
+    book.apply_delta(bids=[("99", "0")], asks=[("100.5", "2")])
+    top = book.top_of_book()
+    assert (top.best_bid, top.best_ask) == (Decimal("98"), Decimal("100.5"))
+
+    # buy吃卖盘，从最优价开始
+    quote = book.walk("buy", Decimal("3"))
+    assert quote.worst_price == Decimal("101")
+    assert book.walk("sell", Decimal("1")).worst_price == Decimal("98")
+
+    book.apply_snapshot(bids=[], asks=[("101", "1")])
+    assert book.top_of_book() is None
+
+
+def test_taker_limit_price():
+    client = SimpleNamespace(config=SimpleNamespace(tick_size=Decimal("0.1")))
+    bid, ask = Decimal("100"), Decimal("101")
+
+    # 滑点价向内取整到tick，不会比对手价更优
+    assert BaseExchangeClient.get_taker_limit_price(client, "buy", bid, ask, Decimal("0.005")) == Decimal("101.5")
+    assert BaseExchangeClient.get_taker_limit_price(client, "sell", bid, ask, Decimal("0.005")) == Decimal("99.5")
+    assert BaseExchangeClient.get_taker_limit_price(client, "buy", bid, ask, Decimal("0.0001")) == ask
+    assert BaseExchangeClient.get_taker_limit_price(client, "sell", bid, ask, 0) == bid
+
+
+if __name__ == "__main__":
+    test_walk_levels_vwap()
+    test_walk_levels_insufficient_depth()
+    test_l2_book_snapshot_and_delta()
+    test_taker_limit_price()
+    print("✅ All market data tests passed!")
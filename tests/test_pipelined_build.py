@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+流水线建仓测试 - 使用假交易所客户端，不需要API keys
+"""
+
+import asyncio
+import sys
+import os
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from exchanges.base import OrderInfo, OrderResult
+from hedge.rebalancer import TradeAction
+from hedge.trading_executor import TradingExecutor
+
+
+class FakeMaker:
+    """每个订单在第二次查询时成交"""
+    supports_concurrent_orders = True
+    supports_amend = False
+    supports_taker = False
+
+    def __init__(self):
+        self.config = SimpleNamespace(contract_id="BNB", tick_size=Decimal("0.01"))
+        self.orders = {}
+        self.max_resting = 0
+
+    def get_exchange_name(self):
+        return "maker"
+
+    def round_to_tick(self, price):
+        return Decimal(price).quantize(self.config.tick_size)
+
+    async def fetch_bbo_prices(self, contract_id):
+        return Decimal("100"), Decimal("100.1")
+
+    async def place_close_order(self, contract_id, quantity, price, side):
+        order_id = str(len(self.orders) + 1)
+        self.orders[order_id] = {"quantity": quantity, "price": price, "polls": 0}
+        resting = sum(1 for o in self.orders.values() if o["polls"] < 2)
+        self.max_resting = max(self.max_resting, resting)
+        return OrderResult(success=True, order_id=order_id, side=side, size=quantity, price=price, status='OPEN')
+
+    async def get_order_info(self, order_id):
+        order = self.orders[order_id]
+        order["polls"] += 1
+        filled = order["quantity"] if order["polls"] >= 2 else Decimal(0)
+        status = 'FILLED' if filled == order["quantity"] else 'OPEN'
+        return OrderInfo(order_id=order_id, side='buy', size=order["quantity"], price=order["price"],
+                         status=status, filled_size=filled, remaining_size=order["quantity"] - filled)
+
+    async def cancel_order(self, order_id):
+        return OrderResult(success=True, order_id=order_id)
+
+
+class FakeHedge:
+    supports_taker = True
+    supports_concurrent_orders = True
+
+    def __init__(self):
+        self.hedges = []
+
+    def get_exchange_name(self):
+        return "hedge"
+
+    async def place_taker_order(self, quantity, side, max_slippage):
+        self.hedges.append((side, quantity))
+        return OrderResult(success=True, order_id=str(len(self.hedges)), side=side, size=quantity, price=Decimal("100"))
+
+
+class PartialHedge(FakeHedge):
+    """IOC单每次最多成交0.04"""
+
+    async def place_taker_order(self, quantity, side, max_slippage):
+        self.hedges.append((side, quantity))
+        filled = min(quantity, Decimal("0.04"))
+        return OrderResult(success=True, order_id=str(len(self.hedges)), side=side, size=quantity,
+                           price=Decimal("100"), status='CANCELED', filled_size=filled)
+
+
+def test_partial_ioc_hedge_retries_residual():
+    executor = TradingExecutor(FakeMaker(), PartialHedge(), poll_interval=0, hedge_max_attempts=3)
+
+    result = asyncio.run(executor._place_hedge_order(Decimal("0.1"), "sell"))
+
+    # 0.04 + 0.04 + 0.02
+    assert result.success
+    assert result.filled_size == Decimal("0.1")
+    assert [q for _, q in executor.exchange_b.hedges] == [Decimal("0.1"), Decimal("0.06"), Decimal("0.02")]
+
+
+def test_pipeline_retries_unhedged_residual():
+    executor = TradingExecutor(FakeMaker(), PartialHedge(), poll_interval=0, hedge_max_attempts=2)
+
+    result = asyncio.run(executor.execute_pipelined_build(
+        TradeAction.BUILD_LONG, Decimal("0.1"), Decimal("0.2"), max_in_flight=2, timeout=5
+    ))
+
+    # 每笔0.1首轮只对冲0.08（计一次失败），剩余0.02在下一轮补上
+    assert result.filled_quantity == Decimal("0.2")
+    assert result.hedged_quantity == Decimal("0.2")
+    assert result.hedge_failures == 2
+    assert result.success
+    assert [q for _, q in executor.exchange_b.hedges].count(Decimal("0.02")) == 2
+
+
+class FailingHedge(FakeHedge):
+    async def place_taker_order(self, quantity, side, max_slippage):
+        self.hedges.append((side, quantity))
+        return OrderResult(success=False, side=side, filled_size=Decimal(0), error_message="no liquidity")
+
+
+def test_pipeline_reports_unhedged_fill():
+    executor = TradingExecutor(FakeMaker(), FailingHedge(), poll_interval=0, hedge_max_attempts=1)
+
+    result = asyncio.run(executor.execute_pipelined_build(
+        TradeAction.BUILD_LONG, Decimal("0.1"), Decimal("0.1"), max_in_flight=1, timeout=0.05
+    ))
+
+    # 对冲一直失败：成交不会被记为已对冲
+    assert result.filled_quantity == Decimal("0.1")
+    assert result.hedged_quantity == Decimal("0")
+    assert not result.success
+
+
+def test_refuses_hedge_venue_without_taker():
+    hedger = FakeHedge()
+    hedger.supports_taker = False
+
+    with pytest.raises(ValueError):
+        TradingExecutor(FakeMaker(), hedger)
+
+
+def test_pipeline_keeps_k_orders_and_hedges_each_fill():
+    maker, hedger = FakeMaker(), FakeHedge()
+    executor = TradingExecutor(maker, hedger, poll_interval=0)
+
+    result = asyncio.run(executor.execute_pipelined_build(
+        TradeAction.BUILD_LONG, Decimal("0.1"), Decimal("0.5"), max_in_flight=3, timeout=5
+    ))
+
+    assert result.filled_quantity == Decimal("0.5")
+    assert result.hedged_quantity == Decimal("0.5")
+    assert result.orders_placed == 5
+    assert result.success
+    assert maker.max_resting == 3
+    assert all(side == "sell" for side, _ in hedger.hedges)
+
+    # 前三档阶梯价：100.09, 100.08, 100.07
+    prices = [maker.orders[str(i)]["price"] for i in (1, 2, 3)]
+    assert prices == [Decimal("100.09"), Decimal("100.08"), Decimal("100.07")]
+
+
+if __name__ == "__main__":
+    test_pipeline_keeps_k_orders_and_hedges_each_fill()
+    test_partial_ioc_hedge_retries_residual()
+    test_pipeline_retries_unhedged_residual()
+    test_pipeline_reports_unhedged_fill()
+    test_refuses_hedge_venue_without_taker()
+    print("✅ All pipelined build tests passed!")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+组合风控引擎测试 - 纯计算，不需要API keys
+"""
+
+import sys
+import os
+from decimal import Decimal
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+pytest.importorskip("numpy")
+
+from hedge.portfolio_risk import HedgePair, PortfolioRiskEngine
+from hedge.safety_checker import MarketState, PositionState, SafetyAction, SafetyChecker
+
+
+def make_engine():
+    pairs = [
+        HedgePair("BNB", "grvt", "lighter", Decimal("5"), Decimal("5"), Decimal("0.3")),
+        HedgePair("BTC", "grvt", "lighter", Decimal("1"), Decimal("1"), Decimal("0.01")),
+        HedgePair("BNB", "paradex", "lighter", Decimal("5"), Decimal("5"), Decimal("0.3")),
+    ]
+    engine = PortfolioRiskEngine(pairs)
+    engine.update_mark_price("BNB", Decimal("600"))
+    engine.update_mark_price("BTC", Decimal("60000"))
+    return engine
+
+
+def test_balanced_portfolio_continues():
+    engine = make_engine()
+    engine.update_positions([1, Decimal("0.1"), 2], [-1, Decimal("-0.1"), -2])
+    result = engine.evaluate()
+    assert result.breached == []
+    assert result.net_notional == pytest.approx(0)
+    assert result.venue_gross_notional["lighter"] == pytest.approx(600 * 3 + 6000)
+
+
+def test_per_pair_priority_matches_safety_checker():
+    engine = make_engine()
+    engine.update_positions([Decimal("0.5"), 2, 0], [0, 0, 0])
+    engine.update_pending_orders(0, 2, 0)
+    result = engine.evaluate()
+    # 挂单超限优先于不平衡
+    assert result.actions[0].action == SafetyAction.CANCEL_ALL_ORDERS
+    # BTC单边仓位超限
+    assert result.actions[1].action == SafetyAction.PAUSE
+    assert "position" in result.actions[1].reason
+    assert result.actions[2].action == SafetyAction.CONTINUE
+
+
+def test_venue_and_symbol_notional_limits():
+    engine = make_engine()
+    engine.update_positions([3, 0, Decimal("0.2")], [-3, 0, 0])
+    engine.set_venue_limit("grvt", Decimal("1000"))
+    engine.set_symbol_limit("BNB", Decimal("100"))
+    result = engine.evaluate()
+    # grvt名义敞口1800 > 1000 → 所有grvt交易对暂停
+    assert result.actions[0].action == SafetyAction.PAUSE
+    assert "grvt" in result.actions[0].reason
+    # BNB净敞口120 > 100 → paradex上的BNB交易对也暂停
+    assert result.actions[2].action == SafetyAction.PAUSE
+    assert "net notional" in result.actions[2].reason
+    assert result.actions[1].action == SafetyAction.PAUSE  # BTC在grvt上，同样受交易所限额影响
+
+
+def test_check_all_pauses_on_portfolio_breach():
+    engine = PortfolioRiskEngine([HedgePair("BNB", "grvt", "lighter", Decimal("5"), Decimal("5"), Decimal("0.3"))])
+    engine.set_venue_limit("grvt", Decimal("1000"))
+    position = PositionState(exchange_a_position=Decimal("2"), exchange_b_position=Decimal("-2"))
+
+    def check(mark_price):
+        return SafetyChecker.check_all(
+            position, Decimal("5"), Decimal("5"), Decimal("0.3"),
+            market=MarketState(exchange_a_mark_price=Decimal(mark_price)),
+            portfolio=engine
+        )
+
+    # 单交易对限额内，组合也未超限
+    assert check("400").action == SafetyAction.CONTINUE
+    # 价格上涨后grvt名义敞口1200 > 1000
+    result = check("600")
+    assert result.action == SafetyAction.PAUSE
+    assert "Portfolio risk" in result.reason and "grvt" in result.reason
+
+
+if __name__ == "__main__":
+    test_balanced_portfolio_continues()
+    test_per_pair_priority_matches_safety_checker()
+    test_venue_and_symbol_notional_limits()
+    test_check_all_pauses_on_portfolio_breach()
+    print("✅ All portfolio risk tests passed!")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+仓位账本测试 - 纯计算，不需要API keys
+"""
+
+import sys
+import os
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from hedge.position_ledger import PositionLedger
+
+
+def test_fills_update_position_incrementally():
+    ledger = PositionLedger("test_a")
+    ledger.seed(Decimal("1"))
+
+    ledger.on_fill("1", "buy", Decimal("0.05"))
+    ledger.on_fill("1", "buy", Decimal("0.1"))
+    # 重复推送同一累计成交量不重复计算
+    ledger.on_fill("1", "buy", Decimal("0.1"))
+    ledger.on_fill("2", "sell", Decimal("0.3"))
+
+    assert ledger.position == Decimal("0.8")
+
+
+def test_fills_before_seed_are_ignored():
+    ledger = PositionLedger("test_b")
+    ledger.on_fill("1", "sell", Decimal("0.1"))
+    assert not ledger.is_ready
+
+    ledger.seed(Decimal("-0.1"))
+    ledger.on_fill("1", "sell", Decimal("0.1"))
+    assert ledger.position == Decimal("-0.1")
+
+
+def test_reconcile_reports_drift():
+    ledger = PositionLedger("test_c")
+    ledger.seed(Decimal("0"))
+    ledger.on_fill("1", "buy", Decimal("0.1"))
+
+    assert ledger.reconcile(Decimal("0.1")) == 0
+    assert ledger.drift_events.value == 0
+
+    # 漏掉一次成交推送
+    assert ledger.reconcile(Decimal("0.3")) == Decimal("0.2")
+    assert ledger.position == Decimal("0.3")
+    assert ledger.drift_events.value == 1
+    assert ledger.drift.value == 0.2
+
+
+def test_reconcile_deferred_when_fill_arrives_during_rest_read():
+    ledger = PositionLedger("test_d")
+    ledger.seed(Decimal("0"))
+    fill_seq = ledger.fill_seq
+
+    # REST请求发出后才推送的成交，快照里还没有
+    ledger.on_fill("1", "buy", Decimal("0.1"))
+    assert ledger.reconcile(Decimal("0"), fill_seq) is None
+    assert ledger.position == Decimal("0.1")
+    assert ledger.deferred_reconciles.value == 1
+
+    # 没有新成交时正常校正
+    assert ledger.reconcile(Decimal("0.1"), ledger.fill_seq) == 0
+
+
+if __name__ == "__main__":
+    test_fills_update_position_incrementally()
+    test_fills_before_seed_are_ignored()
+    test_reconcile_reports_drift()
+    test_reconcile_deferred_when_fill_arrives_during_rest_read()
+    print("✅ All position ledger tests passed!")
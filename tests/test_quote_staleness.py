@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+报价时效测试 - 交易所时间戳换算、单向延迟和过期报价拒绝定价
+"""
+
+import sys
+import os
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from exchanges.base import BaseExchangeClient
+from exchanges.market_data import TopOfBook, exchange_time, record_quote
+from helpers.metrics import metrics
+
+
+def test_exchange_time_units():
+    assert exchange_time(1700000000) == 1700000000
+    assert exchange_time(1700000000123) == 1700000000.123
+    assert abs(exchange_time("1700000000123456") - 1700000000.123456) < 1e-6
+    assert exchange_time(None) is None
+    assert exchange_time("bad") is None
+
+
+def test_record_quote_observes_one_way_delay():
+    quote = TopOfBook(best_bid=Decimal("100"), best_ask=Decimal("101"),
+                      timestamp=1000.25, exchange_timestamp=1000.0)
+    assert record_quote("test_quote_venue", quote) is quote
+    assert metrics.histogram("test_quote_venue.quote.one_way_delay").mean() == 0.25
+
+
+def make_client(quote, max_quote_age=None):
+    return SimpleNamespace(
+        config=SimpleNamespace(max_quote_age=max_quote_age),
+        max_quote_age=BaseExchangeClient.max_quote_age,
+        get_cached_top_of_book=lambda: quote,
+        get_exchange_name=lambda: "test_stale"
+    )
+
+
+def test_stale_quote_refused():
+    stale = TopOfBook(best_bid=Decimal("100"), best_ask=Decimal("101"), timestamp=time.time() - 10)
+    fresh = TopOfBook(best_bid=Decimal("100"), best_ask=Decimal("101"))
+
+    assert BaseExchangeClient.get_fresh_top_of_book(make_client(stale)) is None
+    assert BaseExchangeClient.get_fresh_top_of_book(make_client(stale, max_quote_age=30)) is stale
+    assert BaseExchangeClient.get_fresh_top_of_book(make_client(fresh)) is fresh
+    assert metrics.counter("test_stale.quote.stale").value == 1
+    assert metrics.histogram("test_stale.quote.age").count == 3
+
+
+if __name__ == "__main__":
+    test_exchange_time_units()
+    test_record_quote_observes_one_way_delay()
+    test_stale_quote_refused()
+    print("✅ All quote staleness tests passed!")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+再平衡计划测试 - 纯函数，不需要API keys
+"""
+
+import sys
+import os
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from hedge.rebalancer import Rebalancer, TradeAction, VenueStats
+from hedge.safety_checker import PositionState
+
+
+def test_balanced_position_has_empty_plan():
+    position = PositionState(exchange_a_position=Decimal("1"), exchange_b_position=Decimal("-1"))
+    plan = Rebalancer.plan_rebalance(position, Decimal(0), order_size=Decimal("0.1"))
+    assert plan.is_empty
+    assert plan.total_quantity == 0
+
+
+def test_large_imbalance_clears_in_one_plan():
+    # 净多头0.5 = 5倍order_size → 一次给出5个Lighter卖出子订单
+    position = PositionState(exchange_a_position=Decimal("1.5"), exchange_b_position=Decimal("-1"))
+    plan = Rebalancer.plan_rebalance(position, Decimal(0), order_size=Decimal("0.1"))
+    assert len(plan.slices) == 5
+    assert all(s.action == TradeAction.BUILD_SHORT for s in plan.slices)
+    assert sum(s.quantity for s in plan.slices) == Decimal("0.5")
+    assert plan.total_quantity == Decimal("0.5")
+
+
+def test_slices_sized_against_depth():
+    # 净空头0.25，深度只有0.08 → 子订单 0.08, 0.08, 0.08, 0.01
+    position = PositionState(exchange_a_position=Decimal("0"), exchange_b_position=Decimal("-0.25"))
+    plan = Rebalancer.plan_rebalance(
+        position, Decimal(0), order_size=Decimal("0.1"), available_depth=Decimal("0.08")
+    )
+    assert [s.quantity for s in plan.slices] == [Decimal("0.08")] * 3 + [Decimal("0.01")]
+    assert all(s.action == TradeAction.CLOSE_SHORT for s in plan.slices)
+
+
+def test_max_slices_caps_plan():
+    position = PositionState(exchange_a_position=Decimal("10"), exchange_b_position=Decimal("0"))
+    plan = Rebalancer.plan_rebalance(position, Decimal(0), order_size=Decimal("0.1"), max_slices=3)
+    assert len(plan.slices) == 3
+    assert plan.total_quantity == Decimal("0.3")
+
+
+def test_route_prefers_cheaper_venue_until_depth_runs_out():
+    position = PositionState(exchange_a_position=Decimal("0.3"), exchange_b_position=Decimal("0"))
+    plan = Rebalancer.plan_rebalance(position, Decimal(0), order_size=Decimal("0.1"))
+    venues = [
+        VenueStats("exchange_a", rtt=0.05, depth=Decimal("0.15"), taker_fee=Decimal("0")),
+        VenueStats("exchange_b", rtt=0.2, depth=None, taker_fee=Decimal("0.0002")),
+    ]
+    routed = Rebalancer.route_plan(plan, venues)
+    # A更便宜但只够一个子订单，剩余子订单走B
+    assert [s.venue for s in routed.slices] == ["exchange_a", "exchange_b", "exchange_b"]
+
+
+def test_route_skips_venue_without_taker():
+    position = PositionState(exchange_a_position=Decimal("0.2"), exchange_b_position=Decimal("0"))
+    plan = Rebalancer.plan_rebalance(position, Decimal(0), order_size=Decimal("0.1"))
+    venues = [
+        VenueStats("exchange_a", rtt=0.01, depth=None, taker_fee=Decimal("0"), can_take=False),
+        VenueStats("exchange_b", rtt=None, depth=None, taker_fee=Decimal("0.0005")),
+    ]
+    routed = Rebalancer.route_plan(plan, venues)
+    assert all(s.venue == "exchange_b" for s in routed.slices)
+
+
+if __name__ == "__main__":
+    test_balanced_position_has_empty_plan()
+    test_large_imbalance_clears_in_one_plan()
+    test_slices_sized_against_depth()
+    test_max_slices_caps_plan()
+    test_route_prefers_cheaper_venue_until_depth_runs_out()
+    test_route_skips_venue_without_taker()
+    print("✅ All rebalancer plan tests passed!")
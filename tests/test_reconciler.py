@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+后台对账测试 - 使用假交易所客户端，不需要API keys
+"""
+
+import asyncio
+import sys
+import os
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from exchanges.base import OrderInfo
+from hedge.position_ledger import PositionLedger
+from hedge.reconciler import AccountReconciler
+
+
+def order(order_id):
+    return OrderInfo(order_id=order_id, side='buy', size=Decimal("0.1"), price=Decimal("100"), status='OPEN')
+
+
+class FakeClient:
+    def __init__(self, cached_orders, rest_orders, rest_position):
+        self.config = SimpleNamespace(contract_id="BNB")
+        self.cached_orders = cached_orders
+        self.rest_orders = rest_orders
+        self.rest_position = rest_position
+        self.expired = 0
+
+    def get_cached_position(self):
+        return None
+
+    def get_cached_open_orders(self):
+        return self.cached_orders
+
+    def expire_account_cache(self):
+        self.expired += 1
+
+    async def get_account_positions(self):
+        return self.rest_position
+
+    async def get_active_orders(self, contract_id):
+        # REST读取会把缓存修复为REST结果
+        self.cached_orders = list(self.rest_orders)
+        return self.rest_orders
+
+
+def test_clean_reconcile_records_time():
+    ledger = PositionLedger("recon_clean")
+    ledger.seed(Decimal("0.5"))
+    client = FakeClient([order("1")], [order("1")], Decimal("0.5"))
+    reconciler = AccountReconciler(client, "recon_clean", ledger)
+
+    result = asyncio.run(reconciler.reconcile_once())
+    assert result.clean
+    assert client.expired == 1
+    assert reconciler.seconds_since_clean() is not None
+
+
+def test_drift_is_counted_and_repaired():
+    ledger = PositionLedger("recon_drift")
+    ledger.seed(Decimal("0.5"))
+    client = FakeClient([order("1"), order("2")], [order("2"), order("3")], Decimal("0.6"))
+    reconciler = AccountReconciler(client, "recon_drift", ledger)
+
+    result = asyncio.run(reconciler.reconcile_once())
+    assert result.position_drift == Decimal("0.1")
+    assert result.missing_orders == 1 and result.stale_orders == 1
+    assert ledger.position == Decimal("0.6")
+    assert reconciler.get_stats()['order_drifts'] == 1
+    assert reconciler.seconds_since_clean() is None
+
+    # 修复后再次对账无偏差
+    assert asyncio.run(reconciler.reconcile_once()).clean
+
+
+class FillDuringReadClient(FakeClient):
+    """REST读取期间推送一笔成交，REST快照不包含它"""
+    def __init__(self, ledger, *args):
+        super().__init__(*args)
+        self.ledger = ledger
+
+    async def get_account_positions(self):
+        self.ledger.on_fill("9", "buy", Decimal("0.1"))
+        return self.rest_position
+
+
+def test_fill_during_rest_read_is_not_wiped():
+    ledger = PositionLedger("recon_race")
+    ledger.seed(Decimal("0.5"))
+    client = FillDuringReadClient(ledger, [order("1")], [order("1")], Decimal("0.5"))
+    reconciler = AccountReconciler(client, "recon_race", ledger)
+
+    result = asyncio.run(reconciler.reconcile_once())
+    assert result.position_drift == 0
+    assert ledger.position == Decimal("0.6")
+    assert reconciler.seconds_since_clean() is None
+
+
+if __name__ == "__main__":
+    test_clean_reconcile_records_time()
+    test_drift_is_counted_and_repaired()
+    test_fill_during_rest_read_is_not_wiped()
+    print("✅ All reconciler tests passed!")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+冗余WebSocket连接测试 - 按offset去重、先到先用、单条连接断档不影响盘口
+"""
+
+import asyncio
+import sys
+import os
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from exchanges.feed_merger import RedundantFeedMerger
+from exchanges.lighter_custom_websocket import LighterCustomWebSocketManager
+from helpers.metrics import metrics
+
+
+def test_merger_first_arrival_wins():
+    merger = RedundantFeedMerger("test_merger")
+    assert merger.accept(0, 1)
+    assert not merger.accept(1, 1)
+    assert merger.accept(1, 2)
+    assert metrics.counter("test_merger.feed.wins.0").value == 1
+    assert metrics.counter("test_merger.feed.wins.1").value == 1
+    assert merger.duplicates.value == 1 and merger.gap.count == 1
+
+    merger.set_live(0, True)
+    merger.set_live(1, True)
+    assert merger.has_other_live(0)
+    merger.set_live(1, False)
+    assert not merger.has_other_live(0)
+
+
+def book_message(kind, offset, bid, ask):
+    return {
+        "type": kind,
+        "order_book": {
+            "code": 0,
+            "offset": offset,
+            "bids": [{"price": bid, "size": "1000"}],
+            "asks": [{"price": ask, "size": "1000"}],
+        }
+    }
+
+
+def test_lighter_book_merged_by_offset():
+    config = SimpleNamespace(contract_id=1, account_index=0, lighter_client=None, ws_connections=2)
+    manager = LighterCustomWebSocketManager(config)
+    manager.feed_merger = RedundantFeedMerger("test_lighter_feed")
+
+    async def run():
+        handle = manager._handle_message
+        results = []
+        for connection, data in [
+            (0, book_message("subscribed/order_book", 10, "100", "101")),
+            (1, book_message("subscribed/order_book", 10, "100", "101")),   # 已在盘口中，跳过
+            (1, book_message("update/order_book", 11, "100.5", "101")),      # 连接1先到
+            (0, book_message("update/order_book", 11, "100.5", "101")),      # 重复
+            (0, book_message("update/order_book", 13, "100.7", "101")),      # 连接0断档
+            (1, book_message("update/order_book", 12, "100.6", "101")),
+        ]:
+            results.append(await handle(connection, None, data))
+        return results
+
+    results = asyncio.run(run())
+    assert results == [True, True, True, True, False, True]
+    assert manager.order_book_offset == 12
+    assert manager.top_of_book.best_bid == Decimal("100.6")
+    assert metrics.counter("test_lighter_feed.feed.wins.1").value == 2
+    assert manager.feed_merger.duplicates.value == 1
+
+
+def test_lighter_account_messages_merged_by_sequence():
+    config = SimpleNamespace(contract_id=1, account_index=0, lighter_client=None, ws_connections=2)
+    manager = LighterCustomWebSocketManager(config)
+    manager.feed_merger = RedundantFeedMerger("test_lighter_account")
+    manager.feed_merger.set_live(0, True)
+    manager.feed_merger.set_live(1, True)
+
+    def account_message(**fields):
+        return {"type": "update/account_all", "channel": "account_all/0", **fields}
+
+    async def run():
+        for connection, data in [
+            (1, account_message(timestamp=1000, positions={})),
+            (0, account_message(timestamp=1000, positions={})),   # 重复
+            # 同样内容、不同时间戳是两条消息
+            (0, account_message(timestamp=1001, positions={})),
+            # 没有序号：只取编号最小的在线连接
+            (1, account_message(positions={})),
+            (0, account_message(positions={})),
+        ]:
+            await manager._handle_message(connection, None, data)
+
+    asyncio.run(run())
+    assert len(manager.events) == 3
+    assert manager.feed_merger.duplicates.value == 1
+
+
+if __name__ == "__main__":
+    test_merger_first_arrival_wins()
+    test_lighter_book_merged_by_offset()
+    test_lighter_account_messages_merged_by_sequence()
+    print("✅ All redundant feed tests passed!")
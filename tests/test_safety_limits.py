@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+名义价值/保证金限额测试 - 纯函数，不需要API keys
+"""
+
+import sys
+import os
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from hedge.safety_checker import MarketState, PositionState, SafetyAction, SafetyChecker
+
+
+def check(position, market, **limits):
+    return SafetyChecker.check_all(
+        position,
+        max_position_per_side=Decimal("100"),
+        max_total_position=Decimal("100"),
+        max_imbalance=Decimal("100"),
+        market=market,
+        **limits
+    )
+
+
+def test_same_quantity_different_notional():
+    position = PositionState(exchange_a_position=Decimal("1"), exchange_b_position=Decimal("-1"))
+    bnb = MarketState(exchange_a_mark_price=Decimal("600"), exchange_b_mark_price=Decimal("600"))
+    btc = MarketState(exchange_a_mark_price=Decimal("60000"), exchange_b_mark_price=Decimal("60000"))
+
+    assert check(position, bnb, max_notional_per_side=Decimal("10000")).action == SafetyAction.CONTINUE
+    result = check(position, btc, max_notional_per_side=Decimal("10000"))
+    assert result.action == SafetyAction.PAUSE
+    assert "notional" in result.reason
+
+
+def test_imbalance_notional_and_missing_prices():
+    position = PositionState(exchange_a_position=Decimal("1.5"), exchange_b_position=Decimal("-1"))
+    market = MarketState(exchange_b_mark_price=Decimal("600"))
+    result = check(position, market, max_imbalance_notional=Decimal("200"))
+    assert result.action == SafetyAction.PAUSE
+
+    # 没有标记价格时跳过名义价值检查
+    assert check(position, MarketState(), max_imbalance_notional=Decimal("200")).action == SafetyAction.CONTINUE
+
+
+def test_margin_utilization():
+    position = PositionState(exchange_a_position=Decimal("0"), exchange_b_position=Decimal("0"))
+    market = MarketState(exchange_b_margin_utilization=Decimal("0.9"))
+    assert check(position, market, max_margin_utilization=Decimal("0.8")).action == SafetyAction.PAUSE
+    assert check(position, market, max_margin_utilization=Decimal("0.95")).action == SafetyAction.CONTINUE
+
+
+if __name__ == "__main__":
+    test_same_quantity_different_notional()
+    test_imbalance_notional_and_missing_prices()
+    test_margin_utilization()
+    print("✅ All safety limit tests passed!")
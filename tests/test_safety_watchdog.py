@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+安全看门狗测试 - 使用假执行器，不需要API keys
+"""
+
+import asyncio
+import sys
+import os
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from hedge.safety_checker import PositionState, PendingOrdersInfo, SafetyAction
+from hedge.safety_watchdog import SafetyWatchdog
+
+
+class FakeExecutor:
+    def __init__(self, position, cached=False):
+        self.position = position
+        self.cached = cached
+        self.cancel_calls = 0
+        self.rest_calls = 0
+
+    def get_cached_positions(self):
+        return self.position if self.cached else None
+
+    def get_cached_pending_orders(self):
+        return PendingOrdersInfo(exchange_a_pending_count=0, exchange_b_pending_count=0) if self.cached else None
+
+    async def get_positions(self):
+        self.rest_calls += 1
+        return self.position
+
+    async def get_pending_orders(self):
+        self.rest_calls += 1
+        return PendingOrdersInfo(exchange_a_pending_count=0, exchange_b_pending_count=0)
+
+    async def cancel_all_orders(self):
+        self.cancel_calls += 1
+
+
+def make_watchdog(executor):
+    return SafetyWatchdog(
+        executor,
+        max_position_per_side=Decimal("1"),
+        max_total_position=Decimal("1"),
+        max_imbalance=Decimal("0.3"),
+        min_interval=0.001,
+        heartbeat=10
+    )
+
+
+def test_breach_cancels_orders_once_per_cooldown():
+    executor = FakeExecutor(PositionState(exchange_a_position=Decimal("0.5"), exchange_b_position=Decimal("0")))
+    watchdog = make_watchdog(executor)
+
+    async def run():
+        first = await watchdog.check_once()
+        await watchdog.check_once()
+        return first
+
+    result = asyncio.run(run())
+    assert result.action == SafetyAction.PAUSE
+    assert watchdog.last_breach is not None
+    assert executor.cancel_calls == 1
+
+
+def test_event_wakes_watchdog():
+    executor = FakeExecutor(PositionState(exchange_a_position=Decimal("0.1"), exchange_b_position=Decimal("-0.1")))
+    watchdog = make_watchdog(executor)
+
+    async def run():
+        task = asyncio.create_task(watchdog.run())
+        await asyncio.sleep(0.01)
+        # 仓位事件到达：不平衡超限，看门狗应立即撤单
+        executor.position = PositionState(exchange_a_position=Decimal("0.6"), exchange_b_position=Decimal("-0.1"))
+        watchdog.notify()
+        await asyncio.sleep(0.05)
+        watchdog.stop()
+        await task
+
+    asyncio.run(run())
+    assert watchdog.check_count == 1
+    assert executor.cancel_calls == 1
+
+
+def test_event_reads_cache_heartbeat_reads_rest():
+    executor = FakeExecutor(PositionState(exchange_a_position=Decimal("0.1"), exchange_b_position=Decimal("-0.1")),
+                            cached=True)
+    watchdog = make_watchdog(executor)
+    watchdog.heartbeat = 0.05
+
+    async def run():
+        task = asyncio.create_task(watchdog.run())
+        await asyncio.sleep(0.01)
+        watchdog.notify()
+        await asyncio.sleep(0.01)
+        # 事件触发的检查只读缓存
+        assert watchdog.check_count == 1 and executor.rest_calls == 0
+        await asyncio.sleep(0.08)
+        watchdog.stop()
+        await task
+
+    asyncio.run(run())
+    # 心跳检查走REST（仓位+挂单）
+    assert watchdog.check_count >= 2
+    assert executor.rest_calls == 2 * (watchdog.check_count - 1)
+
+
+if __name__ == "__main__":
+    test_breach_cancels_orders_once_per_cooldown()
+    test_event_wakes_watchdog()
+    test_event_reads_cache_heartbeat_reads_rest()
+    print("✅ All safety watchdog tests passed!")
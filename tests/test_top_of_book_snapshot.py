@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Lighter盘口快照测试 - 单写者发布不可变快照，不需要API keys
+"""
+
+import sys
+import os
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from exchanges.lighter_custom_websocket import LighterCustomWebSocketManager
+
+
+def make_manager():
+    config = SimpleNamespace(contract_id=1, account_index=0, lighter_client=None)
+    return LighterCustomWebSocketManager(config)
+
+
+def test_publish_is_versioned_and_immutable():
+    manager = make_manager()
+    manager.order_book_offset = 100
+    manager.update_order_book("bids", [{"price": "100", "size": "1000"}])
+    manager.update_order_book("asks", [{"price": "101", "size": "1000"}])
+    manager.publish_top_of_book()
+    first = manager.top_of_book
+
+    manager.order_book_offset = 101
+    manager.update_order_book("asks", [{"price": "100.5", "size": "1000"}])
+    manager.publish_top_of_book()
+    second = manager.top_of_book
+
+    # 读者持有的旧快照不受新发布影响
+    assert (first.best_bid, first.best_ask, first.offset, first.version) == (Decimal("100"), Decimal("101"), 100, 1)
+    assert (second.best_ask, second.offset, second.version) == (Decimal("100.5"), 101, 2)
+    with pytest.raises(Exception):
+        second.best_bid = Decimal("0")
+
+
+def test_one_sided_book_keeps_previous_snapshot():
+    manager = make_manager()
+    manager.update_order_book("bids", [{"price": "100", "size": "1000"}])
+    manager.publish_top_of_book()
+    assert manager.top_of_book is None
+    assert manager.top_of_book_version == 0
+
+
+if __name__ == "__main__":
+    test_publish_is_versioned_and_immutable()
+    test_one_sided_book_keeps_previous_snapshot()
+    print("✅ All top of book snapshot tests passed!")